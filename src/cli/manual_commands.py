@@ -43,11 +43,20 @@ def manual_command(action: str, **kwargs) -> bool:
         # 导出数据
         format = kwargs.get('format', 'excel')
         output_dir = kwargs.get('output_dir')
-        return tools.export_data(format=format, output_dir=output_dir)
+        return tools.export_data(
+            format=format,
+            output_dir=output_dir,
+            start_date=kwargs.get('start_date'),
+            end_date=kwargs.get('end_date')
+        )
         
     elif action == "analyze":
         # 分析趋势
-        return tools.analyze_trends()
+        return tools.analyze_trends(
+            start_date=kwargs.get('start_date'),
+            end_date=kwargs.get('end_date'),
+            output_json=kwargs.get('output_json', False)
+        )
         
     elif action == "backup":
         # 备份数据
@@ -113,7 +122,7 @@ def add_manual_parser(subparsers):
     export_parser = manual_subparsers.add_parser("export", help="导出数据")
     export_parser.add_argument(
         "--format", 
-        choices=["excel", "json"], 
+        choices=["excel", "json", "jsonl", "parquet"], 
         default="excel",
         help="导出格式 (默认: excel)"
     )
@@ -122,9 +131,35 @@ def add_manual_parser(subparsers):
         dest="output_dir",
         help="输出目录"
     )
+    export_parser.add_argument(
+        "--start",
+        dest="start_date",
+        help="起始日期 YYYY-MM-DD"
+    )
+    export_parser.add_argument(
+        "--end",
+        dest="end_date",
+        help="结束日期 YYYY-MM-DD"
+    )
     
     # 分析命令
-    manual_subparsers.add_parser("analyze", help="分析数据趋势")
+    analyze_parser = manual_subparsers.add_parser("analyze", help="分析数据趋势")
+    analyze_parser.add_argument(
+        "--start",
+        dest="start_date",
+        help="起始日期 YYYY-MM-DD"
+    )
+    analyze_parser.add_argument(
+        "--end",
+        dest="end_date",
+        help="结束日期 YYYY-MM-DD"
+    )
+    analyze_parser.add_argument(
+        "--json",
+        dest="output_json",
+        action="store_true",
+        help="以JSON格式输出完整分析结果"
+    )
     
     # 备份命令
     backup_parser = manual_subparsers.add_parser("backup", help="备份数据和cookies")
@@ -25,14 +25,19 @@ logger = get_logger(__name__)
 class ChromeDriverManager:
     """Chrome浏览器驱动管理器"""
     
-    def __init__(self, config: XHSConfig):
+    def __init__(self, config: XHSConfig, user_data_dir: Optional[str] = None,
+                 debugging_port: Optional[int] = None):
         """
         初始化浏览器驱动管理器
         
         Args:
             config: 配置管理器实例
+            user_data_dir: 浏览器用户数据目录，默认为./google-chrome-data（多实例并存时需各不相同）
+            debugging_port: 无头模式下的远程调试端口，默认使用配置中的端口
         """
         self.config = config
+        self.user_data_dir = user_data_dir or "./google-chrome-data"
+        self.debugging_port = debugging_port or config.remote_browser_port
         self.driver: Optional[webdriver.Chrome] = None
         self.is_initialized = False
     
@@ -124,7 +129,7 @@ class ChromeDriverManager:
             chrome_options.add_argument('--disable-features=TranslateUI')
             
             # 添加调试端口（有助于无头模式稳定性）
-            chrome_options.add_argument(f'--remote-debugging-port={self.config.remote_browser_port}')
+            chrome_options.add_argument(f'--remote-debugging-port={self.debugging_port}')
             
             # 窗口设置（即使无头模式也设置）
             chrome_options.add_argument('--start-maximized')
@@ -156,7 +161,12 @@ class ChromeDriverManager:
         chrome_options.add_argument('--window-size=1920,1080')
 
         # 添加文件保存位置
-        chrome_options.add_argument(f'--user-data-dir=./google-chrome-data')
+        chrome_options.add_argument(f'--user-data-dir={self.user_data_dir}')
+        
+        # 接口采集模式需要Chrome性能日志来捕获页面加载的XHR响应
+        if self.config.collection_backend == "api":
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            logger.debug("已启用Chrome性能日志（网络请求捕获）")
         
         # 调试选项
         if self.config.debug_mode:
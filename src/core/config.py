@@ -76,6 +76,22 @@ class XHSConfig:
         self.remote_browser_host = os.getenv("REMOTE_BROWSER_HOST", "localhost")
         self.remote_browser_port = int(os.getenv("REMOTE_BROWSER_PORT", "9222"))
         
+        # 浏览器驱动池配置
+        self.enable_browser_pool = os.getenv("ENABLE_BROWSER_POOL", "true").lower() == "true"
+        self.browser_pool_size = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+        self.browser_pool_reserved = int(os.getenv("BROWSER_POOL_PUBLISH_RESERVED", "1"))
+        self.browser_pool_max_age = int(os.getenv("BROWSER_POOL_MAX_AGE", "1800"))
+        self.browser_pool_checkout_timeout = int(os.getenv("BROWSER_POOL_CHECKOUT_TIMEOUT", "300"))
+        self.browser_pool_prewarm = os.getenv("BROWSER_POOL_PREWARM", "false").lower() == "true"
+        
+        # 发布任务队列配置
+        # 发布工具都使用配置中的账号，同一账号的任务串行执行，多于1个工作协程只对多账号有意义
+        self.publish_max_workers = int(os.getenv("PUBLISH_MAX_WORKERS", "1"))
+        self.publish_queue_size = int(os.getenv("PUBLISH_QUEUE_SIZE", "20"))
+        
+        # 数据采集后端：dom（解析页面元素）或 api（解析页面加载的接口响应）
+        self.collection_backend = os.getenv("COLLECTION_BACKEND", "dom").lower()
+        
         # 其他配置
         self.timeout = int(os.getenv("TIMEOUT", "30"))
     
@@ -215,6 +231,18 @@ class XHSConfig:
                 issues.append("远程浏览器主机地址不能为空")
             logger.debug(f"远程浏览器配置验证: {self.remote_browser_host}:{self.remote_browser_port}")
         
+        # 浏览器驱动池配置验证
+        if self.browser_pool_size < 1:
+            issues.append(f"浏览器驱动池大小必须大于0: {self.browser_pool_size}")
+        
+        # 发布任务队列配置验证
+        if self.publish_max_workers < 1:
+            issues.append(f"发布并发数必须大于0: {self.publish_max_workers}")
+        
+        # 数据采集后端验证
+        if self.collection_backend not in ("dom", "api"):
+            issues.append(f"不支持的数据采集后端: {self.collection_backend}（可选: dom, api）")
+        
         return {
             "valid": len(issues) == 0,
             "issues": issues
@@ -260,6 +288,26 @@ REMOTE_BROWSER_HOST=localhost
 # 远程浏览器调试端口（Chrome启动时的--remote-debugging-port参数）
 REMOTE_BROWSER_PORT={self.remote_browser_port}
 
+# 浏览器驱动池配置
+# 是否复用已预热（已加载cookies）的浏览器驱动
+ENABLE_BROWSER_POOL=true
+# 驱动池最大浏览器数量
+BROWSER_POOL_SIZE={self.browser_pool_size}
+# 为发布任务保留的浏览器数量（数据采集和手动工具不会占用，驱动池只有1个浏览器时不保留）
+BROWSER_POOL_PUBLISH_RESERVED={self.browser_pool_reserved}
+# 单个浏览器最长存活时间（秒），超时后回收重建
+BROWSER_POOL_MAX_AGE=1800
+# 等待空闲浏览器的最长时间（秒）
+BROWSER_POOL_CHECKOUT_TIMEOUT=300
+# 服务器启动时是否预先启动浏览器
+BROWSER_POOL_PREWARM=false
+
+# 发布任务队列配置
+# 同时执行的发布任务数量（同一账号的任务始终串行，发布工具都使用COOKIES_FILE账号，因此只对多账号有效）
+PUBLISH_MAX_WORKERS={self.publish_max_workers}
+# 排队任务上限，超出后拒绝新的发布请求
+PUBLISH_QUEUE_SIZE={self.publish_queue_size}
+
 # 超时设置（秒）
 TIMEOUT=30
 """
@@ -300,6 +348,14 @@ TIMEOUT=30
             "enable_remote_browser": self.enable_remote_browser,
             "remote_browser_host": self.remote_browser_host,
             "remote_browser_port": self.remote_browser_port,
+            "enable_browser_pool": self.enable_browser_pool,
+            "browser_pool_size": self.browser_pool_size,
+            "browser_pool_max_age": self.browser_pool_max_age,
+            "browser_pool_checkout_timeout": self.browser_pool_checkout_timeout,
+            "browser_pool_prewarm": self.browser_pool_prewarm,
+            "publish_max_workers": self.publish_max_workers,
+            "publish_queue_size": self.publish_queue_size,
+            "collection_backend": self.collection_backend,
             "timeout": self.timeout,
             "platform": platform.system(),
             "python_version": platform.python_version()
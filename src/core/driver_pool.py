@@ -0,0 +1,417 @@
+"""
+小红书工具包浏览器驱动池模块
+
+维护一组已启动并加载好cookies的Chrome浏览器驱动，供发布任务、数据采集和手动工具借出/归还复用，
+避免每次操作都重新启动浏览器、注入cookies和进入创作者中心
+"""
+
+import asyncio
+import atexit
+import copy
+import os
+import threading
+import time
+from contextlib import contextmanager, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Optional, List, Dict, Any
+
+from .config import XHSConfig
+from .browser import ChromeDriverManager
+from .exceptions import BrowserError
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PooledDriver:
+    """驱动池中的单个浏览器条目"""
+    slot: int
+    browser_manager: ChromeDriverManager
+    cookies_file: str
+    cookies_mtime: float = 0.0
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    use_count: int = 0
+    in_use: bool = False
+    priority: bool = False  # 当前是否被发布任务借出
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        now = time.time()
+        return {
+            "slot": self.slot,
+            "cookies_file": self.cookies_file,
+            "in_use": self.in_use,
+            "use_count": self.use_count,
+            "age_seconds": int(now - self.created_at),
+            "idle_seconds": 0 if self.in_use else int(now - self.last_used)
+        }
+
+
+class ChromeDriverPool:
+    """Chrome浏览器驱动池"""
+
+    def __init__(self, config: XHSConfig, manager_factory: Optional[Callable[..., ChromeDriverManager]] = None):
+        """
+        初始化浏览器驱动池
+
+        Args:
+            config: 配置管理器实例
+            manager_factory: 创建浏览器管理器的函数，默认为ChromeDriverManager（测试时可替换）
+        """
+        self.config = config
+        self._manager_factory = manager_factory or ChromeDriverManager
+        self.enabled = config.enable_browser_pool
+        self.max_size = max(1, config.browser_pool_size)
+        # 为发布任务保留的浏览器数量，至少留一个给其他任务
+        self.reserved = min(max(0, config.browser_pool_reserved), self.max_size - 1)
+        self.max_age = config.browser_pool_max_age
+        self.checkout_timeout = config.browser_pool_checkout_timeout
+        self._entries: List[PooledDriver] = []
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def checkout(self, cookies_file: Optional[str] = None, timeout: Optional[float] = None,
+                 priority: bool = False, launch: bool = True) -> ChromeDriverManager:
+        """
+        借出一个已加载cookies的浏览器
+
+        优先复用同一账号的空闲浏览器；池未满时新建；池已满时回收其他账号的空闲浏览器或等待归还。
+        非优先借用（数据采集、手动工具）合计最多同时借出 max_size - reserved 个浏览器，
+        剩余的浏览器留给发布任务，避免发布任务排在长时间的采集后面超时
+
+        Args:
+            cookies_file: 账号cookies文件路径，默认使用配置中的cookies文件
+            timeout: 等待空闲浏览器的最长时间（秒）
+            priority: 是否可以使用为发布任务保留的浏览器
+            launch: 为False时只借用该账号已启动且可用的空闲浏览器，不新建、不回收其他账号的浏览器，
+                没有时立即失败（用于锦上添花的并发，例如笔记详情采集）
+
+        Returns:
+            可直接使用的浏览器管理器（driver已就绪）
+
+        Raises:
+            BrowserError: 等待超时、没有空闲浏览器（launch=False）或浏览器启动失败时
+        """
+        cookies_file = cookies_file or self.config.cookies_file
+
+        if not self.enabled:
+            if not launch:
+                raise BrowserError("未启用浏览器驱动池，没有空闲浏览器", browser_action="pool_checkout")
+            # 未启用驱动池时保持原有行为：每次新建，归还时关闭
+            browser_manager = self._manager_factory(self._config_for(cookies_file))
+            self._warm(browser_manager, cookies_file)
+            return browser_manager
+
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        evicted: Optional[PooledDriver] = None
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise BrowserError("浏览器驱动池已关闭", browser_action="pool_checkout")
+
+                # 非优先借用不能占用为发布任务保留的浏览器
+                if priority or self._shared_in_use() < self.max_size - self.reserved:
+                    entry = self._find_idle(cookies_file)
+                    if entry:
+                        entry.in_use = True
+                        entry.priority = priority
+                        needs_warm = False
+                        break
+
+                    if launch and len(self._entries) < self.max_size:
+                        entry = self._reserve_slot(cookies_file, priority=priority)
+                        needs_warm = True
+                        break
+
+                    # 池已满：回收其他账号的空闲浏览器，腾出位置
+                    evicted = self._find_idle() if launch else None
+                    if evicted:
+                        self._entries.remove(evicted)
+                        entry = self._reserve_slot(cookies_file, slot=evicted.slot, priority=priority)
+                        needs_warm = True
+                        break
+
+                if not launch:
+                    raise BrowserError("没有可借用的空闲浏览器", browser_action="pool_checkout")
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise BrowserError(f"等待空闲浏览器超时({timeout}秒)", browser_action="pool_checkout")
+                self._condition.wait(remaining)
+
+        if evicted:
+            logger.info(f"♻️ 回收空闲浏览器[{evicted.slot}]以服务其他账号")
+            evicted.browser_manager.close_driver()
+
+        try:
+            if not needs_warm and not self._is_reusable(entry):
+                if not launch:
+                    raise BrowserError(f"空闲浏览器[{entry.slot}]已过期或不可用", browser_action="pool_checkout")
+                logger.info(f"♻️ 浏览器[{entry.slot}]已过期或不可用，重新启动")
+                entry.browser_manager.close_driver()
+                needs_warm = True
+
+            if needs_warm:
+                self._warm(entry.browser_manager, cookies_file)
+                entry.created_at = time.time()
+                entry.cookies_mtime = self._cookies_mtime(cookies_file)
+            else:
+                logger.info(f"⚡ 复用已预热的浏览器[{entry.slot}]（已使用{entry.use_count}次）")
+        except Exception:
+            self._remove(entry)
+            raise
+
+        return entry.browser_manager
+
+    def checkin(self, browser_manager: ChromeDriverManager, discard: bool = False) -> None:
+        """
+        归还借出的浏览器
+
+        Args:
+            browser_manager: checkout返回的浏览器管理器
+            discard: 是否直接关闭而不放回池中（例如使用过程中出错）
+        """
+        with self._condition:
+            entry = self._find_by_manager(browser_manager)
+            if entry:
+                entry.in_use = False
+                entry.last_used = time.time()
+                entry.use_count += 1
+                if discard or self._closed:
+                    self._entries.remove(entry)
+                # 优先和非优先借用等待的条件不同，需要全部唤醒
+                self._condition.notify_all()
+
+        if entry is None or discard or self._closed:
+            browser_manager.close_driver()
+            if entry is not None:
+                logger.debug(f"🔒 浏览器[{entry.slot}]已关闭，不再放回驱动池")
+        else:
+            logger.debug(f"📥 浏览器[{entry.slot}]已归还驱动池")
+
+    async def acheckout(self, cookies_file: Optional[str] = None, timeout: Optional[float] = None,
+                        priority: bool = False, launch: bool = True) -> ChromeDriverManager:
+        """异步借出浏览器，浏览器启动在线程中进行，不阻塞事件循环"""
+        return await asyncio.to_thread(self.checkout, cookies_file, timeout, priority, launch)
+
+    async def acheckin(self, browser_manager: ChromeDriverManager, discard: bool = False) -> None:
+        """异步归还浏览器"""
+        await asyncio.to_thread(self.checkin, browser_manager, discard)
+
+    @contextmanager
+    def lease(self, cookies_file: Optional[str] = None):
+        """
+        同步借用浏览器的上下文管理器，出错时丢弃该浏览器
+
+        Args:
+            cookies_file: 账号cookies文件路径
+        """
+        browser_manager = self.checkout(cookies_file)
+        discard = False
+        try:
+            yield browser_manager
+        except BaseException:
+            discard = True
+            raise
+        finally:
+            self.checkin(browser_manager, discard=discard)
+
+    @asynccontextmanager
+    async def session(self, cookies_file: Optional[str] = None, priority: bool = False):
+        """
+        异步借用浏览器的上下文管理器，出错时丢弃该浏览器
+
+        Args:
+            cookies_file: 账号cookies文件路径
+            priority: 是否可以使用为发布任务保留的浏览器
+        """
+        browser_manager = await self.acheckout(cookies_file, priority=priority)
+        discard = False
+        try:
+            yield browser_manager
+        except BaseException:
+            discard = True
+            raise
+        finally:
+            await self.acheckin(browser_manager, discard=discard)
+
+    def warm_up(self, count: Optional[int] = None, cookies_file: Optional[str] = None) -> int:
+        """
+        预先启动浏览器并放入池中
+
+        Args:
+            count: 预热数量，默认填满驱动池
+            cookies_file: 账号cookies文件路径
+
+        Returns:
+            实际预热成功的浏览器数量
+        """
+        if not self.enabled:
+            return 0
+
+        count = min(count or self.max_size, self.max_size)
+        leased = []
+        try:
+            with self._condition:
+                missing = count - len(self._entries)
+            for _ in range(max(0, missing)):
+                leased.append(self.checkout(cookies_file, timeout=0, priority=True))
+        except Exception as e:
+            logger.warning(f"⚠️ 预热浏览器失败: {e}")
+        finally:
+            for browser_manager in leased:
+                self.checkin(browser_manager)
+
+        if leased:
+            logger.info(f"🔥 已预热 {len(leased)} 个浏览器")
+        return len(leased)
+
+    def close_all(self) -> None:
+        """关闭池中所有浏览器，借出中的浏览器会在归还时关闭"""
+        with self._condition:
+            self._closed = True
+            idle = [entry for entry in self._entries if not entry.in_use]
+            for entry in idle:
+                self._entries.remove(entry)
+            self._condition.notify_all()
+
+        for entry in idle:
+            entry.browser_manager.close_driver()
+        if idle:
+            logger.info(f"🧹 驱动池已关闭 {len(idle)} 个空闲浏览器")
+
+    def get_status(self) -> Dict[str, Any]:
+        """获取驱动池状态"""
+        with self._condition:
+            entries = [entry.to_dict() for entry in self._entries]
+        return {
+            "enabled": self.enabled,
+            "max_size": self.max_size,
+            "reserved_for_publish": self.reserved,
+            "max_age_seconds": self.max_age,
+            "size": len(entries),
+            "in_use": sum(1 for entry in entries if entry["in_use"]),
+            "drivers": entries
+        }
+
+    def _find_idle(self, cookies_file: Optional[str] = None) -> Optional[PooledDriver]:
+        """查找空闲浏览器，指定cookies_file时只匹配同一账号（需持有锁）"""
+        idle = [entry for entry in self._entries
+                if not entry.in_use and (cookies_file is None or entry.cookies_file == cookies_file)]
+        if not idle:
+            return None
+        # 优先使用最近用过的，让其余浏览器自然老化回收
+        return max(idle, key=lambda entry: entry.last_used)
+
+    def _shared_in_use(self) -> int:
+        """非优先借出中的浏览器数量（需持有锁）"""
+        return sum(1 for entry in self._entries if entry.in_use and not entry.priority)
+
+    def _find_by_manager(self, browser_manager: ChromeDriverManager) -> Optional[PooledDriver]:
+        """根据浏览器管理器查找池条目（需持有锁）"""
+        for entry in self._entries:
+            if entry.browser_manager is browser_manager:
+                return entry
+        return None
+
+    def _reserve_slot(self, cookies_file: str, slot: Optional[int] = None, priority: bool = False) -> PooledDriver:
+        """占用一个槽位并创建尚未启动的浏览器条目（需持有锁）"""
+        if slot is None:
+            used = {entry.slot for entry in self._entries}
+            slot = next(i for i in range(self.max_size) if i not in used)
+
+        # 多个浏览器不能共用同一个用户数据目录和调试端口
+        user_data_dir = "./google-chrome-data" if slot == 0 else f"./google-chrome-data-{slot}"
+        browser_manager = self._manager_factory(
+            self._config_for(cookies_file),
+            user_data_dir=user_data_dir,
+            debugging_port=self.config.remote_browser_port + slot
+        )
+        entry = PooledDriver(slot=slot, browser_manager=browser_manager, cookies_file=cookies_file, in_use=True,
+                             priority=priority)
+        self._entries.append(entry)
+        return entry
+
+    def _remove(self, entry: PooledDriver) -> None:
+        """移除条目并关闭浏览器"""
+        with self._condition:
+            if entry in self._entries:
+                self._entries.remove(entry)
+            self._condition.notify_all()
+        entry.browser_manager.close_driver()
+
+    def _is_reusable(self, entry: PooledDriver) -> bool:
+        """检查空闲浏览器是否仍可复用：未超龄、cookies未更新且浏览器仍然响应"""
+        if self.max_age and time.time() - entry.created_at > self.max_age:
+            return False
+        if self._cookies_mtime(entry.cookies_file) != entry.cookies_mtime:
+            return False
+
+        driver = entry.browser_manager.driver
+        if not driver:
+            return False
+        try:
+            driver.execute_script("return document.readyState")
+            return True
+        except Exception as e:
+            logger.debug(f"浏览器[{entry.slot}]健康检查失败: {e}")
+            return False
+
+    def _warm(self, browser_manager: ChromeDriverManager, cookies_file: str) -> None:
+        """启动浏览器、进入创作者中心并加载cookies"""
+        from ..auth.cookie_manager import CookieManager
+
+        browser_manager.create_driver()
+        browser_manager.navigate_to_creator_center()
+
+        cookies = CookieManager(browser_manager.config).load_cookies()
+        if cookies:
+            cookie_result = browser_manager.load_cookies(cookies)
+            logger.info(f"🍪 Cookies加载结果: {cookie_result}")
+        else:
+            logger.warning(f"⚠️ 未找到cookies: {cookies_file}")
+
+    def _config_for(self, cookies_file: str) -> XHSConfig:
+        """获取指定账号的配置"""
+        if cookies_file == self.config.cookies_file:
+            return self.config
+        account_config = copy.copy(self.config)
+        account_config.cookies_file = cookies_file
+        account_config.cookies_dir = os.path.dirname(cookies_file) or "."
+        return account_config
+
+    @staticmethod
+    def _cookies_mtime(cookies_file: str) -> float:
+        """获取cookies文件的修改时间，用于发现重新登录"""
+        try:
+            return os.path.getmtime(cookies_file)
+        except OSError:
+            return 0.0
+
+
+# 全局驱动池实例
+_driver_pool: Optional[ChromeDriverPool] = None
+_driver_pool_lock = threading.Lock()
+
+
+def get_driver_pool(config: Optional[XHSConfig] = None) -> ChromeDriverPool:
+    """
+    获取全局浏览器驱动池，首次调用时创建
+
+    Args:
+        config: 配置管理器实例，默认使用默认配置
+
+    Returns:
+        浏览器驱动池实例
+    """
+    global _driver_pool
+
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = ChromeDriverPool(config or XHSConfig())
+            atexit.register(_driver_pool.close_all)
+        return _driver_pool
@@ -58,6 +58,14 @@ class PublishError(XHSToolkitError):
         super().__init__(message, "PUBLISH_ERROR", {"publish_step": publish_step})
 
 
+class TaskQueueFullError(XHSToolkitError):
+    """发布任务队列已满错误"""
+    
+    def __init__(self, queue_size: int):
+        super().__init__(f"发布任务队列已满（{queue_size}个任务排队中），请稍后重试", "QUEUE_FULL_ERROR",
+                         {"queue_size": queue_size})
+
+
 class NetworkError(XHSToolkitError):
     """网络相关错误"""
     
@@ -0,0 +1,170 @@
+"""
+分析数据缓存
+
+MCP数据分析工具在两次定时采集之间会被反复调用，而数据文件并没有变化。
+缓存解析后的数据集，以数据文件的签名（修改时间、大小）作为有效性校验：
+- 通过StorageManager写入数据时整体失效
+- 其他进程（例如命令行采集）修改了数据文件时，签名变化，对应条目自动失效
+- 按最近最少使用淘汰，条目数和估算内存都有上限
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def estimate_size(value: Any) -> int:
+    """粗略估算对象占用的内存（字节）"""
+    memory_usage = getattr(value, 'memory_usage', None)
+    if callable(memory_usage):  # pandas DataFrame/Series
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum() if hasattr(usage, 'sum') else usage)
+        except Exception:
+            pass
+
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set)):
+            stack.extend(obj)
+    return total
+
+
+class AnalyticsCache:
+    """带内存上限的LRU分析数据缓存（线程安全）"""
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 64 * 1024 * 1024):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最多缓存的条目数
+            max_bytes: 缓存估算内存上限（字节），超过时淘汰最久未使用的条目
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # 每次失效加一；加载期间发生过写入时，加载结果不再放入缓存
+        self.generation = 0
+
+    def get(self, key: Hashable, signature: Any = None) -> Tuple[bool, Any]:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+            signature: 数据签名，与缓存时的签名不同则视为失效
+
+        Returns:
+            (是否命中, 缓存值)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != signature:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key: Hashable, value: Any, signature: Any = None) -> None:
+        """写入缓存，超出上限时淘汰最久未使用的条目；单个值超过内存上限时不缓存"""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            logger.debug(f"分析数据过大（{size}字节），不缓存: {key}")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, signature, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def get_or_load(self, key: Hashable, signature: Any, loader: Callable[[], Any]) -> Any:
+        """命中时返回缓存值，否则调用loader加载并缓存"""
+        hit, value = self.get(key, signature)
+        if hit:
+            return value
+        generation = self.generation
+        value = loader()
+        if generation == self.generation:
+            self.put(key, value, signature)
+        return value
+
+    def invalidate(self) -> None:
+        """清空缓存（数据写入后调用）"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'generation': self.generation,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        """移除条目（调用方持有锁）"""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+
+# 全局分析数据缓存实例（首次使用时按环境变量创建）
+_analytics_cache: Optional[AnalyticsCache] = None
+_analytics_cache_lock = threading.Lock()
+
+
+def get_analytics_cache() -> AnalyticsCache:
+    """
+    获取全局分析数据缓存实例
+
+    Returns:
+        AnalyticsCache: 分析数据缓存
+    """
+    global _analytics_cache
+
+    with _analytics_cache_lock:
+        if _analytics_cache is None:
+            _analytics_cache = AnalyticsCache(
+                max_entries=int(os.getenv('ANALYTICS_CACHE_MAX_ENTRIES', '32')),
+                max_bytes=int(float(os.getenv('ANALYTICS_CACHE_MAX_MB', '64')) * 1024 * 1024)
+            )
+        return _analytics_cache
@@ -0,0 +1,242 @@
+"""
+创作者数据查询与聚合
+
+在服务端对存储中的历史数据做过滤、字段裁剪、聚合和分页（基于pandas向量化计算），
+MCP数据分析工具只返回紧凑的汇总结果，不再把几百行原始数据整体序列化给AI客户端
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .storage.schema import DATA_TYPE_FIELDS, INTEGER_FIELDS
+
+# 支持的聚合方式
+AGGREGATIONS = ('summary', 'none', 'sum', 'avg', 'top', 'latest')
+
+# 各数据类型的分组维度（除日期外）
+GROUP_KEYS = {
+    'dashboard': ['dimension'],
+    'content_analysis': [],
+    'fans': ['dimension']
+}
+
+# 同一条记录在多次采集中的唯一键，取最新一次采集的值
+RECORD_KEYS = {
+    'dashboard': ['dimension'],
+    'content_analysis': ['title', 'publish_time'],
+    'fans': ['dimension']
+}
+
+MAX_PAGE_SIZE = 500
+
+
+def prepare_frame(df: pd.DataFrame, data_type: str) -> pd.DataFrame:
+    """把整数字段统一转换为int64（存储中读出的可能是字符串），保证存在date列"""
+    df = df.copy()
+    for field in INTEGER_FIELDS.intersection(df.columns):
+        df[field] = pd.to_numeric(df[field], errors='coerce').fillna(0).astype('int64')
+    for field in ('created_at', 'updated_at'):
+        if field in df.columns and not pd.api.types.is_string_dtype(df[field]):
+            df[field] = df[field].map(lambda value: value.isoformat() if pd.notna(value) else '')
+    if 'date' not in df.columns:
+        df['date'] = df['created_at'].astype(str).str[:10] if 'created_at' in df.columns else ''
+    df['date'] = df['date'].astype(str)
+    return df
+
+
+def numeric_fields(data_type: str, fields: Optional[List[str]] = None) -> List[str]:
+    """数据类型的数值字段（指定fields时只保留其中的数值字段）"""
+    candidates = [field for field in DATA_TYPE_FIELDS[data_type] if field in INTEGER_FIELDS]
+    if fields:
+        candidates = [field for field in candidates if field in fields]
+    return candidates
+
+
+def latest_snapshot(df: pd.DataFrame, data_type: str) -> pd.DataFrame:
+    """每条记录（维度/笔记）只保留最新一次采集的值"""
+    if df.empty:
+        return df
+    return (df.sort_values('created_at', ascending=False, kind='stable')
+              .drop_duplicates(subset=RECORD_KEYS[data_type], keep='first'))
+
+
+def parse_cursor(cursor: Optional[str]) -> int:
+    """解析分页游标（上一页返回的next_cursor），空值表示第一页"""
+    if not cursor:
+        return 0
+    try:
+        offset = int(cursor)
+    except ValueError:
+        raise ValueError(f"无效的分页游标: {cursor}")
+    if offset < 0:
+        raise ValueError(f"无效的分页游标: {cursor}")
+    return offset
+
+
+def paginate(df: pd.DataFrame, cursor: Optional[str], page_size: int) -> Dict[str, Any]:
+    """按游标分页，返回当前页记录和下一页游标"""
+    offset = parse_cursor(cursor)
+    page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+    page = df.iloc[offset:offset + page_size]
+    next_offset = offset + len(page)
+    return {
+        'total': len(df),
+        'records': page.to_dict('records'),
+        'next_cursor': str(next_offset) if next_offset < len(df) else None
+    }
+
+
+def sortable(data_type: str, sort_by: str) -> bool:
+    """数据类型是否有该排序字段（top只能按整数字段排序）"""
+    return sort_by in INTEGER_FIELDS.intersection(DATA_TYPE_FIELDS[data_type])
+
+
+def query_data_types(load_frame: Callable[[str], pd.DataFrame], data_types: List[str],
+                     aggregate: str = 'summary', fields: Optional[List[str]] = None, top_n: int = 10,
+                     sort_by: str = 'views', cursor: Optional[str] = None, page_size: int = 50,
+                     load_latest: Optional[Callable[[str, int], List[Dict[str, Any]]]] = None) -> Dict[str, Any]:
+    """
+    查询一种或多种数据类型（MCP工具data_type=all时查询全部类型）
+
+    查询多种类型时，fields只保留各类型中存在的字段；某类型没有top的排序字段时，
+    该类型返回error，不影响其他类型
+
+    Args:
+        load_frame: 按数据类型读取历史数据的函数
+        data_types: 数据类型列表
+        load_latest: 按数据类型读取最新limit条记录的函数（存储的get_latest_data），
+            指定时latest只读取这些记录，不加载全部历史
+        其余参数同query_creator_data
+
+    Returns:
+        数据类型 -> 查询结果
+
+    Raises:
+        ValueError: 参数无效时
+    """
+    multiple = len(data_types) > 1
+    if cursor and multiple:
+        raise ValueError("分页查询需要指定单个data_type")
+
+    results: Dict[str, Any] = {}
+    for data_type in data_types:
+        type_fields = fields
+        if multiple:
+            if fields:
+                type_fields = [field for field in fields if field in DATA_TYPE_FIELDS[data_type]] or None
+            if aggregate == 'top' and not sortable(data_type, sort_by):
+                results[data_type] = {'data_type': data_type, 'aggregate': aggregate,
+                                      'error': f"{data_type}不能按{sort_by}排序"}
+                continue
+        if aggregate == 'latest' and load_latest is not None:
+            records = load_latest(data_type, max(1, min(int(top_n), MAX_PAGE_SIZE)))
+            # get_latest_data按从新到旧返回，还原为写入顺序
+            frame = pd.DataFrame(records[::-1], columns=DATA_TYPE_FIELDS[data_type])
+        else:
+            frame = load_frame(data_type)
+        results[data_type] = query_creator_data(
+            frame, data_type, aggregate=aggregate, fields=type_fields, top_n=top_n,
+            sort_by=sort_by, cursor=cursor, page_size=page_size
+        )
+    return results
+
+
+def query_creator_data(df: pd.DataFrame, data_type: str, aggregate: str = 'summary',
+                       fields: Optional[List[str]] = None, top_n: int = 10, sort_by: str = 'views',
+                       cursor: Optional[str] = None, page_size: int = 50) -> Dict[str, Any]:
+    """
+    对一种数据类型的历史数据做聚合查询
+
+    Args:
+        df: 存储read_frame读出的数据（已按日期、维度过滤）
+        data_type: 数据类型 (dashboard, content_analysis, fans)
+        aggregate: 聚合方式
+            summary 概览：记录数、日期范围、各维度/笔记最新值、内容按浏览量前top_n
+            none    原始记录（按创建时间倒序，分页）
+            sum/avg 按日期（和维度）分组求和/求平均（分页）
+            top     按sort_by取前top_n条（内容数据取每篇笔记的最新值）
+            latest  最近采集的top_n条记录（按创建时间倒序，同一时间以后写入的为新）
+        fields: 只返回这些字段，默认全部
+        top_n: top和summary返回的条数
+        sort_by: top排序字段
+        cursor: 分页游标
+        page_size: 每页条数
+
+    Returns:
+        查询结果字典
+
+    Raises:
+        ValueError: 参数无效时
+    """
+    if data_type not in DATA_TYPE_FIELDS:
+        raise ValueError(f"未知数据类型: {data_type}")
+    if aggregate not in AGGREGATIONS:
+        raise ValueError(f"不支持的聚合方式: {aggregate}，可选: {', '.join(AGGREGATIONS)}")
+    unknown = [field for field in (fields or []) if field not in DATA_TYPE_FIELDS[data_type] and field != 'date']
+    if unknown:
+        raise ValueError(f"{data_type}没有字段: {', '.join(unknown)}")
+
+    df = prepare_frame(df, data_type)
+    group_keys = GROUP_KEYS[data_type]
+    result: Dict[str, Any] = {'data_type': data_type, 'aggregate': aggregate}
+
+    if aggregate == 'none':
+        columns = fields or DATA_TYPE_FIELDS[data_type]
+        ordered = df.sort_values('created_at', ascending=False, kind='stable')[columns]
+        result.update(paginate(ordered, cursor, page_size))
+
+    elif aggregate in ('sum', 'avg'):
+        metrics = numeric_fields(data_type, fields)
+        grouped = df.groupby(['date'] + group_keys, sort=False)[metrics]
+        table = grouped.sum() if aggregate == 'sum' else grouped.mean().round(2)
+        table = table.reset_index().sort_values(['date'] + group_keys, ascending=False)
+        result.update(paginate(table, cursor, page_size))
+
+    elif aggregate == 'top':
+        if not sortable(data_type, sort_by):
+            raise ValueError(f"{data_type}不能按{sort_by}排序")
+        columns = fields or DATA_TYPE_FIELDS[data_type]
+        if sort_by not in columns:
+            columns = list(columns) + [sort_by]
+        top = latest_snapshot(df, data_type).nlargest(max(1, int(top_n)), sort_by)
+        result['records'] = top[columns].to_dict('records')
+
+    elif aggregate == 'latest':
+        if cursor:
+            raise ValueError("latest不支持分页")
+        columns = fields or DATA_TYPE_FIELDS[data_type]
+        latest = df.iloc[::-1].sort_values('created_at', ascending=False, kind='stable')
+        result['records'] = latest.head(max(1, min(int(top_n), MAX_PAGE_SIZE)))[columns].to_dict('records')
+
+    else:
+        result.update(_summary(df, data_type, fields, top_n))
+
+    return result
+
+
+def _summary(df: pd.DataFrame, data_type: str, fields: Optional[List[str]], top_n: int) -> Dict[str, Any]:
+    """数据概览"""
+    metrics = numeric_fields(data_type, fields)
+    summary: Dict[str, Any] = {
+        'records': len(df),
+        'first_date': df['date'].min() if len(df) else None,
+        'last_date': df['date'].max() if len(df) else None,
+        'collections': int(df['created_at'].nunique()) if len(df) else 0
+    }
+    if df.empty:
+        return summary
+
+    latest = latest_snapshot(df, data_type)
+    if data_type == 'content_analysis':
+        summary['notes'] = len(latest)
+        summary['totals'] = {field: int(value) for field, value in latest[metrics].sum().items()}
+        summary['averages'] = {field: round(float(value), 2) for field, value in latest[metrics].mean().items()}
+        if 'views' in latest.columns:
+            columns = ['title', 'publish_time'] + metrics
+            summary['top_notes'] = latest.nlargest(max(1, int(top_n)), 'views')[columns].to_dict('records')
+    else:
+        columns = ['dimension', 'date'] + metrics
+        summary['latest'] = latest[columns].to_dict('records')
+
+    return summary
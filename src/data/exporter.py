@@ -0,0 +1,244 @@
+"""
+数据流式导出
+
+按块读取存储中的历史数据并逐块写出，内存占用与历史长度无关：
+- jsonl    每行一条记录
+- json     JSON数组（逐块写出，不缩进）
+- parquet  带类型的列式文件，逐块写入行组，需要安装可选依赖 pyarrow
+- excel    openpyxl只写模式，逐行写入，每种数据一个工作表
+
+jsonl/json/parquet 每种数据一个文件，三种数据并行导出；Excel写入同一个工作簿，按顺序导出
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .storage.base import BaseStorage
+from .storage.schema import DATA_TYPE_FIELDS, INTEGER_FIELDS
+from ..core.exceptions import ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+# 数据类型 -> 导出名称（文件名、工作表名）
+EXPORT_NAMES = {
+    'dashboard': 'dashboard',
+    'content_analysis': 'content',
+    'fans': 'fans'
+}
+
+EXPORT_FORMATS = ('jsonl', 'json', 'parquet', 'excel')
+
+FILE_EXTENSIONS = {'jsonl': '.jsonl', 'json': '.json', 'parquet': '.parquet'}
+
+DEFAULT_CHUNKSIZE = 50000
+
+# 进度回调: progress(数据类型, 已导出行数)
+ProgressCallback = Callable[[str, int], None]
+
+
+class DataExporter:
+    """流式数据导出器"""
+
+    def __init__(self, storage: BaseStorage, chunksize: int = DEFAULT_CHUNKSIZE,
+                 progress: Optional[ProgressCallback] = None, headers: Optional[Dict[str, str]] = None):
+        """
+        初始化导出器
+
+        Args:
+            storage: 数据来源（本地存储）
+            chunksize: 每块读取的行数
+            progress: 进度回调，每写出一块调用一次
+            headers: 字段名 -> 表头（Excel使用，例如中文表头），默认使用字段名
+        """
+        self.storage = storage
+        self.chunksize = chunksize
+        self.progress = progress
+        self.headers = headers or {}
+
+    def export(self, format: str, output_path: Path, data_types: Optional[List[str]] = None,
+               start_date: Optional[str] = None, end_date: Optional[str] = None,
+               max_workers: int = 3) -> Dict[str, int]:
+        """
+        导出数据
+
+        Args:
+            format: 导出格式 (jsonl/json/parquet/excel)
+            output_path: 输出路径，excel为.xlsx文件路径，其他格式为输出目录
+            data_types: 要导出的数据类型，默认全部
+            start_date: 起始日期（含），格式YYYY-MM-DD
+            end_date: 结束日期（含），格式YYYY-MM-DD
+            max_workers: 并行导出的线程数
+
+        Returns:
+            数据类型 -> 导出行数（没有数据的类型不生成文件）
+
+        Raises:
+            ValueError: 不支持的格式
+            ConfigurationError: 缺少格式所需的可选依赖
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"不支持的格式: {format}，可选: {', '.join(EXPORT_FORMATS)}")
+        data_types = data_types or list(DATA_TYPE_FIELDS)
+
+        if format == 'excel':
+            return self._export_excel(output_path, data_types, start_date, end_date)
+
+        if format == 'parquet':
+            _require_pyarrow()
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        def export_one(data_type: str) -> int:
+            target = output_path / f"{EXPORT_NAMES[data_type]}{FILE_EXTENSIONS[format]}"
+            return self.export_file(format, data_type, target, start_date, end_date)
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="xhs-export") as executor:
+            counts = dict(zip(data_types, executor.map(export_one, data_types)))
+        return {data_type: count for data_type, count in counts.items() if count}
+
+    def export_file(self, format: str, data_type: str, target: Path,
+                    start_date: Optional[str] = None, end_date: Optional[str] = None) -> int:
+        """
+        把一种数据流式写入单个文件（写入临时文件，完成后改名；没有数据时不生成文件）
+
+        Returns:
+            导出行数
+        """
+        writer = {'jsonl': self._write_jsonl, 'json': self._write_json, 'parquet': self._write_parquet}[format]
+        tmp_target = target.with_name(f".{target.name}.tmp")
+        try:
+            rows = writer(data_type, tmp_target, self._chunks(data_type, start_date, end_date))
+            if rows:
+                tmp_target.replace(target)
+            return rows
+        finally:
+            if tmp_target.exists():
+                tmp_target.unlink()
+
+    def _chunks(self, data_type: str, start_date: Optional[str], end_date: Optional[str]):
+        """逐块读取数据，整数字段统一为int64，并报告进度"""
+        rows = 0
+        for chunk in self.storage.iter_frames(data_type, start_date, end_date, chunksize=self.chunksize):
+            chunk = chunk.copy()
+            for field in INTEGER_FIELDS.intersection(chunk.columns):
+                chunk[field] = pd.to_numeric(chunk[field], errors='coerce').fillna(0).astype('int64')
+            yield chunk
+            rows += len(chunk)
+            if self.progress:
+                self.progress(data_type, rows)
+
+    def _write_jsonl(self, data_type: str, target: Path, chunks) -> int:
+        """JSON Lines：每块直接追加写出"""
+        rows = 0
+        with open(target, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                body = chunk.to_json(orient='records', lines=True, force_ascii=False, date_format='iso')
+                f.write(body if body.endswith('\n') else body + '\n')
+                rows += len(chunk)
+        return rows
+
+    def _write_json(self, data_type: str, target: Path, chunks) -> int:
+        """JSON数组：逐块写出数组元素"""
+        rows = 0
+        with open(target, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for chunk in chunks:
+                body = chunk.to_json(orient='records', force_ascii=False, date_format='iso')[1:-1]
+                if body:
+                    f.write((',' if rows else '') + body)
+                rows += len(chunk)
+            f.write(']')
+        return rows
+
+    def _write_parquet(self, data_type: str, target: Path, chunks) -> int:
+        """Parquet：每块写为一个行组，全部块使用同一schema"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _export_schema(data_type)
+        rows = 0
+        writer = None
+        try:
+            for chunk in chunks:
+                if writer is None:
+                    writer = pq.ParquetWriter(target, schema)
+                chunk = chunk.reindex(columns=schema.names)
+                for field in schema.names:
+                    if not pa.types.is_integer(schema.field(field).type):
+                        chunk[field] = chunk[field].map(_to_text)
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    def _export_excel(self, target: Path, data_types: List[str], start_date: Optional[str],
+                      end_date: Optional[str]) -> Dict[str, int]:
+        """Excel：只写模式的工作簿，逐行写入（工作簿不是线程安全的，各工作表按顺序导出）"""
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise ConfigurationError("导出Excel需要安装openpyxl: pip install openpyxl", config_item="format")
+
+        workbook = Workbook(write_only=True)
+        counts = {}
+        for data_type in data_types:
+            fields = DATA_TYPE_FIELDS[data_type]
+            sheet = None
+            rows = 0
+            for chunk in self._chunks(data_type, start_date, end_date):
+                if sheet is None:
+                    sheet = workbook.create_sheet(title=EXPORT_NAMES[data_type].capitalize())
+                    sheet.append([self.headers.get(field, field) for field in fields])
+                for row in chunk.reindex(columns=fields).itertuples(index=False, name=None):
+                    sheet.append([_to_cell(value) for value in row])
+                rows += len(chunk)
+            if rows:
+                counts[data_type] = rows
+
+        if counts:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            workbook.save(target)
+        return counts
+
+
+def _require_pyarrow() -> None:
+    """检查pyarrow是否可用"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ConfigurationError("导出Parquet需要安装pyarrow: pip install pyarrow", config_item="format")
+
+
+def _export_schema(data_type: str):
+    """导出Parquet的schema：整数字段为int64，其余（包括时间）为字符串，附加date列"""
+    import pyarrow as pa
+
+    columns = [pa.field(field, pa.int64() if field in INTEGER_FIELDS else pa.string())
+               for field in DATA_TYPE_FIELDS[data_type]]
+    columns.append(pa.field('date', pa.string()))
+    return pa.schema(columns)
+
+
+def _to_text(value: Any) -> Optional[str]:
+    """导出为字符串列的值（时间转为ISO格式）"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def _to_cell(value: Any) -> Any:
+    """Excel单元格的值：numpy数值转为Python类型，时间转为ISO格式字符串"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
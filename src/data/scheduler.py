@@ -152,6 +152,8 @@ class DataCollectionScheduler:
             from ..xiaohongshu.data_collector.dashboard import collect_dashboard_data
             from ..xiaohongshu.data_collector.content_analysis import collect_content_analysis_data
             from ..xiaohongshu.data_collector.fans import collect_fans_data
+            from ..xiaohongshu.data_collector.utils import run_in_collector
+            from ..xiaohongshu.data_collector.parallel import collect_pages
         except ImportError as e:
             logger.error(f"导入数据采集模块失败: {e}")
             # 如果导入失败，尝试另一种导入方式
@@ -161,83 +163,50 @@ class DataCollectionScheduler:
                 from xiaohongshu.data_collector.dashboard import collect_dashboard_data
                 from xiaohongshu.data_collector.content_analysis import collect_content_analysis_data
                 from xiaohongshu.data_collector.fans import collect_fans_data
+                from xiaohongshu.data_collector.utils import run_in_collector
+                from xiaohongshu.data_collector.parallel import collect_pages
                 logger.info("使用备用导入方式成功")
             except ImportError as e2:
                 logger.error(f"备用导入方式也失败: {e2}")
                 return
         
-        # 创建WebDriver实例用于数据采集
-        driver = None
-        try:
-            driver = self.client.browser_manager.create_driver()
-            
-            # 加载cookies
-            cookies = self.client.cookie_manager.load_cookies()
-            if cookies:
-                # 先访问小红书主页以设置域名
-                driver.get("https://www.xiaohongshu.com")
-                
-                # 加载cookies
-                cookie_result = self.client.browser_manager.load_cookies(cookies)
-                logger.info(f"🍪 Cookies加载结果: {cookie_result}")
-            else:
-                logger.warning("⚠️ 未找到cookies，数据采集可能失败")
+        # 接口采集模式：直接解析页面加载的接口响应，失败时各采集函数会自动回退到页面元素采集
+        if self.client.config.collection_backend == "api":
+            from ..xiaohongshu.data_collector.api_collector import (
+                collect_dashboard_data_via_api, collect_content_analysis_data_via_api, collect_fans_data_via_api
+            )
+            collect_dashboard_data = collect_dashboard_data_via_api
+            collect_content_analysis_data = collect_content_analysis_data_via_api
+            collect_fans_data = collect_fans_data_via_api
+            logger.info("📡 使用接口采集模式")
         
+        # 需要采集的页面：同步采集函数放到采集线程池执行，避免阻塞事件循环
+        collectors = []
+        if collect_dashboard:
+            collectors.append(("仪表板", lambda driver: run_in_collector(collect_dashboard_data, driver, save_data=True)))
+        if collect_content:
+            collectors.append(("内容分析", lambda driver: collect_content_analysis_data(driver, save_data=True)))
+        if collect_fans:
+            collectors.append(("粉丝", lambda driver: run_in_collector(collect_fans_data, driver, save_data=True)))
+        total_count = len(collectors)
+        
+        # 从驱动池借出已加载cookies的浏览器；并发模式下每个页面使用独立浏览器同时采集
+        from ..core.driver_pool import get_driver_pool
+        driver_pool = get_driver_pool(self.client.config)
+        parallel = os.getenv('PARALLEL_COLLECTION', 'false').lower() == 'true'
+        
+        try:
+            results = await collect_pages(driver_pool, collectors, parallel=parallel)
         except Exception as e:
             logger.error(f"❌ 创建WebDriver失败: {e}")
             return
         
-        try:
-            # 采集仪表板数据
-            if collect_dashboard:
-                total_count += 1
-                try:
-                    logger.info("采集仪表板数据...")
-                    result = collect_dashboard_data(driver, save_data=True)
-                    if result.get("success", False):
-                        success_count += 1
-                        logger.info("✅ 仪表板数据采集完成")
-                    else:
-                        logger.error(f"❌ 仪表板数据采集失败: {result.get('error', '未知错误')}")
-                except Exception as e:
-                    logger.error(f"❌ 仪表板数据采集失败: {e}")
-                    
-            # 采集内容分析数据
-            if collect_content:
-                total_count += 1
-                try:
-                    logger.info("采集内容分析数据...")
-                    result = await collect_content_analysis_data(driver, save_data=True)
-                    if result.get("success", False):
-                        success_count += 1
-                        logger.info("✅ 内容分析数据采集完成")
-                    else:
-                        logger.error(f"❌ 内容分析数据采集失败: {result.get('error', '未知错误')}")
-                except Exception as e:
-                    logger.error(f"❌ 内容分析数据采集失败: {e}")
-                    
-            # 采集粉丝数据
-            if collect_fans:
-                total_count += 1
-                try:
-                    logger.info("采集粉丝数据...")
-                    result = collect_fans_data(driver, save_data=True)
-                    if result.get("success", False):
-                        success_count += 1
-                        logger.info("✅ 粉丝数据采集完成")
-                    else:
-                        logger.error(f"❌ 粉丝数据采集失败: {result.get('error', '未知错误')}")
-                except Exception as e:
-                    logger.error(f"❌ 粉丝数据采集失败: {e}")
-                    
-        finally:
-            # 确保关闭WebDriver
-            if driver:
-                try:
-                    driver.quit()
-                    logger.debug("🔒 WebDriver已关闭")
-                except Exception as e:
-                    logger.warning(f"⚠️ 关闭WebDriver时出错: {e}")
+        for name, result in results.items():
+            if result.get("success", False):
+                success_count += 1
+                logger.info(f"✅ {name}数据采集完成，耗时: {result['elapsed_seconds']}秒")
+            else:
+                logger.error(f"❌ {name}数据采集失败: {result.get('error', '未知错误')}")
                 
         # 记录采集结果
         end_time = datetime.now()
@@ -252,6 +221,8 @@ class DataCollectionScheduler:
             'total_tasks': total_count,
             'successful_tasks': success_count,
             'failed_tasks': total_count - success_count,
+            'parallel': parallel,
+            'page_seconds': {name: result.get('elapsed_seconds') for name, result in results.items()},
             'tasks': {
                 'dashboard': collect_dashboard,
                 'content_analysis': collect_content,
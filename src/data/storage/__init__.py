@@ -6,10 +6,16 @@
 
 from .base import BaseStorage
 from .csv_storage import CSVStorage
+from .partitioned_storage import PartitionedCSVStorage
+from .parquet_storage import ParquetStorage
+from .sqlite_storage import SQLiteStorage
 from .pg_storage import PostgreSQLStorage
 
 __all__ = [
     'BaseStorage',
     'CSVStorage',
+    'PartitionedCSVStorage',
+    'ParquetStorage',
+    'SQLiteStorage',
     'PostgreSQLStorage'
 ] 
\ No newline at end of file
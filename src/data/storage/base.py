@@ -5,7 +5,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 from datetime import datetime
 
 
@@ -90,6 +90,50 @@ class BaseStorage(ABC):
         """关闭存储连接"""
         pass
     
+    def data_signature(self, data_type: str) -> Any:
+        """
+        数据签名，数据变化时签名随之变化，用于判断缓存是否有效
+        
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+            
+        Returns:
+            可比较的签名，默认为None（只依赖写入时的缓存失效）
+        """
+        return None
+    
+    def read_frame(self, data_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                   dimension: Optional[str] = None) -> "pd.DataFrame":
+        """
+        读取全部历史数据为DataFrame（用于服务端聚合分析）
+        
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+            start_date: 起始日期（含），格式YYYY-MM-DD
+            end_date: 结束日期（含），格式YYYY-MM-DD
+            dimension: 只读取该维度的数据（仪表板、粉丝数据）
+            
+        Returns:
+            DataFrame，除数据字段外包含写入日期列date
+        """
+        raise NotImplementedError(f"{type(self).__name__} 不支持读取历史数据")
+    
+    def iter_frames(self, data_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                    chunksize: int = 50000) -> Iterator["pd.DataFrame"]:
+        """
+        分块读取历史数据（用于流式导出），默认一次读取全部
+        
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+            start_date: 起始日期（含），格式YYYY-MM-DD
+            end_date: 结束日期（含），格式YYYY-MM-DD
+            chunksize: 每块的最大行数
+            
+        Yields:
+            DataFrame，列与read_frame一致
+        """
+        yield self.read_frame(data_type, start_date, end_date)
+    
     def _add_timestamp(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         为数据添加时间戳
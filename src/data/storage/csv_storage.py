@@ -5,6 +5,8 @@ CSV存储实现
 """
 
 import csv
+import heapq
+import io
 import json
 import logging
 import pandas as pd
@@ -13,6 +15,7 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 
 from .base import BaseStorage
+from .schema import DASHBOARD_FIELDS, CONTENT_ANALYSIS_FIELDS, FANS_FIELDS
 
 logger = logging.getLogger(__name__)
 
@@ -37,22 +40,9 @@ class CSVStorage(BaseStorage):
         self.fans_file = self.csv_dir / 'fans_data.csv'
         
         # CSV字段定义（英文字段名，用于代码逻辑和数据库）
-        self.dashboard_fields = [
-            'created_at', 'updated_at', 'timestamp', 'dimension',
-            'views', 'likes', 'collects', 'comments', 'shares', 'interactions'
-        ]
-        self.content_analysis_fields = [
-            'created_at', 'updated_at', 'timestamp', 'title', 'note_type', 'publish_time',
-            'views', 'likes', 'comments', 'collects', 'shares', 'fans_growth', 'avg_watch_time', 'danmu_count',
-            # 观众来源数据
-            'source_recommend', 'source_search', 'source_follow', 'source_other',
-            # 观众分析数据
-            'gender_male', 'gender_female', 'age_18_24', 'age_25_34', 'age_35_44', 'age_45_plus',
-            'city_top1', 'city_top2', 'city_top3', 'interest_top1', 'interest_top2', 'interest_top3'
-        ]
-        self.fans_fields = [
-            'created_at', 'updated_at', 'timestamp', 'dimension', 'total_fans', 'new_fans', 'lost_fans'
-        ]
+        self.dashboard_fields = list(DASHBOARD_FIELDS)
+        self.content_analysis_fields = list(CONTENT_ANALYSIS_FIELDS)
+        self.fans_fields = list(FANS_FIELDS)
         
         # 中文表头映射（用于CSV文件显示）
         self.field_chinese_mapping = {
@@ -109,6 +99,9 @@ class CSVStorage(BaseStorage):
         self.content_analysis_chinese_headers = [self.field_chinese_mapping[field] for field in self.content_analysis_fields]
         self.fans_chinese_headers = [self.field_chinese_mapping[field] for field in self.fans_fields]
         
+        # 文件路径 -> ((修改时间, 大小), 是否按created_at升序)，由get_latest_data完整扫描时记录
+        self._order_index: Dict[Path, Any] = {}
+        
         # 自动初始化
         self._initialize_sync()
     
@@ -212,41 +205,7 @@ class CSVStorage(BaseStorage):
                 self._initialize_sync()
             
             # 处理数据格式
-            rows = []
-            for item in data:
-                row = self._add_timestamp({
-                    'timestamp': item.get('timestamp', ''),
-                    'title': item.get('title', ''),
-                    'note_type': item.get('note_type', ''),
-                    'publish_time': item.get('publish_time', ''),
-                    'views': item.get('views', 0),
-                    'likes': item.get('likes', 0),
-                    'comments': item.get('comments', 0),
-                    'collects': item.get('collects', 0),
-                    'shares': item.get('shares', 0),
-                    'fans_growth': item.get('fans_growth', 0),
-                    'avg_watch_time': item.get('avg_watch_time', ''),
-                    'danmu_count': item.get('danmu_count', 0),
-                    # 观众来源数据
-                    'source_recommend': item.get('source_recommend', '0%'),
-                    'source_search': item.get('source_search', '0%'),
-                    'source_follow': item.get('source_follow', '0%'),
-                    'source_other': item.get('source_other', '0%'),
-                    # 观众分析数据
-                    'gender_male': item.get('gender_male', '0%'),
-                    'gender_female': item.get('gender_female', '0%'),
-                    'age_18_24': item.get('age_18_24', '0%'),
-                    'age_25_34': item.get('age_25_34', '0%'),
-                    'age_35_44': item.get('age_35_44', '0%'),
-                    'age_45_plus': item.get('age_45_plus', '0%'),
-                    'city_top1': item.get('city_top1', ''),
-                    'city_top2': item.get('city_top2', ''),
-                    'city_top3': item.get('city_top3', ''),
-                    'interest_top1': item.get('interest_top1', ''),
-                    'interest_top2': item.get('interest_top2', ''),
-                    'interest_top3': item.get('interest_top3', '')
-                })
-                rows.append(row)
+            rows = [self._build_content_analysis_row(item) for item in data]
             
             # 按日期覆盖保存
             self._save_with_daily_overwrite(self.content_analysis_file, self.content_analysis_fields, rows, self.content_analysis_chinese_headers)
@@ -257,6 +216,61 @@ class CSVStorage(BaseStorage):
             logger.error(f"❌ 保存内容分析数据失败: {e}")
             raise
     
+    def append_content_analysis_data(self, data: List[Dict[str, Any]]) -> None:
+        """
+        追加保存内容分析数据（增量采集只写入有变化的笔记，不重写文件）
+        
+        Args:
+            data: 有变化的内容分析数据列表
+        """
+        try:
+            if not self._initialized:
+                self._initialize_sync()
+            
+            rows = [self._build_content_analysis_row(item) for item in data]
+            self._append_to_csv(self.content_analysis_file, self.content_analysis_fields, rows)
+            
+            logger.info(f"💾 内容分析增量数据已追加到CSV: {len(rows)} 条记录")
+            
+        except Exception as e:
+            logger.error(f"❌ 追加内容分析数据失败: {e}")
+            raise
+    
+    def _build_content_analysis_row(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """把一篇笔记的数据转换为内容分析CSV行"""
+        return self._add_timestamp({
+            'timestamp': item.get('timestamp', ''),
+            'title': item.get('title', ''),
+            'note_type': item.get('note_type', ''),
+            'publish_time': item.get('publish_time', ''),
+            'views': item.get('views', 0),
+            'likes': item.get('likes', 0),
+            'comments': item.get('comments', 0),
+            'collects': item.get('collects', 0),
+            'shares': item.get('shares', 0),
+            'fans_growth': item.get('fans_growth', 0),
+            'avg_watch_time': item.get('avg_watch_time', ''),
+            'danmu_count': item.get('danmu_count', 0),
+            # 观众来源数据
+            'source_recommend': item.get('source_recommend', '0%'),
+            'source_search': item.get('source_search', '0%'),
+            'source_follow': item.get('source_follow', '0%'),
+            'source_other': item.get('source_other', '0%'),
+            # 观众分析数据
+            'gender_male': item.get('gender_male', '0%'),
+            'gender_female': item.get('gender_female', '0%'),
+            'age_18_24': item.get('age_18_24', '0%'),
+            'age_25_34': item.get('age_25_34', '0%'),
+            'age_35_44': item.get('age_35_44', '0%'),
+            'age_45_plus': item.get('age_45_plus', '0%'),
+            'city_top1': item.get('city_top1', ''),
+            'city_top2': item.get('city_top2', ''),
+            'city_top3': item.get('city_top3', ''),
+            'interest_top1': item.get('interest_top1', ''),
+            'interest_top2': item.get('interest_top2', ''),
+            'interest_top3': item.get('interest_top3', '')
+        })
+    
     def save_fans_data(self, data: List[Dict[str, Any]]) -> None:
         """
         同步保存粉丝数据到CSV
@@ -320,35 +334,232 @@ class CSVStorage(BaseStorage):
             if not file_path.exists():
                 return []
             
-            # 读取CSV文件
-            data = []
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                headers = next(reader, None)  # 读取表头
-                
-                if headers:
-                    # 检查是否为中文表头
-                    if headers == chinese_headers:
-                        # 中文表头，需要转换为英文字段名
-                        for row in reader:
-                            if len(row) == len(fields):
-                                row_dict = {field: value for field, value in zip(fields, row)}
-                                data.append(row_dict)
-                    else:
-                        # 英文表头或其他格式，直接使用
-                        for row in reader:
-                            if len(row) == len(headers):
-                                row_dict = {header: value for header, value in zip(headers, row)}
-                                data.append(row_dict)
-            
-            # 按创建时间倒序排列，返回最新的limit条
-            data.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-            return data[:limit]
+            return self._read_latest_rows(file_path, fields, chinese_headers, limit)
             
         except Exception as e:
             logger.error(f"❌ 获取最新数据失败: {e}")
             return []
     
+    def _read_latest_rows(self, file_path: Path, fields: List[str], chinese_headers: List[str],
+                          limit: int) -> List[Dict[str, Any]]:
+        """
+        从文件末尾向前读取最新的limit行
+        
+        只有上一次完整扫描证明文件按created_at升序、且文件之后未被修改（大小和修改时间不变）时，
+        才读够limit行就停止；否则扫描整个文件，用大小为limit的堆保留最新的行（内存占用不随历史增长），
+        并顺带记录文件是否有序，供下一次读取使用
+        """
+        if limit <= 0:
+            return []
+        
+        stat = file_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        proven_ordered = self._order_index.get(file_path) == (signature, True)
+        
+        with open(file_path, 'rb') as f:
+            header_line = f.readline()
+            data_start = f.tell()
+        
+        headers = next(csv.reader([header_line.decode('utf-8-sig')]), None)
+        if not headers:
+            return []
+        # 中文表头转换为英文字段名（与read_frame一致，兼容列数较少的旧文件）
+        header_mapping = dict(zip(chinese_headers, fields))
+        columns = [header_mapping.get(header, header) for header in headers]
+        
+        def parse(record: bytes) -> Optional[Dict[str, Any]]:
+            # 记录中可能有引号内的换行，交给csv.reader按CSV规则拆分字段
+            row = next(csv.reader(io.StringIO(record.decode('utf-8'), newline='')), None)
+            if not row or len(row) != len(columns):
+                return None
+            return dict(zip(columns, row))
+        
+        heap = []  # (created_at, -序号, 行)，序号从文件末尾开始计数，同一时间的行以文件中靠后（后写入）的为新
+        ordered = True
+        previous = None
+        complete = True
+        try:
+            for seq, record in enumerate(self._iter_lines_reversed(file_path, data_start)):
+                row = parse(record)
+                if row is None:
+                    continue
+                
+                created_at = row.get('created_at', '')
+                if previous is not None and created_at > previous:
+                    ordered = False
+                previous = created_at
+                
+                if len(heap) < limit:
+                    heapq.heappush(heap, (created_at, -seq, row))
+                elif (created_at, -seq) > heap[0][:2]:
+                    heapq.heapreplace(heap, (created_at, -seq, row))
+                
+                # 已知整个文件有序时，末尾的limit行就是最新的limit行
+                if proven_ordered and len(heap) >= limit:
+                    complete = False
+                    break
+        except ValueError as e:
+            logger.warning(f"⚠️ {file_path.name} {e}，改为从文件开头按CSV规则读取")
+            heap = self._read_latest_rows_forward(file_path, columns, limit)
+            complete = False
+        
+        if complete:
+            self._order_index[file_path] = (signature, ordered)
+        
+        # 按创建时间倒序排列
+        return [row for _, _, row in sorted(heap, key=lambda item: item[:2], reverse=True)]
+    
+    @staticmethod
+    def _read_latest_rows_forward(file_path: Path, columns: List[str], limit: int) -> List[Any]:
+        """从文件开头用csv.reader读取，用大小为limit的堆保留最新的行，返回堆 (created_at, 序号, 行)"""
+        heap = []
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)  # 表头
+            for seq, row in enumerate(reader):
+                if len(row) != len(columns):
+                    continue
+                row = dict(zip(columns, row))
+                key = (row.get('created_at', ''), seq)
+                if len(heap) < limit:
+                    heapq.heappush(heap, (*key, row))
+                elif key > heap[0][:2]:
+                    heapq.heapreplace(heap, (*key, row))
+        return heap
+    
+    @staticmethod
+    def _iter_lines_reversed(file_path: Path, start: int = 0, block_size: int = 65536):
+        """
+        从文件末尾开始按块向前读取，逐条记录返回（字节串），不读取start之前的内容
+        
+        引号内的换行不是记录分隔：完整的记录中引号总是成对出现，所以某个换行之后尚未返回的内容中
+        引号个数为偶数时，该换行才是记录的边界
+        
+        Raises:
+            ValueError: 读到start时引号仍不成对（文件不是合法的CSV，例如写入中断）
+        """
+        with open(file_path, 'rb') as f:
+            f.seek(0, 2)
+            position = f.tell()
+            pending = b''  # 尚未确定起点的记录（位于已读内容的最前面）
+            pending_quotes = 0
+            while position > start:
+                read_size = min(block_size, position - start)
+                position -= read_size
+                f.seek(position)
+                pieces = f.read(read_size).split(b'\n')
+                # 块的最后一段与上一块开头的未完成记录相连
+                tail = pieces.pop()
+                pending = tail + pending
+                pending_quotes += tail.count(b'"')
+                for piece in reversed(pieces):
+                    if pending_quotes % 2 == 0:
+                        if pending.strip():
+                            yield pending.rstrip(b'\r')
+                        pending, pending_quotes = piece, piece.count(b'"')
+                    else:
+                        pending = piece + b'\n' + pending
+                        pending_quotes += piece.count(b'"')
+            if pending_quotes % 2:
+                raise ValueError("引号不成对")
+            if pending.strip():
+                yield pending.rstrip(b'\r')
+    
+    def read_frame(self, data_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                   dimension: Optional[str] = None) -> pd.DataFrame:
+        """
+        读取全部历史数据为DataFrame
+        
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+            start_date: 起始日期（含），格式YYYY-MM-DD
+            end_date: 结束日期（含），格式YYYY-MM-DD
+            dimension: 只读取该维度的数据
+            
+        Returns:
+            DataFrame（所有字段为字符串），包含按创建时间得到的日期列date
+        """
+        file_path, fields, chinese_headers = self._frame_source(data_type)
+        df = self._read_csv_frame(file_path, fields, chinese_headers)
+        return self._filter_frame(df, start_date, end_date, dimension)
+    
+    def iter_frames(self, data_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                    chunksize: int = 50000):
+        """
+        分块读取历史数据，内存占用与文件大小无关
+        
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+            start_date: 起始日期（含），格式YYYY-MM-DD
+            end_date: 结束日期（含），格式YYYY-MM-DD
+            chunksize: 每块的最大行数
+            
+        Yields:
+            DataFrame，列与read_frame一致
+        """
+        file_path, fields, chinese_headers = self._frame_source(data_type)
+        if not file_path.exists():
+            return
+        
+        reader = pd.read_csv(file_path, dtype=str, keep_default_na=False, on_bad_lines='skip', chunksize=chunksize)
+        with reader:
+            for chunk in reader:
+                chunk = self._filter_frame(self._normalize_frame(chunk, fields, chinese_headers), start_date, end_date, None)
+                if not chunk.empty:
+                    yield chunk
+    
+    def _frame_source(self, data_type: str):
+        """数据类型对应的 (CSV文件路径, 字段列表, 中文表头)"""
+        file_info = {
+            'dashboard': (self.dashboard_file, self.dashboard_fields, self.dashboard_chinese_headers),
+            'content_analysis': (self.content_analysis_file, self.content_analysis_fields, self.content_analysis_chinese_headers),
+            'fans': (self.fans_file, self.fans_fields, self.fans_chinese_headers)
+        }.get(data_type)
+        if file_info is None:
+            raise ValueError(f"未知数据类型: {data_type}")
+        return file_info
+    
+    @classmethod
+    def _read_csv_frame(cls, file_path: Path, fields: List[str], chinese_headers: List[str]) -> pd.DataFrame:
+        """读取CSV文件为字符串DataFrame，中文表头转换为英文字段名，缺失的字段补空列"""
+        if not file_path.exists():
+            return pd.DataFrame(columns=fields + ['date'])
+        
+        df = pd.read_csv(file_path, dtype=str, keep_default_na=False, on_bad_lines='skip')
+        return cls._normalize_frame(df, fields, chinese_headers)
+    
+    @staticmethod
+    def _normalize_frame(df: pd.DataFrame, fields: List[str], chinese_headers: List[str]) -> pd.DataFrame:
+        """中文表头转换为英文字段名，按字段定义排列列，添加按创建时间得到的日期列date"""
+        df = df.rename(columns=dict(zip(chinese_headers, fields))).reindex(columns=fields, fill_value='')
+        df['date'] = df['created_at'].str[:10]
+        return df
+    
+    @staticmethod
+    def _filter_frame(df: pd.DataFrame, start_date: Optional[str], end_date: Optional[str],
+                      dimension: Optional[str]) -> pd.DataFrame:
+        """按日期范围和维度过滤"""
+        mask = pd.Series(True, index=df.index)
+        if start_date:
+            mask &= df['date'] >= start_date
+        if end_date:
+            mask &= df['date'] <= end_date
+        if dimension and 'dimension' in df.columns:
+            mask &= df['dimension'] == dimension
+        return df[mask].reset_index(drop=True)
+    
+    def data_signature(self, data_type: str) -> Any:
+        """数据文件的 (修改时间, 大小)，文件不存在时为None"""
+        file_path = {
+            'dashboard': self.dashboard_file,
+            'content_analysis': self.content_analysis_file,
+            'fans': self.fans_file
+        }.get(data_type)
+        if file_path is None or not file_path.exists():
+            return None
+        stat = file_path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    
     async def close(self) -> None:
         """关闭存储连接"""
         logger.debug("📁 CSV存储连接已关闭")
@@ -0,0 +1,293 @@
+"""
+Parquet列式存储实现
+
+按数据类型和日期分区保存为带类型的Parquet文件（hive分区目录）：
+    parquet/content_analysis/date=2024-06-20/part.parquet
+
+读取时支持列裁剪，以及按日期（分区裁剪）和维度（行组过滤）的谓词下推，
+几个月的历史数据无需再逐行解析字符串。需要安装可选依赖 pyarrow
+"""
+
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import pandas as pd
+
+from .base import BaseStorage
+from .schema import DATA_TYPE_FIELDS, INTEGER_FIELDS, TIMESTAMP_FIELDS, normalize_record
+from ...core.exceptions import ConfigurationError
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # 可选依赖
+    pa = ds = pq = None
+
+logger = logging.getLogger(__name__)
+
+PARTITION_FILE = 'part.parquet'
+
+
+def build_arrow_schema(data_type: str) -> "pa.Schema":
+    """根据字段定义生成Arrow schema：整数字段为int64，写入时间为timestamp，其余为字符串"""
+    columns = []
+    for field in DATA_TYPE_FIELDS[data_type]:
+        if field in INTEGER_FIELDS:
+            columns.append(pa.field(field, pa.int64()))
+        elif field in TIMESTAMP_FIELDS:
+            columns.append(pa.field(field, pa.timestamp('us')))
+        else:
+            columns.append(pa.field(field, pa.string()))
+    return pa.schema(columns)
+
+
+class ParquetStorage(BaseStorage):
+    """Parquet列式存储实现类"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        初始化Parquet存储
+
+        Args:
+            config: 配置参数，包含data_dir等
+
+        Raises:
+            ConfigurationError: 未安装pyarrow时
+        """
+        if pa is None:
+            raise ConfigurationError("Parquet存储需要安装pyarrow: pip install pyarrow", config_item="STORAGE_BACKEND")
+
+        super().__init__(config)
+        self.data_dir = Path(config.get('data_dir', 'src/data'))
+        self.parquet_dir = self.data_dir / 'parquet'
+        self.schemas = {data_type: build_arrow_schema(data_type) for data_type in DATA_TYPE_FIELDS}
+        self._initialize_sync()
+
+    def _initialize_sync(self) -> None:
+        """同步初始化，创建各数据类型的目录"""
+        for data_type in DATA_TYPE_FIELDS:
+            (self.parquet_dir / data_type).mkdir(parents=True, exist_ok=True)
+        self._initialized = True
+        logger.info(f"📁 Parquet存储初始化成功，数据目录: {self.parquet_dir}")
+
+    async def initialize(self) -> bool:
+        """
+        异步初始化Parquet存储
+
+        Returns:
+            bool: 初始化是否成功
+        """
+        try:
+            self._initialize_sync()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Parquet存储初始化失败: {e}")
+            return False
+
+    def save_dashboard_data(self, data: List[Dict[str, Any]]) -> None:
+        """保存仪表板数据（覆盖当天分区）"""
+        self._save_today('dashboard', data)
+
+    def save_content_analysis_data(self, data: List[Dict[str, Any]]) -> None:
+        """保存内容分析数据（覆盖当天分区）"""
+        self._save_today('content_analysis', data)
+
+    def append_content_analysis_data(self, data: List[Dict[str, Any]]) -> None:
+        """追加内容分析增量数据到当天分区"""
+        self._save_today('content_analysis', data, append=True)
+
+    def save_fans_data(self, data: List[Dict[str, Any]]) -> None:
+        """保存粉丝数据（覆盖当天分区）"""
+        self._save_today('fans', data)
+
+    def read(self, data_type: str, columns: Optional[List[str]] = None,
+             start_date: Optional[str] = None, end_date: Optional[str] = None,
+             dimension: Optional[str] = None) -> pd.DataFrame:
+        """
+        读取数据
+
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+            columns: 只读取这些列，默认全部
+            start_date: 起始日期（含），格式YYYY-MM-DD
+            end_date: 结束日期（含），格式YYYY-MM-DD
+            dimension: 只读取该维度的数据（仪表板、粉丝数据）
+
+        Returns:
+            DataFrame，包含date分区列
+        """
+        dataset = self._dataset(data_type)
+        if dataset is None:
+            return pd.DataFrame(columns=(columns or DATA_TYPE_FIELDS[data_type]))
+
+        table = dataset.to_table(columns=columns, filter=self._filter_expression(data_type, start_date, end_date, dimension))
+        return table.to_pandas()
+
+    def read_frame(self, data_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                   dimension: Optional[str] = None) -> pd.DataFrame:
+        """读取全部历史数据为DataFrame（日期和维度条件下推到分区裁剪和行组过滤）"""
+        if data_type not in DATA_TYPE_FIELDS:
+            raise ValueError(f"未知数据类型: {data_type}")
+        df = self.read(data_type, start_date=start_date, end_date=end_date, dimension=dimension or None)
+        if 'date' not in df.columns:
+            df['date'] = pd.Series(dtype=str)
+        return df
+
+    def iter_frames(self, data_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                    chunksize: int = 50000):
+        """按批次扫描数据集（不把全部数据读入内存）"""
+        if data_type not in DATA_TYPE_FIELDS:
+            raise ValueError(f"未知数据类型: {data_type}")
+        dataset = self._dataset(data_type)
+        if dataset is None:
+            return
+
+        batches = dataset.to_batches(filter=self._filter_expression(data_type, start_date, end_date, None),
+                                     batch_size=chunksize)
+        for batch in batches:
+            if batch.num_rows:
+                yield batch.to_pandas()
+
+    async def get_latest_data(self, data_type: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        获取最新数据：从最近的分区开始读取，凑够limit条即停止
+
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+            limit: 返回数据条数限制
+
+        Returns:
+            List[Dict[str, Any]]: 数据列表（时间字段为ISO格式字符串，与CSV存储一致）
+        """
+        if data_type not in DATA_TYPE_FIELDS:
+            logger.warning(f"⚠️ 未知数据类型: {data_type}")
+            return []
+
+        try:
+            frames = []
+            row_count = 0
+            for date in sorted(self._partition_dates(data_type), reverse=True):
+                frame = pq.read_table(self._partition_file(data_type, date)).to_pandas()
+                frames.append(frame)
+                row_count += len(frame)
+                if row_count >= limit:
+                    break
+
+            if not frames:
+                return []
+
+            df = pd.concat(frames, ignore_index=True).sort_values('created_at', ascending=False).head(limit)
+            for field in TIMESTAMP_FIELDS:
+                df[field] = df[field].map(lambda value: value.isoformat() if pd.notna(value) else '')
+            return df.to_dict('records')
+
+        except Exception as e:
+            logger.error(f"❌ 获取最新数据失败: {e}")
+            return []
+
+    async def close(self) -> None:
+        """关闭存储连接"""
+        logger.debug("📁 Parquet存储连接已关闭")
+
+    def data_signature(self, data_type: str) -> Any:
+        """各分区文件的 (日期, 修改时间, 大小)"""
+        if data_type not in DATA_TYPE_FIELDS:
+            return None
+        signature = []
+        for date in sorted(self._partition_dates(data_type)):
+            stat = self._partition_file(data_type, date).stat()
+            signature.append((date, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def get_storage_info(self) -> Dict[str, Any]:
+        """获取存储信息"""
+        info = {
+            'storage_type': 'Parquet',
+            'data_path': str(self.data_dir),
+            'parquet_path': str(self.parquet_dir),
+            'initialized': self._initialized,
+            'partitions': {}
+        }
+
+        for data_type in DATA_TYPE_FIELDS:
+            dates = sorted(self._partition_dates(data_type))
+            files = [self._partition_file(data_type, date) for date in dates]
+            info['partitions'][data_type] = {
+                'count': len(dates),
+                'first_date': dates[0] if dates else None,
+                'last_date': dates[-1] if dates else None,
+                'records': sum(pq.ParquetFile(f).metadata.num_rows for f in files),
+                'size_bytes': sum(f.stat().st_size for f in files)
+            }
+
+        return info
+
+    def _save_today(self, data_type: str, data: List[Dict[str, Any]], append: bool = False) -> None:
+        """把数据写入当天的分区（append为False时覆盖当天分区）"""
+        try:
+            now = datetime.now()
+            records = []
+            for item in data:
+                record = normalize_record(data_type, item)
+                record['created_at'] = now
+                record['updated_at'] = now
+                records.append(record)
+
+            table = pa.Table.from_pylist(records, schema=self.schemas[data_type])
+            partition_file = self._partition_file(data_type, now.strftime('%Y-%m-%d'))
+            if append and partition_file.exists():
+                table = pa.concat_tables([pq.read_table(partition_file), table])
+
+            self._write_partition(partition_file, table)
+            logger.info(f"💾 {data_type}数据已保存到Parquet分区 {partition_file.parent.name}: {len(records)} 条记录")
+
+        except Exception as e:
+            logger.error(f"❌ 保存{data_type}数据到Parquet失败: {e}")
+            raise
+
+    def _filter_expression(self, data_type: str, start_date: Optional[str], end_date: Optional[str],
+                           dimension: Optional[str]):
+        """日期范围和维度的过滤表达式，没有条件时为None"""
+        expression = None
+        conditions = []
+        if start_date:
+            conditions.append(ds.field('date') >= start_date)
+        if end_date:
+            conditions.append(ds.field('date') <= end_date)
+        if dimension is not None and 'dimension' in DATA_TYPE_FIELDS[data_type]:
+            conditions.append(ds.field('dimension') == dimension)
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def _write_partition(self, partition_file: Path, table: "pa.Table") -> None:
+        """原子写入分区文件：先写临时文件再替换"""
+        partition_file.parent.mkdir(parents=True, exist_ok=True)
+        # 以"."开头的临时文件不会被数据集扫描到
+        tmp_file = partition_file.parent / f".{PARTITION_FILE}.tmp"
+        pq.write_table(table, tmp_file)
+        os.replace(tmp_file, partition_file)
+
+    def _partition_file(self, data_type: str, date: str) -> Path:
+        """数据类型在指定日期的分区文件"""
+        return self.parquet_dir / data_type / f"date={date}" / PARTITION_FILE
+
+    def _partition_dates(self, data_type: str) -> List[str]:
+        """数据类型已有的分区日期"""
+        base = self.parquet_dir / data_type
+        if not base.exists():
+            return []
+        return [path.name.split('=', 1)[1] for path in base.glob('date=*')
+                if (path / PARTITION_FILE).exists()]
+
+    def _dataset(self, data_type: str) -> Optional["ds.Dataset"]:
+        """数据类型对应的分区数据集，没有数据时返回None"""
+        if not self._partition_dates(data_type):
+            return None
+        partitioning = ds.partitioning(pa.schema([pa.field('date', pa.string())]), flavor='hive')
+        return ds.dataset(self.parquet_dir / data_type, format='parquet', partitioning=partitioning,
+                          schema=self.schemas[data_type].append(pa.field('date', pa.string())))
@@ -0,0 +1,251 @@
+"""
+按日期分区的CSV存储实现
+
+每种数据类型一个目录，每天一个CSV文件：
+    creator_db/partitions/dashboard_data/2024-06-20.csv
+
+保存时只重写当天的分区文件（先写临时文件再原子替换），不再读取和重写全部历史，
+写到一半崩溃也不会损坏已有数据
+"""
+
+import csv
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import pandas as pd
+
+from .csv_storage import CSVStorage
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionedCSVStorage(CSVStorage):
+    """按数据类型和日期分区的CSV存储（字段定义和数据处理与CSVStorage一致）"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        初始化分区存储
+
+        Args:
+            config: 配置参数，包含data_dir等
+        """
+        self.partition_dir = Path(config.get('data_dir', 'src/data')) / 'creator_db' / 'partitions'
+        super().__init__(config)
+
+    def _initialize_sync(self) -> None:
+        """同步初始化分区存储，首次启用时把原有的单文件CSV历史拆分为分区"""
+        try:
+            for file_path, fields, chinese_headers in self._data_files():
+                partition_path = self.partition_dir / file_path.stem
+                if not partition_path.exists():
+                    partition_path.mkdir(parents=True, exist_ok=True)
+                    self._import_legacy_file(file_path, fields, chinese_headers)
+
+            self._initialized = True
+            logger.info(f"📁 分区存储初始化成功，数据目录: {self.partition_dir}")
+
+        except Exception as e:
+            logger.error(f"❌ 分区存储初始化失败: {e}")
+            raise
+
+    def _save_with_daily_overwrite(self, file_path: Path, fields: List[str], new_data: List[Dict[str, Any]], chinese_headers: List[str] = None) -> None:
+        """
+        覆盖保存当天的分区
+
+        Args:
+            file_path: 数据类型对应的CSV文件路径（用于确定分区目录）
+            fields: 英文字段列表
+            new_data: 今天的新数据
+            chinese_headers: 中文表头列表
+        """
+        partition_file = self._partition_file(file_path, self._get_today_date())
+        self._write_partition(partition_file, fields, new_data, chinese_headers)
+        logger.info(f"💾 数据已覆盖保存到分区 {partition_file.parent.name}/{partition_file.name}: {len(new_data)} 条记录")
+
+    def _append_to_csv(self, file_path: Path, fields: List[str], data: List[Dict[str, Any]]) -> None:
+        """
+        追加数据到当天的分区（只重写当天的分区文件）
+
+        Args:
+            file_path: 数据类型对应的CSV文件路径
+            fields: 字段列表
+            data: 数据列表
+        """
+        chinese_headers = self._chinese_headers_for(file_path)
+        partition_file = self._partition_file(file_path, self._get_today_date())
+        existing = self._read_partition(partition_file, fields, chinese_headers)
+        self._write_partition(partition_file, fields, existing + data, chinese_headers)
+        logger.info(f"💾 数据已追加到分区 {partition_file.parent.name}/{partition_file.name}: {len(data)} 条记录")
+
+    async def get_latest_data(self, data_type: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        获取最新数据：从最近的分区开始读取，凑够limit条即停止
+
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+            limit: 返回数据条数限制
+
+        Returns:
+            List[Dict[str, Any]]: 数据列表
+        """
+        file_info = self._file_info(data_type)
+        if file_info is None:
+            logger.warning(f"⚠️ 未知数据类型: {data_type}")
+            return []
+
+        file_path, fields, chinese_headers = file_info
+        try:
+            data = []
+            for partition_file in sorted(self._partition_files(file_path), reverse=True):
+                data.extend(self._read_partition(partition_file, fields, chinese_headers))
+                if len(data) >= limit:
+                    break
+
+            # 按创建时间倒序排列，返回最新的limit条
+            data.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+            return data[:limit]
+
+        except Exception as e:
+            logger.error(f"❌ 获取最新数据失败: {e}")
+            return []
+
+    def read_frame(self, data_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                   dimension: Optional[str] = None) -> pd.DataFrame:
+        """读取全部历史数据为DataFrame，只打开日期范围内的分区文件"""
+        file_path, fields, _ = self._frame_source(data_type)
+        frames = list(self.iter_frames(data_type, start_date, end_date))
+        if not frames:
+            return pd.DataFrame(columns=fields + ['date'])
+        return self._filter_frame(pd.concat(frames, ignore_index=True), start_date, end_date, dimension)
+
+    def iter_frames(self, data_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                    chunksize: int = 50000):
+        """按日期顺序逐个读取日期范围内的分区文件（每个分区为一天的数据）"""
+        file_path, fields, chinese_headers = self._frame_source(data_type)
+        for partition_file in sorted(self._partition_files(file_path)):
+            if (start_date and partition_file.stem < start_date) or (end_date and partition_file.stem > end_date):
+                continue
+            frame = self._read_csv_frame(partition_file, fields, chinese_headers)
+            for offset in range(0, len(frame), chunksize):
+                yield frame.iloc[offset:offset + chunksize]
+
+    def data_signature(self, data_type: str) -> Any:
+        """各分区文件的 (文件名, 修改时间, 大小)"""
+        file_info = self._file_info(data_type)
+        if file_info is None:
+            return None
+        return tuple(sorted((f.name, f.stat().st_mtime_ns, f.stat().st_size)
+                            for f in self._partition_files(file_info[0])))
+
+    def get_storage_info(self) -> Dict[str, Any]:
+        """获取存储信息"""
+        info = {
+            'storage_type': 'PartitionedCSV',
+            'data_path': str(self.data_dir),
+            'partition_path': str(self.partition_dir),
+            'initialized': self._initialized,
+            'partitions': {}
+        }
+
+        for file_path, _, _ in self._data_files():
+            partition_files = sorted(self._partition_files(file_path))
+            info['partitions'][file_path.stem] = {
+                'count': len(partition_files),
+                'first_date': partition_files[0].stem if partition_files else None,
+                'last_date': partition_files[-1].stem if partition_files else None,
+                'size_bytes': sum(f.stat().st_size for f in partition_files)
+            }
+
+        return info
+
+    def _data_files(self):
+        """各数据类型的 (原CSV文件路径, 字段列表, 中文表头)"""
+        return [
+            (self.dashboard_file, self.dashboard_fields, self.dashboard_chinese_headers),
+            (self.content_analysis_file, self.content_analysis_fields, self.content_analysis_chinese_headers),
+            (self.fans_file, self.fans_fields, self.fans_chinese_headers)
+        ]
+
+    def _file_info(self, data_type: str):
+        """按数据类型名称获取文件信息"""
+        return {
+            'dashboard': self._data_files()[0],
+            'content_analysis': self._data_files()[1],
+            'fans': self._data_files()[2]
+        }.get(data_type)
+
+    def _chinese_headers_for(self, file_path: Path) -> Optional[List[str]]:
+        """获取数据文件对应的中文表头"""
+        for path, _, chinese_headers in self._data_files():
+            if path == file_path:
+                return chinese_headers
+        return None
+
+    def _partition_file(self, file_path: Path, date: str) -> Path:
+        """某个数据类型在指定日期的分区文件"""
+        return self.partition_dir / file_path.stem / f"{date}.csv"
+
+    def _partition_files(self, file_path: Path) -> List[Path]:
+        """某个数据类型的全部分区文件"""
+        partition_path = self.partition_dir / file_path.stem
+        if not partition_path.exists():
+            return []
+        return list(partition_path.glob('*.csv'))
+
+    def _write_partition(self, partition_file: Path, fields: List[str], rows: List[Dict[str, Any]],
+                         chinese_headers: List[str] = None) -> None:
+        """原子写入分区文件：写入同目录下的临时文件，落盘后替换"""
+        partition_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=partition_file.parent, prefix=f".{partition_file.stem}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(chinese_headers or fields)
+                for row in rows:
+                    writer.writerow([row.get(field, '') for field in fields])
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, partition_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _read_partition(self, partition_file: Path, fields: List[str],
+                        chinese_headers: List[str] = None) -> List[Dict[str, Any]]:
+        """读取分区文件，中文表头转换为英文字段名"""
+        if not partition_file.exists():
+            return []
+
+        with open(partition_file, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            headers = next(reader, None)
+            if not headers:
+                return []
+            if headers == chinese_headers:
+                headers = fields
+            return [dict(zip(headers, row)) for row in reader if len(row) == len(headers)]
+
+    def _import_legacy_file(self, file_path: Path, fields: List[str], chinese_headers: List[str] = None) -> None:
+        """把原有的单文件CSV历史数据按创建日期拆分到分区（只在分区目录首次创建时执行）"""
+        if not file_path.exists():
+            return
+
+        try:
+            legacy_rows = self._read_partition(file_path, fields, chinese_headers)
+            partitions: Dict[str, List[Dict[str, Any]]] = {}
+            for row in legacy_rows:
+                date = str(row.get('created_at', ''))[:10]
+                if date:
+                    partitions.setdefault(date, []).append(row)
+
+            for date, rows in partitions.items():
+                self._write_partition(self._partition_file(file_path, date), fields, rows, chinese_headers)
+
+            if partitions:
+                logger.info(f"📦 已将 {file_path.name} 的 {len(legacy_rows)} 条历史记录拆分为 {len(partitions)} 个分区")
+        except Exception as e:
+            logger.warning(f"⚠️ 导入历史CSV数据失败: {e}")
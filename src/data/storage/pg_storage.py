@@ -1,149 +1,305 @@
 """
-PostgreSQL数据存储实现（占位代码）
+PostgreSQL数据存储实现
 
-TODO: 等主程序及整体功能测试通过后再实现
+基于asyncpg连接池：
+- 启动时按版本执行建表迁移（schema_migrations记录已执行的版本）
+- 批量写入先用COPY导入临时表，再一次性 INSERT ... ON CONFLICT 更新插入到正式表，
+  同一天重复采集覆盖当天的记录，与CSV存储的按日期覆盖语义一致
+- 需要安装可选依赖 asyncpg
 """
 
-from typing import Dict, List, Any, Optional
+from datetime import date, datetime
+from typing import Dict, List, Any, Optional, Callable, Awaitable
 
 from .base import BaseStorage
+from .schema import DATA_TYPE_FIELDS, INTEGER_FIELDS, TIMESTAMP_FIELDS, normalize_record, to_integer, to_text
 from ...utils.logger import get_logger
 
+try:
+    import asyncpg
+except ImportError:  # 可选依赖
+    asyncpg = None
+
 logger = get_logger(__name__)
 
+# 数据类型 -> 表名
+TABLE_NAMES = {
+    'dashboard': 'dashboard_data',
+    'content_analysis': 'content_analysis_data',
+    'fans': 'fans_data'
+}
+
+# 数据类型 -> 唯一键（日期为写入日期）
+UNIQUE_KEYS = {
+    'dashboard': ('date', 'dimension'),
+    'content_analysis': ('date', 'title', 'publish_time'),
+    'fans': ('date', 'dimension')
+}
+
+
+def column_type(field: str) -> str:
+    """字段对应的列类型"""
+    if field == 'date':
+        return 'DATE'
+    if field in INTEGER_FIELDS:
+        return 'BIGINT'
+    if field in TIMESTAMP_FIELDS:
+        return 'TIMESTAMP'
+    return 'TEXT'
+
+
+def to_column_value(field: str, value: Any) -> Any:
+    """
+    把值转换为列类型对应的Python类型
+
+    asyncpg的COPY使用二进制编码，只接受与列类型一致的值（例如TEXT列只接受str）
+    """
+    kind = column_type(field)
+    if kind == 'BIGINT':
+        return to_integer(value)
+    if kind == 'TEXT':
+        return to_text(value)
+    if kind == 'DATE' and isinstance(value, datetime):
+        return value.date()
+    if kind == 'DATE' and isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if kind == 'TIMESTAMP' and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _create_table_sql(data_type: str) -> str:
+    """根据字段定义生成建表语句"""
+    table = TABLE_NAMES[data_type]
+    columns = ['id BIGSERIAL PRIMARY KEY', 'date DATE NOT NULL']
+    for field in DATA_TYPE_FIELDS[data_type]:
+        kind = column_type(field)
+        if kind == 'BIGINT':
+            columns.append(f"{field} BIGINT NOT NULL DEFAULT 0")
+        elif kind == 'TIMESTAMP':
+            columns.append(f"{field} TIMESTAMP NOT NULL DEFAULT now()")
+        else:
+            columns.append(f"{field} TEXT NOT NULL DEFAULT ''")
+    return (f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)}, "
+            f"UNIQUE ({', '.join(UNIQUE_KEYS[data_type])}));\n"
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_created_at ON {table} (created_at);")
+
+
+# 建表迁移：(版本号, 说明, SQL)，只能追加新版本，不能修改已发布的版本
+MIGRATIONS = [
+    (1, "创建仪表板、内容分析、粉丝数据表", "\n".join(_create_table_sql(data_type) for data_type in TABLE_NAMES)),
+]
+
 
 class PostgreSQLStorage(BaseStorage):
-    """PostgreSQL数据存储实现（占位）"""
-    
-    def __init__(self, config: Dict[str, Any]):
+    """PostgreSQL数据存储实现"""
+
+    def __init__(self, config: Dict[str, Any],
+                 pool_factory: Optional[Callable[..., Awaitable[Any]]] = None):
         """
         初始化PostgreSQL存储
-        
+
         Args:
-            config: 配置参数，包含数据库连接信息
+            config: 配置参数，包含database_url或host/port/database/user/password，以及pool_size
+            pool_factory: 创建连接池的协程函数，默认为asyncpg.create_pool（测试时可替换）
         """
         super().__init__(config)
+        self.database_url = config.get('database_url')
         self.host = config.get('host', 'localhost')
         self.port = config.get('port', 5432)
         self.database = config.get('database', 'xhs_toolkit')
-        self.username = config.get('username', 'postgres')
+        self.username = config.get('user', config.get('username', 'postgres'))
         self.password = config.get('password', '')
-        self.connection = None
-    
+        self.pool_size = int(config.get('pool_size', 5))
+        self.pool = None
+
+        if pool_factory is None:
+            if asyncpg is None:
+                raise ImportError("PostgreSQL存储需要安装asyncpg: pip install asyncpg")
+            pool_factory = asyncpg.create_pool
+        self._pool_factory = pool_factory
+
     async def initialize(self) -> bool:
         """
-        初始化PostgreSQL连接
-        
+        创建连接池并执行建表迁移
+
         Returns:
             bool: 初始化是否成功
         """
-        # TODO: 实现PostgreSQL连接初始化
-        logger.warning("⚠️ PostgreSQL存储暂未实现，请使用CSV存储")
-        return False
-    
-    async def save_dashboard_data(self, data: Dict[str, Any]) -> bool:
+        if self._initialized:
+            return True
+
+        try:
+            if self.database_url:
+                self.pool = await self._pool_factory(dsn=self.database_url, min_size=1, max_size=self.pool_size)
+            else:
+                self.pool = await self._pool_factory(
+                    host=self.host, port=self.port, database=self.database,
+                    user=self.username, password=self.password,
+                    min_size=1, max_size=self.pool_size
+                )
+
+            await self._migrate()
+            self._initialized = True
+            logger.info(f"🐘 PostgreSQL存储初始化成功，连接池大小: {self.pool_size}")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ PostgreSQL存储初始化失败: {e}")
+            return False
+
+    async def save_dashboard_data(self, data: List[Dict[str, Any]]) -> bool:
         """
         保存账号概览数据到PostgreSQL
-        
+
         Args:
-            data: 账号概览数据
-            
+            data: 账号概览数据列表
+
         Returns:
             bool: 保存是否成功
         """
-        # TODO: 实现PostgreSQL数据保存
-        logger.warning("⚠️ PostgreSQL存储暂未实现")
-        return False
-    
+        return await self._bulk_upsert('dashboard', data)
+
     async def save_content_analysis_data(self, data: List[Dict[str, Any]]) -> bool:
         """
         保存内容分析数据到PostgreSQL
-        
+
         Args:
             data: 内容分析数据列表
-            
+
         Returns:
             bool: 保存是否成功
         """
-        # TODO: 实现PostgreSQL数据保存
-        logger.warning("⚠️ PostgreSQL存储暂未实现")
-        return False
-    
-    async def save_fans_data(self, data: Dict[str, Any]) -> bool:
+        return await self._bulk_upsert('content_analysis', data)
+
+    async def save_fans_data(self, data: List[Dict[str, Any]]) -> bool:
         """
         保存粉丝数据到PostgreSQL
-        
+
         Args:
-            data: 粉丝数据
-            
+            data: 粉丝数据列表
+
         Returns:
             bool: 保存是否成功
         """
-        # TODO: 实现PostgreSQL数据保存
-        logger.warning("⚠️ PostgreSQL存储暂未实现")
-        return False
-    
+        return await self._bulk_upsert('fans', data)
+
     async def get_latest_data(self, data_type: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         从PostgreSQL获取最新数据
-        
+
         Args:
             data_type: 数据类型 (dashboard, content_analysis, fans)
             limit: 返回数据条数限制
-            
+
         Returns:
-            List[Dict[str, Any]]: 数据列表
+            List[Dict[str, Any]]: 数据列表（时间字段为ISO格式字符串，与CSV存储一致）
         """
-        # TODO: 实现PostgreSQL数据查询
-        logger.warning("⚠️ PostgreSQL存储暂未实现")
-        return []
-    
+        if data_type not in TABLE_NAMES:
+            logger.warning(f"⚠️ 未知数据类型: {data_type}")
+            return []
+
+        try:
+            columns = ', '.join(DATA_TYPE_FIELDS[data_type])
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(
+                    f"SELECT {columns} FROM {TABLE_NAMES[data_type]} ORDER BY created_at DESC LIMIT $1", limit
+                )
+
+            results = []
+            for row in rows:
+                record = dict(row)
+                for field in TIMESTAMP_FIELDS:
+                    if isinstance(record.get(field), datetime):
+                        record[field] = record[field].isoformat()
+                results.append(record)
+            return results
+
+        except Exception as e:
+            logger.error(f"❌ 从PostgreSQL获取最新数据失败: {e}")
+            return []
+
     async def close(self) -> None:
-        """关闭PostgreSQL连接"""
-        # TODO: 实现连接关闭
-        if self.connection:
-            # await self.connection.close()
-            pass
+        """关闭连接池"""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+        self._initialized = False
         logger.debug("🔌 PostgreSQL存储连接已关闭")
 
+    def get_storage_info(self) -> Dict[str, Any]:
+        """获取存储信息"""
+        return {
+            'storage_type': 'PostgreSQL',
+            'host': None if self.database_url else self.host,
+            'database': None if self.database_url else self.database,
+            'pool_size': self.pool_size,
+            'initialized': self._initialized,
+            'schema_version': MIGRATIONS[-1][0]
+        }
 
-# TODO: 后续实现计划
-"""
-PostgreSQL实现计划：
-
-1. 数据库表结构设计：
-   - dashboard_data: 账号概览数据表
-   - content_analysis_data: 内容分析数据表  
-   - fans_data: 粉丝数据表
-
-2. 依赖库：
-   - asyncpg: 异步PostgreSQL驱动
-   - sqlalchemy: ORM框架（可选）
-
-3. 功能实现：
-   - 连接池管理
-   - 自动建表
-   - 数据插入/查询
-   - 事务处理
-   - 错误重试
-
-4. 配置项：
-   - 数据库连接参数
-   - 连接池大小
-   - 超时设置
-   - 重试策略
-
-示例配置：
-{
-    "storage_type": "postgresql",
-    "host": "localhost",
-    "port": 5432,
-    "database": "xhs_toolkit",
-    "username": "postgres", 
-    "password": "password",
-    "pool_size": 10,
-    "max_overflow": 20,
-    "pool_timeout": 30,
-    "pool_recycle": 3600
-}
-""" 
\ No newline at end of file
+    async def _migrate(self) -> None:
+        """执行尚未执行的建表迁移"""
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                "version INTEGER PRIMARY KEY, description TEXT NOT NULL, applied_at TIMESTAMP NOT NULL DEFAULT now())"
+            )
+            applied = {row['version'] for row in await conn.fetch("SELECT version FROM schema_migrations")}
+
+            for version, description, sql in MIGRATIONS:
+                if version in applied:
+                    continue
+                async with conn.transaction():
+                    await conn.execute(sql)
+                    await conn.execute(
+                        "INSERT INTO schema_migrations (version, description) VALUES ($1, $2)", version, description
+                    )
+                logger.info(f"🐘 已执行数据库迁移 v{version}: {description}")
+
+    async def _bulk_upsert(self, data_type: str, data: List[Dict[str, Any]]) -> bool:
+        """COPY到临时表后一次性更新插入到正式表"""
+        if not data:
+            return True
+        if not self._initialized and not await self.initialize():
+            return False
+
+        table = TABLE_NAMES[data_type]
+        unique_key = UNIQUE_KEYS[data_type]
+        fields = ['date'] + DATA_TYPE_FIELDS[data_type]
+
+        now = datetime.now()
+        records = []
+        for item in data:
+            record = normalize_record(data_type, item)
+            record['date'] = now.date()
+            record['created_at'] = now
+            record['updated_at'] = now
+            records.append(tuple(to_column_value(field, record[field]) for field in fields))
+
+        column_list = ', '.join(fields)
+        key_list = ', '.join(unique_key)
+        updates = ', '.join(f"{field} = excluded.{field}" for field in fields if field not in unique_key)
+        temp_table = f"tmp_{table}"
+
+        try:
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute(
+                        f"CREATE TEMP TABLE {temp_table} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+                    )
+                    await conn.copy_records_to_table(temp_table, records=records, columns=fields)
+                    # 同一批数据中重复的键只保留最后一条，避免ON CONFLICT重复更新同一行
+                    await conn.execute(
+                        f"INSERT INTO {table} ({column_list}) "
+                        f"SELECT DISTINCT ON ({key_list}) {column_list} FROM {temp_table} "
+                        f"ORDER BY {key_list}, id DESC "
+                        f"ON CONFLICT ({key_list}) DO UPDATE SET {updates}"
+                    )
+
+            logger.info(f"🐘 {data_type}数据已保存到PostgreSQL: {len(records)} 条记录")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ 保存{data_type}数据到PostgreSQL失败: {e}")
+            return False
@@ -0,0 +1,91 @@
+"""
+数据存储字段定义
+
+各存储后端共用的数据类型、字段列表和字段类型
+"""
+
+from typing import Dict, List, Any
+
+# 字段定义（英文字段名，用于代码逻辑和数据库）
+DASHBOARD_FIELDS = [
+    'created_at', 'updated_at', 'timestamp', 'dimension',
+    'views', 'likes', 'collects', 'comments', 'shares', 'interactions'
+]
+CONTENT_ANALYSIS_FIELDS = [
+    'created_at', 'updated_at', 'timestamp', 'title', 'note_type', 'publish_time',
+    'views', 'likes', 'comments', 'collects', 'shares', 'fans_growth', 'avg_watch_time', 'danmu_count',
+    # 观众来源数据
+    'source_recommend', 'source_search', 'source_follow', 'source_other',
+    # 观众分析数据
+    'gender_male', 'gender_female', 'age_18_24', 'age_25_34', 'age_35_44', 'age_45_plus',
+    'city_top1', 'city_top2', 'city_top3', 'interest_top1', 'interest_top2', 'interest_top3'
+]
+FANS_FIELDS = [
+    'created_at', 'updated_at', 'timestamp', 'dimension', 'total_fans', 'new_fans', 'lost_fans'
+]
+
+# 数据类型 -> 字段列表
+DATA_TYPE_FIELDS: Dict[str, List[str]] = {
+    'dashboard': DASHBOARD_FIELDS,
+    'content_analysis': CONTENT_ANALYSIS_FIELDS,
+    'fans': FANS_FIELDS
+}
+
+# 整数字段
+INTEGER_FIELDS = {
+    'views', 'likes', 'collects', 'comments', 'shares', 'interactions',
+    'fans_growth', 'danmu_count', 'total_fans', 'new_fans', 'lost_fans'
+}
+
+# 时间字段（存储写入时间）
+TIMESTAMP_FIELDS = {'created_at', 'updated_at'}
+
+# 百分比字段，缺失时为"0%"
+PERCENT_FIELDS = {
+    'source_recommend', 'source_search', 'source_follow', 'source_other',
+    'gender_male', 'gender_female', 'age_18_24', 'age_25_34', 'age_35_44', 'age_45_plus'
+}
+
+
+def default_value(field: str) -> Any:
+    """字段缺失时的默认值"""
+    if field in INTEGER_FIELDS:
+        return 0
+    if field in PERCENT_FIELDS:
+        return '0%'
+    return ''
+
+
+def to_integer(value: Any) -> int:
+    """把存储中读出的数值（可能是字符串或浮点数）转换为整数，无法转换时为0"""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def to_text(value: Any) -> str:
+    """非整数字段统一存为字符串（采集器写入的timestamp等可能是浮点数），None为空字符串"""
+    if value is None:
+        return ''
+    return value if isinstance(value, str) else str(value)
+
+
+def normalize_record(data_type: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    按字段定义整理一条记录（不含时间字段）
+
+    Args:
+        data_type: 数据类型 (dashboard, content_analysis, fans)
+        item: 采集到的原始数据
+
+    Returns:
+        只包含该数据类型字段的记录，缺失字段填充默认值，整数字段转换为int，其余字段转换为str
+    """
+    record = {}
+    for field in DATA_TYPE_FIELDS[data_type]:
+        if field in TIMESTAMP_FIELDS:
+            continue
+        value = item.get(field, default_value(field))
+        record[field] = to_integer(value) if field in INTEGER_FIELDS else to_text(value)
+    return record
@@ -0,0 +1,267 @@
+"""
+SQLite存储实现
+
+本地部署使用的嵌入式数据库存储，无需单独运行数据库服务：
+- WAL模式，采集写入时不阻塞读取
+- 仪表板、粉丝数据按 (日期, 维度) 更新插入，内容分析数据按 (日期, 笔记标题, 发布时间) 更新插入，
+  同一天重复采集覆盖当天的记录，与CSV存储的按日期覆盖语义一致
+- created_at 建有索引，get_latest_data 是一次索引查询
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import pandas as pd
+
+from .base import BaseStorage
+from .schema import DATA_TYPE_FIELDS, INTEGER_FIELDS, normalize_record
+
+logger = logging.getLogger(__name__)
+
+# 数据类型 -> 表名
+TABLE_NAMES = {
+    'dashboard': 'dashboard_data',
+    'content_analysis': 'content_analysis_data',
+    'fans': 'fans_data'
+}
+
+# 数据类型 -> 唯一键（日期为写入日期）
+UNIQUE_KEYS = {
+    'dashboard': ('date', 'dimension'),
+    'content_analysis': ('date', 'title', 'publish_time'),
+    'fans': ('date', 'dimension')
+}
+
+
+class SQLiteStorage(BaseStorage):
+    """SQLite存储实现类"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        初始化SQLite存储
+
+        Args:
+            config: 配置参数，包含data_dir、sqlite_path（默认为 {data_dir}/xhs_toolkit.db）
+        """
+        super().__init__(config)
+        self.data_dir = Path(config.get('data_dir', 'src/data'))
+        self.db_path = Path(config.get('sqlite_path') or self.data_dir / 'xhs_toolkit.db')
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._initialize_sync()
+
+    def _initialize_sync(self) -> None:
+        """同步初始化：打开数据库连接，开启WAL，创建表和索引"""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+
+            with self._lock, self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                for data_type in DATA_TYPE_FIELDS:
+                    self._create_table(data_type)
+
+            self._initialized = True
+            logger.info(f"📁 SQLite存储初始化成功，数据库: {self.db_path}")
+
+        except Exception as e:
+            logger.error(f"❌ SQLite存储初始化失败: {e}")
+            raise
+
+    async def initialize(self) -> bool:
+        """
+        异步初始化SQLite存储
+
+        Returns:
+            bool: 初始化是否成功
+        """
+        if self._initialized:
+            return True
+        try:
+            self._initialize_sync()
+            return True
+        except Exception as e:
+            logger.error(f"❌ SQLite存储初始化失败: {e}")
+            return False
+
+    def save_dashboard_data(self, data: List[Dict[str, Any]]) -> None:
+        """保存仪表板数据"""
+        self._upsert('dashboard', data)
+
+    def save_content_analysis_data(self, data: List[Dict[str, Any]]) -> None:
+        """保存内容分析数据"""
+        self._upsert('content_analysis', data)
+
+    def append_content_analysis_data(self, data: List[Dict[str, Any]]) -> None:
+        """保存内容分析增量数据（按唯一键更新插入，只写入有变化的笔记）"""
+        self._upsert('content_analysis', data)
+
+    def save_fans_data(self, data: List[Dict[str, Any]]) -> None:
+        """保存粉丝数据"""
+        self._upsert('fans', data)
+
+    async def get_latest_data(self, data_type: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        获取最新数据
+
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+            limit: 返回数据条数限制
+
+        Returns:
+            List[Dict[str, Any]]: 数据列表
+        """
+        if data_type not in TABLE_NAMES:
+            logger.warning(f"⚠️ 未知数据类型: {data_type}")
+            return []
+
+        try:
+            columns = ', '.join(DATA_TYPE_FIELDS[data_type])
+            sql = f"SELECT {columns} FROM {TABLE_NAMES[data_type]} ORDER BY created_at DESC LIMIT ?"
+            with self._lock:
+                rows = self._conn.execute(sql, (limit,)).fetchall()
+            return [dict(row) for row in rows]
+
+        except Exception as e:
+            logger.error(f"❌ 获取最新数据失败: {e}")
+            return []
+
+    def read_frame(self, data_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                   dimension: Optional[str] = None) -> pd.DataFrame:
+        """读取全部历史数据为DataFrame（日期和维度条件在SQL中过滤）"""
+        where, params = self._frame_conditions(data_type, start_date, end_date, dimension)
+        columns = ', '.join(DATA_TYPE_FIELDS[data_type] + ['date'])
+        sql = f"SELECT {columns} FROM {TABLE_NAMES[data_type]}" + (f" WHERE {' AND '.join(where)}" if where else '')
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def iter_frames(self, data_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                    chunksize: int = 50000):
+        """按主键分页读取，每页单独加锁查询，导出期间不阻塞写入"""
+        where, params = self._frame_conditions(data_type, start_date, end_date, None)
+        columns = ', '.join(['id'] + DATA_TYPE_FIELDS[data_type] + ['date'])
+        sql = (f"SELECT {columns} FROM {TABLE_NAMES[data_type]} WHERE {' AND '.join(where + ['id > ?'])} "
+               f"ORDER BY id LIMIT ?")
+
+        last_id = 0
+        while True:
+            with self._lock:
+                frame = pd.read_sql_query(sql, self._conn, params=params + [last_id, chunksize])
+            if frame.empty:
+                return
+            last_id = int(frame['id'].iloc[-1])
+            yield frame.drop(columns='id')
+
+    def _frame_conditions(self, data_type: str, start_date: Optional[str], end_date: Optional[str],
+                          dimension: Optional[str]):
+        """日期范围和维度的SQL条件及参数"""
+        if data_type not in TABLE_NAMES:
+            raise ValueError(f"未知数据类型: {data_type}")
+
+        conditions, params = [], []
+        if start_date:
+            conditions.append("date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("date <= ?")
+            params.append(end_date)
+        if dimension and 'dimension' in DATA_TYPE_FIELDS[data_type]:
+            conditions.append("dimension = ?")
+            params.append(dimension)
+        return conditions, params
+
+    async def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self._initialized = False
+        logger.debug("📁 SQLite存储连接已关闭")
+
+    def data_signature(self, data_type: str) -> Any:
+        """数据库文件和WAL文件的 (修改时间, 大小)（WAL模式下写入先进入-wal文件）"""
+        signature = []
+        for path in (self.db_path, Path(f"{self.db_path}-wal")):
+            if path.exists():
+                stat = path.stat()
+                signature.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def get_storage_info(self) -> Dict[str, Any]:
+        """获取存储信息"""
+        try:
+            info = {
+                'storage_type': 'SQLite',
+                'data_path': str(self.data_dir),
+                'db_path': str(self.db_path),
+                'initialized': self._initialized,
+                'size_bytes': self.db_path.stat().st_size if self.db_path.exists() else 0,
+                'tables': {}
+            }
+            with self._lock:
+                for data_type, table in TABLE_NAMES.items():
+                    info['tables'][table] = {
+                        'records': self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    }
+            return info
+
+        except Exception as e:
+            logger.error(f"❌ 获取存储信息失败: {e}")
+            return {
+                'storage_type': 'SQLite',
+                'error': str(e)
+            }
+
+    def _create_table(self, data_type: str) -> None:
+        """创建数据表、唯一索引和created_at索引"""
+        table = TABLE_NAMES[data_type]
+        columns = ['id INTEGER PRIMARY KEY AUTOINCREMENT', 'date TEXT NOT NULL']
+        for field in DATA_TYPE_FIELDS[data_type]:
+            column_type = 'INTEGER NOT NULL DEFAULT 0' if field in INTEGER_FIELDS else "TEXT NOT NULL DEFAULT ''"
+            columns.append(f"{field} {column_type}")
+
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)})")
+        self._conn.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_unique ON {table} ({', '.join(UNIQUE_KEYS[data_type])})"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_created_at ON {table} (created_at)")
+
+    def _upsert(self, data_type: str, data: List[Dict[str, Any]]) -> None:
+        """在一个事务中批量更新插入数据"""
+        if not data:
+            return
+
+        try:
+            now = datetime.now()
+            created_at = now.isoformat()
+            fields = ['date'] + DATA_TYPE_FIELDS[data_type]
+            rows = []
+            for item in data:
+                record = normalize_record(data_type, item)
+                record['date'] = now.strftime('%Y-%m-%d')
+                record['created_at'] = created_at
+                record['updated_at'] = created_at
+                rows.append(tuple(record[field] for field in fields))
+
+            unique_key = UNIQUE_KEYS[data_type]
+            # 同一天的重复记录更新为最新值（与CSV存储的按日期覆盖一致）
+            updates = ', '.join(f"{field} = excluded.{field}" for field in fields if field not in unique_key)
+            sql = (f"INSERT INTO {TABLE_NAMES[data_type]} ({', '.join(fields)}) "
+                   f"VALUES ({', '.join('?' for _ in fields)}) "
+                   f"ON CONFLICT ({', '.join(unique_key)}) DO UPDATE SET {updates}")
+
+            with self._lock, self._conn:
+                self._conn.executemany(sql, rows)
+
+            logger.info(f"💾 {data_type}数据已保存到SQLite: {len(rows)} 条记录")
+
+        except Exception as e:
+            logger.error(f"❌ 保存{data_type}数据到SQLite失败: {e}")
+            raise
@@ -5,10 +5,19 @@
 """
 
 import os
+import atexit
+import asyncio
 import logging
+import threading
 from typing import Optional, List, Dict, Any
 from .storage.base import BaseStorage
 from .storage.csv_storage import CSVStorage
+from .storage.partitioned_storage import PartitionedCSVStorage
+from .storage.parquet_storage import ParquetStorage
+from .storage.sqlite_storage import SQLiteStorage
+from .analytics_cache import get_analytics_cache
+from .write_behind import WriteBehindQueue
+from ..core.exceptions import ConfigurationError
 from .storage.pg_storage import PostgreSQLStorage
 
 logger = logging.getLogger(__name__)
@@ -20,6 +29,8 @@ class StorageManager:
     def __init__(self):
         self._csv_storage: Optional[CSVStorage] = None
         self._pg_storage: Optional[PostgreSQLStorage] = None
+        self._pg_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._write_queue: Optional[WriteBehindQueue] = None
         self._initialized = False
         
     def initialize(self, data_path: Optional[str] = None, 
@@ -38,13 +49,14 @@ class StorageManager:
         if data_path is None:
             data_path = os.getenv('DATA_STORAGE_PATH', 'data')
             
-        # 初始化CSV存储（始终启用）
+        # 初始化本地存储（始终启用），STORAGE_BACKEND选择存储格式
+        backend = os.getenv('STORAGE_BACKEND', 'csv').lower()
         try:
             csv_config = {'data_dir': data_path}
-            self._csv_storage = CSVStorage(csv_config)
-            logger.info(f"CSV存储已初始化，数据路径: {data_path}")
+            self._csv_storage = self._create_local_storage(backend, csv_config)
+            logger.info(f"本地存储已初始化（{backend}），数据路径: {data_path}")
         except Exception as e:
-            logger.error(f"CSV存储初始化失败: {e}")
+            logger.error(f"本地存储初始化失败: {e}")
             raise
             
         # 检查是否启用PostgreSQL数据库
@@ -55,9 +67,11 @@ class StorageManager:
             if database_config is None:
                 database_config = self._get_database_config_from_env()
                 
-            # 初始化PostgreSQL存储
+            # 初始化PostgreSQL存储（建立连接池并执行建表迁移）
             try:
                 self._pg_storage = PostgreSQLStorage(database_config)
+                if not self._run_pg(self._pg_storage.initialize()):
+                    raise RuntimeError("连接或建表失败")
                 logger.info("PostgreSQL存储已启用")
             except Exception as e:
                 logger.warning(f"PostgreSQL存储初始化失败，将仅使用CSV存储: {e}")
@@ -65,14 +79,59 @@ class StorageManager:
         else:
             logger.info("PostgreSQL存储已禁用，仅使用CSV存储")
             
+        # 写回队列：保存请求立即返回，由后台线程批量落盘
+        if os.getenv('STORAGE_WRITE_BEHIND', 'true').lower() == 'true':
+            self._write_queue = WriteBehindQueue(
+                self._write,
+                flush_interval=float(os.getenv('STORAGE_FLUSH_INTERVAL', '5')),
+                max_pending_records=int(os.getenv('STORAGE_FLUSH_MAX_RECORDS', '1000'))
+            )
+            # 命令行采集等短进程退出前落盘
+            atexit.register(self._write_queue.close)
+            
         self._initialized = True
         
+    def _create_local_storage(self, backend: str, config: Dict[str, Any]) -> BaseStorage:
+        """
+        创建本地存储实例
+        
+        Args:
+            backend: 存储后端名称，csv（单文件CSV）、partitioned（按日期分区的CSV）、parquet（列式存储）或 sqlite（嵌入式数据库）
+            config: 存储配置
+        """
+        if backend == 'partitioned':
+            return PartitionedCSVStorage(config)
+        if backend == 'sqlite':
+            return SQLiteStorage({**config, 'sqlite_path': os.getenv('SQLITE_PATH')})
+        if backend == 'parquet':
+            try:
+                return ParquetStorage(config)
+            except ConfigurationError as e:
+                logger.warning(f"{e}，使用CSV存储")
+                return CSVStorage(config)
+        if backend != 'csv':
+            logger.warning(f"未知的存储后端 {backend}，使用CSV存储")
+        return CSVStorage(config)
+        
+    def _run_pg(self, coro, timeout: float = 60) -> Any:
+        """
+        在PostgreSQL专用事件循环中执行协程并等待结果
+        
+        asyncpg连接池绑定在创建它的事件循环上，而保存数据的调用来自各个采集线程，
+        因此由一个常驻线程运行事件循环，其他线程提交协程后同步等待
+        """
+        if self._pg_loop is None:
+            self._pg_loop = asyncio.new_event_loop()
+            threading.Thread(target=self._pg_loop.run_forever, name="xhs-pg-storage", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._pg_loop).result(timeout)
+        
     def _get_database_config_from_env(self) -> Dict[str, Any]:
         """从环境变量获取数据库配置"""
         # 优先使用DATABASE_URL
         database_url = os.getenv('DATABASE_URL')
+        pool_size = int(os.getenv('DATABASE_POOL_SIZE', '5'))
         if database_url:
-            return {'database_url': database_url}
+            return {'database_url': database_url, 'pool_size': pool_size}
             
         # 使用分离的配置项
         return {
@@ -80,7 +139,8 @@ class StorageManager:
             'port': int(os.getenv('DATABASE_PORT', '5432')),
             'database': os.getenv('DATABASE_NAME', 'xhs_toolkit'),
             'user': os.getenv('DATABASE_USER', 'username'),
-            'password': os.getenv('DATABASE_PASSWORD', 'password')
+            'password': os.getenv('DATABASE_PASSWORD', 'password'),
+            'pool_size': pool_size
         }
         
     def is_database_enabled(self) -> bool:
@@ -88,7 +148,7 @@ class StorageManager:
         return self._pg_storage is not None
         
     def get_csv_storage(self) -> CSVStorage:
-        """获取CSV存储实例"""
+        """获取本地存储实例（按STORAGE_BACKEND配置，可能是CSV、分区CSV、Parquet或SQLite）"""
         if not self._initialized:
             self.initialize()
         return self._csv_storage
@@ -101,51 +161,122 @@ class StorageManager:
         
     def save_dashboard_data(self, data: List[Dict[str, Any]]) -> None:
         """保存仪表板数据"""
-        if not self._initialized:
-            self.initialize()
-            
-        # 保存到CSV（始终执行）
-        if self._csv_storage:
-            self._csv_storage.save_dashboard_data(data)
-            
-        # 保存到PostgreSQL（如果启用）
-        if self._pg_storage:
-            try:
-                self._pg_storage.save_dashboard_data(data)
-            except Exception as e:
-                logger.error(f"保存仪表板数据到PostgreSQL失败: {e}")
+        self._save('dashboard', data)
                 
     def save_content_analysis_data(self, data: List[Dict[str, Any]]) -> None:
         """保存内容分析数据"""
+        self._save('content_analysis', data)
+                
+    def append_content_analysis_data(self, data: List[Dict[str, Any]]) -> None:
+        """追加保存内容分析增量数据（只包含有变化的笔记）"""
+        self._save('content_analysis', data, append=True)
+                
+    def save_fans_data(self, data: List[Dict[str, Any]]) -> None:
+        """保存粉丝数据"""
+        self._save('fans', data)
+        
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待写回队列中已提交的数据全部落盘
+        
+        Args:
+            timeout: 最长等待时间（秒），None为一直等待
+            
+        Returns:
+            bool: 是否在超时前全部写入
+        """
+        if self._write_queue is None:
+            return True
+        return self._write_queue.flush(timeout)
+        
+    def _save(self, data_type: str, data: List[Dict[str, Any]], append: bool = False) -> None:
+        """保存数据：启用写回队列时提交到队列立即返回，否则直接写入"""
         if not self._initialized:
             self.initialize()
             
-        # 保存到CSV（始终执行）
+        if self._write_queue is not None:
+            self._write_queue.submit(data_type, data, append)
+        else:
+            self._write(data_type, data, append)
+            
+    def _write(self, data_type: str, data: List[Dict[str, Any]], append: bool = False) -> None:
+        """写入本地存储和PostgreSQL（写回队列的后台线程或未启用队列时的调用方执行）"""
+        # 保存到本地存储（始终执行）
         if self._csv_storage:
-            self._csv_storage.save_content_analysis_data(data)
+            if append:
+                self._csv_storage.append_content_analysis_data(data)
+            else:
+                getattr(self._csv_storage, f"save_{data_type}_data")(data)
+            get_analytics_cache().invalidate()
             
-        # 保存到PostgreSQL（如果启用）
+        # 保存到PostgreSQL（如果启用），增量数据按唯一键更新插入
         if self._pg_storage:
             try:
-                self._pg_storage.save_content_analysis_data(data)
+                if not self._run_pg(getattr(self._pg_storage, f"save_{data_type}_data")(data)):
+                    logger.error("保存数据到PostgreSQL失败")
             except Exception as e:
-                logger.error(f"保存内容分析数据到PostgreSQL失败: {e}")
+                logger.error(f"保存{data_type}数据到PostgreSQL失败: {e}")
                 
-    def save_fans_data(self, data: List[Dict[str, Any]]) -> None:
-        """保存粉丝数据"""
+    def read_frame(self, data_type: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                   dimension: Optional[str] = None) -> "pd.DataFrame":
+        """
+        从本地存储读取历史数据为DataFrame（数据未变化时使用分析数据缓存）
+        
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+            start_date: 起始日期（含），格式YYYY-MM-DD
+            end_date: 结束日期（含），格式YYYY-MM-DD
+            dimension: 只读取该维度的数据
+        """
         if not self._initialized:
             self.initialize()
-            
-        # 保存到CSV（始终执行）
-        if self._csv_storage:
-            self._csv_storage.save_fans_data(data)
-            
-        # 保存到PostgreSQL（如果启用）
+        return get_analytics_cache().get_or_load(
+            ('frame', data_type, start_date, end_date, dimension), self.get_data_signature(data_type),
+            lambda: self._csv_storage.read_frame(data_type, start_date, end_date, dimension)
+        )
+        
+    def get_latest_data(self, data_type: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        从本地存储读取最新的limit条记录（先落盘写回队列），不加载全部历史
+        
+        本地存储的get_latest_data是协程，这里在当前线程新建事件循环执行，
+        因此需要在同步代码或工作线程（asyncio.to_thread）中调用
+        
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+            limit: 返回数据条数限制
+        """
+        if not self._initialized:
+            self.initialize()
+        if not self._csv_storage:
+            return []
+        self.flush(timeout=30)
+        return asyncio.run(self._csv_storage.get_latest_data(data_type, limit))
+        
+    def get_data_signature(self, data_type: str) -> Any:
+        """
+        本地存储中某类数据的签名，用于校验分析数据缓存
+        
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+        """
+        if not self._initialized:
+            self.initialize()
+        return self._csv_storage.data_signature(data_type) if self._csv_storage else None
+        
+    def close(self) -> None:
+        """落盘写回队列中的数据，关闭存储连接（PostgreSQL连接池和事件循环）"""
+        if self._write_queue is not None:
+            self._write_queue.close()
+            self._write_queue = None
         if self._pg_storage:
             try:
-                self._pg_storage.save_fans_data(data)
+                self._run_pg(self._pg_storage.close(), timeout=10)
             except Exception as e:
-                logger.error(f"保存粉丝数据到PostgreSQL失败: {e}")
+                logger.warning(f"关闭PostgreSQL连接池失败: {e}")
+        if self._pg_loop is not None:
+            self._pg_loop.call_soon_threadsafe(self._pg_loop.stop)
+            self._pg_loop = None
                 
     def get_storage_info(self) -> Dict[str, Any]:
         """获取存储信息"""
@@ -159,13 +290,17 @@ class StorageManager:
         }
         
         if self._csv_storage:
-            info['storage_types'].append('CSV')
-            info['csv_info'] = self._csv_storage.get_storage_info()
+            local_info = self._csv_storage.get_storage_info()
+            info['storage_types'].append(local_info.get('storage_type', 'CSV'))
+            info['csv_info'] = local_info
             
         if self._pg_storage:
             info['storage_types'].append('PostgreSQL')
             info['postgresql_info'] = self._pg_storage.get_storage_info()
             
+        if self._write_queue is not None:
+            info['write_behind'] = self._write_queue.stats()
+            
         return info
 
 
@@ -0,0 +1,208 @@
+"""
+创作者数据趋势分析
+
+对全部历史数据做一次向量化的时间序列计算（基于pandas）：
+- 每天取最后一次采集作为当天的值
+- 日环比变化、增长率，7天/30天滚动平均
+- 互动率（点赞、评论、收藏、分享之和 / 浏览量）
+- 异常检测：日变化量偏离前30天均值超过z_threshold个标准差时标记
+- 内容数据按笔记计算浏览量增长，找出增长最快和互动率最高的笔记
+
+命令行 manual analyze 和 MCP工具 get_creator_trends 共用
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .analytics_query import RECORD_KEYS, prepare_frame
+
+# 各数据类型参与趋势计算的指标
+TREND_METRICS = {
+    'dashboard': ['views', 'likes', 'collects', 'comments', 'shares', 'interactions'],
+    'fans': ['total_fans', 'new_fans', 'lost_fans'],
+    'content_analysis': ['views', 'likes', 'comments', 'collects', 'shares', 'fans_growth']
+}
+
+# 计算互动率的字段
+ENGAGEMENT_FIELDS = ['likes', 'comments', 'collects', 'shares']
+
+ROLLING_WINDOWS = (7, 30)
+
+# 计算异常所需的最少历史天数
+ANOMALY_MIN_PERIODS = 5
+
+MAX_ANOMALIES = 20
+
+
+def daily_series(df: pd.DataFrame, data_type: str) -> pd.DataFrame:
+    """每条记录（维度/笔记）每天只保留最后一次采集，按记录和日期排序"""
+    df = prepare_frame(df, data_type)
+    keys = RECORD_KEYS[data_type]
+    df = (df.sort_values('created_at', kind='stable')
+            .drop_duplicates(subset=['date'] + keys, keep='last'))
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df = df.dropna(subset=['date'])
+    return df.sort_values(keys + ['date'], kind='stable').reset_index(drop=True)
+
+
+def add_trend_columns(daily: pd.DataFrame, data_type: str, z_threshold: float = 3.0) -> pd.DataFrame:
+    """
+    为每日数据添加趋势列
+
+    对每个指标m添加：m_delta（日变化）、m_growth（增长率）、m_avg_7d / m_avg_30d（滚动平均）、
+    m_z（日变化相对前30天的z分数）、m_anomaly（是否异常）；另加engagement_rate互动率
+    """
+    keys = RECORD_KEYS[data_type]
+    metrics = [metric for metric in TREND_METRICS[data_type] if metric in daily.columns]
+    daily = daily.copy()
+    if daily.empty:
+        return daily
+
+    grouped = daily.groupby(keys, sort=False)
+    previous = grouped[metrics].shift()
+    deltas = daily[metrics] - previous
+    daily[[f"{metric}_delta" for metric in metrics]] = deltas.to_numpy()
+    daily[[f"{metric}_growth" for metric in metrics]] = (deltas / previous.where(previous > 0)).to_numpy()
+
+    for window in ROLLING_WINDOWS:
+        rolled = _rolling(daily, keys, metrics, f"{window}D").mean()
+        daily[[f"{metric}_avg_{window}d" for metric in metrics]] = rolled.to_numpy()
+
+    # 日变化相对前30天（不含当天）的z分数
+    delta_columns = [f"{metric}_delta" for metric in metrics]
+    history = _rolling(daily, keys, delta_columns, '30D', closed='left', min_periods=ANOMALY_MIN_PERIODS)
+    deviation = daily[delta_columns].to_numpy() - history.mean().to_numpy()
+    std = history.std().to_numpy()
+    # 历史变化量完全平稳（标准差为0）时，任何偏离的z分数为±inf，视为异常
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_scores = deviation / std
+    daily[[f"{metric}_z" for metric in metrics]] = z_scores
+    for metric in metrics:
+        daily[f"{metric}_anomaly"] = daily[f"{metric}_z"].abs() >= z_threshold
+
+    engagement = [field for field in ENGAGEMENT_FIELDS if field in daily.columns]
+    if 'views' in daily.columns and engagement:
+        daily['engagement_rate'] = daily[engagement].sum(axis=1) / daily['views'].where(daily['views'] > 0)
+
+    return daily
+
+
+def analyze_trends(frames: Dict[str, pd.DataFrame], z_threshold: float = 3.0, top_n: int = 5) -> Dict[str, Any]:
+    """
+    趋势分析
+
+    Args:
+        frames: 数据类型 -> 存储read_frame读出的历史数据
+        z_threshold: 异常判定阈值（标准差倍数）
+        top_n: 内容数据返回的笔记条数
+
+    Returns:
+        可直接JSON序列化的分析结果
+    """
+    result: Dict[str, Any] = {}
+    for data_type, df in frames.items():
+        daily = add_trend_columns(daily_series(df, data_type), data_type, z_threshold)
+        if data_type == 'content_analysis':
+            result[data_type] = _content_summary(daily, top_n)
+        else:
+            result[data_type] = _dimension_summary(daily, data_type)
+    return result
+
+
+def _rolling(daily: pd.DataFrame, keys: List[str], columns: List[str], window: str, **kwargs):
+    """按记录分组的时间窗口滚动（结果与daily行顺序一致）"""
+    frame = daily[keys + columns].set_index(daily['date'])
+    return frame.groupby(keys, sort=False, group_keys=False)[columns].rolling(window, **kwargs)
+
+
+def _dimension_summary(daily: pd.DataFrame, data_type: str) -> Dict[str, Any]:
+    """仪表板、粉丝数据：各维度的最新值、变化和滚动平均"""
+    summary: Dict[str, Any] = _date_range(daily)
+    if daily.empty:
+        return summary
+
+    metrics = [metric for metric in TREND_METRICS[data_type] if metric in daily.columns]
+    latest = daily.groupby('dimension', sort=False).tail(1)
+    summary['dimensions'] = {}
+    for _, row in latest.iterrows():
+        summary['dimensions'][row['dimension']] = {
+            'date': row['date'].strftime('%Y-%m-%d'),
+            'metrics': {metric: _metric_values(row, metric) for metric in metrics},
+            'engagement_rate': _clean(row.get('engagement_rate'))
+        }
+
+    summary['anomalies'] = _anomalies(daily, metrics, ['dimension'])
+    return summary
+
+
+def _content_summary(daily: pd.DataFrame, top_n: int) -> Dict[str, Any]:
+    """内容数据：每篇笔记的最新增长和互动率"""
+    summary: Dict[str, Any] = _date_range(daily)
+    if daily.empty:
+        return summary
+
+    latest = daily.groupby(RECORD_KEYS['content_analysis'], sort=False).tail(1)
+    columns = ['title', 'publish_time', 'views', 'views_delta', 'views_growth', 'engagement_rate']
+    summary['notes'] = len(latest)
+    summary['top_growth'] = _records(latest.nlargest(top_n, 'views_delta')[columns])
+    summary['top_engagement'] = _records(latest[latest['views'] > 0].nlargest(top_n, 'engagement_rate')[columns])
+    summary['anomalies'] = _anomalies(daily, ['views'], ['title'])
+    return summary
+
+
+def _metric_values(row: pd.Series, metric: str) -> Dict[str, Any]:
+    """一行数据中某个指标的趋势值"""
+    values = {'value': _clean(row[metric]), 'delta': _clean(row[f"{metric}_delta"]),
+              'growth': _clean(row[f"{metric}_growth"])}
+    for window in ROLLING_WINDOWS:
+        values[f"avg_{window}d"] = _clean(row[f"{metric}_avg_{window}d"])
+    return values
+
+
+def _anomalies(daily: pd.DataFrame, metrics: List[str], label_columns: List[str]) -> List[Dict[str, Any]]:
+    """最近的异常点（按日期倒序）"""
+    anomalies = []
+    for metric in metrics:
+        flagged = daily[daily[f"{metric}_anomaly"]]
+        for _, row in flagged.iterrows():
+            anomaly = {column: row[column] for column in label_columns}
+            anomaly.update({
+                'date': row['date'].strftime('%Y-%m-%d'),
+                'metric': metric,
+                'value': _clean(row[metric]),
+                'delta': _clean(row[f"{metric}_delta"]),
+                'z_score': _clean(row[f"{metric}_z"])
+            })
+            anomalies.append(anomaly)
+    anomalies.sort(key=lambda item: item['date'], reverse=True)
+    return anomalies[:MAX_ANOMALIES]
+
+
+def _date_range(daily: pd.DataFrame) -> Dict[str, Any]:
+    """数据覆盖的日期范围"""
+    if daily.empty:
+        return {'days': 0, 'first_date': None, 'last_date': None}
+    return {
+        'days': int(daily['date'].nunique()),
+        'first_date': daily['date'].min().strftime('%Y-%m-%d'),
+        'last_date': daily['date'].max().strftime('%Y-%m-%d')
+    }
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """DataFrame转为记录列表，数值转换为JSON可序列化的值"""
+    return [{key: _clean(value) for key, value in record.items()} for record in df.to_dict('records')]
+
+
+def _clean(value: Any) -> Optional[Any]:
+    """NaN/inf转为None，浮点数保留4位小数，numpy数值转为Python类型"""
+    if value is None:
+        return None
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float):
+        return round(value, 4) if math.isfinite(value) else None
+    return value
@@ -0,0 +1,255 @@
+"""
+异步写回队列
+
+采集器在事件循环和采集线程中调用保存接口，磁盘和数据库写入不应阻塞采集流程。
+保存请求先进入内存队列立即返回，由后台写入线程批量落盘：
+- 同一天同一数据类型的多次覆盖保存只写最后一次（后一次本来就会覆盖前一次）
+- 增量追加合并到同一天待写入的数据中
+- 定时、待写入记录数达到上限、显式flush或关闭时落盘，并记录每次落盘耗时
+- 写入失败的数据放回队列重试，多次失败后放弃；flush等待的数据被放弃时返回False
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 一批数据最多写入次数，超过后放弃
+MAX_WRITE_ATTEMPTS = 3
+
+
+class WriteBehindQueue:
+    """合并同日保存请求的后台写回队列"""
+
+    def __init__(self, writer: Callable[[str, List[Dict[str, Any]], bool], None],
+                 flush_interval: float = 5.0, max_pending_records: int = 1000, retry_delay: float = 1.0):
+        """
+        初始化写回队列
+
+        Args:
+            writer: 实际写入函数 writer(data_type, data, append)，在后台线程中调用
+            flush_interval: 定时落盘间隔（秒）
+            max_pending_records: 待写入记录数达到该值时立即落盘
+            retry_delay: 写入失败后重试前的等待时间（秒）
+        """
+        self._writer = writer
+        self.flush_interval = flush_interval
+        self.max_pending_records = max_pending_records
+        self.retry_delay = retry_delay
+
+        # (数据类型, 日期) -> {'data': 待写入数据, 'append': 是否为追加, 'attempts': 已失败次数}
+        self._pending: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._pending_records = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+        self._flush_requested = False
+        self._flush_waiters = 0
+        # 已提交和已处理（写入或放弃）的请求序号，flush据此等待调用前提交的请求全部处理
+        self._submitted_seq = 0
+        self._written_seq = 0
+        # 最近一次放弃写入时覆盖到的请求序号
+        self._failed_seq = 0
+
+        self._stats = {
+            'submitted': 0,
+            'coalesced': 0,
+            'flushes': 0,
+            'written_batches': 0,
+            'failed_batches': 0,
+            'dropped_batches': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'total_flush_ms': 0.0
+        }
+
+    def submit(self, data_type: str, data: List[Dict[str, Any]], append: bool = False) -> None:
+        """
+        提交保存请求（立即返回）
+
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+            data: 数据列表
+            append: True为追加增量数据，False为覆盖当天数据
+        """
+        key = (data_type, datetime.now().strftime('%Y-%m-%d'))
+
+        with self._condition:
+            if self._closing:
+                raise RuntimeError("写回队列已关闭")
+
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = {'data': list(data), 'append': append, 'attempts': 0}
+            elif append:
+                # 追加到待写入的数据之后（覆盖保存 + 追加 仍然是一次覆盖保存）
+                entry['data'].extend(data)
+                self._stats['coalesced'] += 1
+            else:
+                # 新的覆盖保存取代之前尚未写入的数据
+                self._pending_records -= len(entry['data'])
+                self._pending[key] = {'data': list(data), 'append': False, 'attempts': 0}
+                self._stats['coalesced'] += 1
+
+            self._pending_records += len(data)
+            self._submitted_seq += 1
+            self._stats['submitted'] += 1
+            self._ensure_thread()
+
+            if self._pending_records >= self.max_pending_records:
+                self._flush_requested = True
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        立即落盘，等待调用前提交的请求全部写入
+
+        写入失败的数据会立即重试，多次失败后放弃
+
+        Args:
+            timeout: 最长等待时间（秒），None为一直等待
+
+        Returns:
+            bool: 是否在超时前全部写入成功（有数据被放弃时返回False）
+        """
+        with self._condition:
+            target = self._submitted_seq
+            if self._written_seq < target:
+                self._flush_requested = True
+                self._flush_waiters += 1
+                self._condition.notify_all()
+                try:
+                    if not self._condition.wait_for(lambda: self._written_seq >= target, timeout):
+                        return False
+                finally:
+                    self._flush_waiters -= 1
+            return self._failed_seq < target
+
+    def close(self, timeout: Optional[float] = 30) -> bool:
+        """
+        落盘剩余数据并停止后台线程
+
+        Returns:
+            bool: 是否在超时前全部写入
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning(f"⚠️ 写回队列关闭超时，仍有 {self._pending_records} 条记录未写入")
+                return False
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """队列统计（落盘耗时单位为毫秒）"""
+        with self._condition:
+            stats = dict(self._stats)
+            stats['pending_batches'] = len(self._pending)
+            stats['pending_records'] = self._pending_records
+            stats['avg_flush_ms'] = round(stats['total_flush_ms'] / stats['flushes'], 2) if stats['flushes'] else 0.0
+            return stats
+
+    def _ensure_thread(self) -> None:
+        """首次提交时启动后台写入线程（调用方持有锁）"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="xhs-storage-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """后台写入线程：等待落盘时机，取出全部待写入数据后在锁外写入"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closing)
+                if not self._pending and self._closing:
+                    return
+
+                retrying = any(entry['attempts'] for entry in self._pending.values())
+                delay = self.retry_delay if retrying else self.flush_interval
+                deadline = time.monotonic() + delay
+                self._condition.wait_for(
+                    lambda: (self._flush_requested and not retrying) or self._closing,
+                    max(0.0, deadline - time.monotonic())
+                )
+
+                batches = list(self._pending.items())
+                target = self._submitted_seq
+                self._pending.clear()
+                self._pending_records = 0
+                self._flush_requested = self._flush_waiters > 0
+
+            failed = self._write_batches(batches)
+
+            with self._condition:
+                requeued = self._requeue(failed, target)
+                if not requeued:
+                    self._written_seq = target
+                self._condition.notify_all()
+
+    def _write_batches(self, batches: List[Tuple[Tuple[str, str], Dict[str, Any]]]
+                       ) -> List[Tuple[Tuple[str, str], Dict[str, Any]]]:
+        """按提交顺序写入各批数据，统计落盘耗时，返回写入失败的批次"""
+        start = time.perf_counter()
+        written = records = 0
+        failed = []
+
+        for key, entry in batches:
+            data_type, date = key
+            try:
+                self._writer(data_type, entry['data'], entry['append'])
+                written += 1
+                records += len(entry['data'])
+            except Exception as e:
+                failed.append((key, entry))
+                logger.error(f"❌ 写回{date}的{data_type}数据失败（{len(entry['data'])} 条记录，"
+                             f"第{entry['attempts'] + 1}次）: {e}")
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._condition:
+            self._stats['flushes'] += 1
+            self._stats['written_batches'] += written
+            self._stats['failed_batches'] += len(failed)
+            self._stats['last_flush_ms'] = round(elapsed_ms, 2)
+            self._stats['max_flush_ms'] = round(max(self._stats['max_flush_ms'], elapsed_ms), 2)
+            self._stats['total_flush_ms'] += elapsed_ms
+
+        logger.info(f"💾 写回队列落盘 {written} 批 {records} 条记录，耗时 {elapsed_ms:.1f}ms")
+        return failed
+
+    def _requeue(self, failed: List[Tuple[Tuple[str, str], Dict[str, Any]]], target: int) -> bool:
+        """
+        把写入失败的批次放回队列（调用方持有锁）
+
+        写入期间又提交了同一天的覆盖保存时，失败的数据已被取代；提交的是追加时，
+        失败的数据放在新数据之前。超过最大写入次数的批次放弃
+
+        Returns:
+            bool: 是否有批次放回队列等待重试
+        """
+        requeued = False
+        # 倒序放回队首，保持原来的写入顺序
+        for key, entry in reversed(failed):
+            entry['attempts'] += 1
+            if entry['attempts'] >= MAX_WRITE_ATTEMPTS:
+                self._failed_seq = target
+                self._stats['dropped_batches'] += 1
+                logger.error(f"❌ 放弃写回{key[1]}的{key[0]}数据（{len(entry['data'])} 条记录）")
+                continue
+
+            newer = self._pending.get(key)
+            if newer is not None and not newer['append']:
+                continue
+            if newer is not None:
+                entry['data'].extend(newer['data'])
+            self._pending[key] = entry
+            self._pending.move_to_end(key, last=False)
+            self._pending_records += len(entry['data']) - (len(newer['data']) if newer else 0)
+            requeued = True
+        return requeued
@@ -12,18 +12,25 @@ import sys
 import socket
 import uuid
 import time
+import heapq
+import itertools
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple, Callable, Awaitable
 from dataclasses import dataclass, asdict
 
 from fastmcp import FastMCP
 
 from ..core.config import XHSConfig
-from ..core.exceptions import format_error_message, XHSToolkitError
+from ..core.exceptions import format_error_message, XHSToolkitError, TaskQueueFullError
+from ..core.driver_pool import get_driver_pool
 from ..xiaohongshu.client import XHSClient
 from ..xiaohongshu.models import XHSNote
 from ..utils.logger import get_logger, setup_logger
+from ..utils.publish_metrics import publish_metrics
 from ..data import storage_manager, data_scheduler
+from ..data.analytics_query import query_data_types
+from ..data.trend_analytics import analyze_trends
+from ..data.storage.schema import DATA_TYPE_FIELDS
 from ..auth.smart_auth_server import SmartAuthServer, create_smart_auth_server
 
 logger = get_logger(__name__)
@@ -33,13 +40,17 @@ logger = get_logger(__name__)
 class PublishTask:
     """发布任务数据类"""
     task_id: str
-    status: str  # "pending", "uploading", "filling", "publishing", "completed", "failed"
+    status: str  # "queued", "pending", "uploading", "filling", "publishing", "completed", "failed"
     note: XHSNote
     progress: int  # 0-100
     message: str
     result: Dict[str, Any] = None
     start_time: float = None
     end_time: float = None
+    account: str = None  # 账号cookies文件，同一账号的任务串行执行
+    priority: int = 0  # 数值越大越优先
+    run_time: float = None  # 开始执行（出队）的时间
+    spans: List[Dict[str, Any]] = None  # 发布各步骤耗时
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -54,13 +65,26 @@ class PublishTask:
 
 
 class TaskManager:
-    """任务管理器"""
+    """
+    任务管理器
+    
+    发布任务先进入优先级队列（同优先级先进先出），由有限数量的工作协程依次执行；
+    同一账号（cookies文件）的任务始终串行，避免同一账号同时打开多个浏览器发布。
+    MCP发布工具目前都使用配置中的账号（COOKIES_FILE），因此发布任务实际上串行执行，
+    max_workers只对使用不同账号创建的任务生效
+    """
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 1, max_queue_size: int = 20):
         self.tasks: Dict[str, PublishTask] = {}
         self.running_tasks: Dict[str, asyncio.Task] = {}
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max_queue_size
+        self._queue: List[Tuple[int, int, str]] = []  # (负优先级, 序号, 任务ID)
+        self._sequence = itertools.count()
+        self._active_accounts: set = set()
+        self._runners: Dict[str, Callable[[str], Awaitable[None]]] = {}
     
-    def create_task(self, note: XHSNote) -> str:
+    def create_task(self, note: XHSNote, account: str = None, priority: int = 0) -> str:
         """创建新任务"""
         task_id = str(uuid.uuid4())[:8]  # 使用短ID
         task = PublishTask(
@@ -69,12 +93,102 @@ class TaskManager:
             note=note,
             progress=0,
             message="任务已创建，准备开始",
-            start_time=time.time()
+            start_time=time.time(),
+            account=account,
+            priority=priority
         )
         self.tasks[task_id] = task
         logger.info(f"📋 创建新任务: {task_id} - {note.title}")
         return task_id
     
+    def submit(self, task_id: str, runner: Callable[[str], Awaitable[None]]) -> int:
+        """
+        提交任务到执行队列
+        
+        Args:
+            task_id: 任务ID
+            runner: 执行任务的协程函数，参数为任务ID
+            
+        Returns:
+            排队位置，0表示已立即开始执行
+            
+        Raises:
+            TaskQueueFullError: 排队任务数达到上限时
+        """
+        task = self.tasks[task_id]
+        if self.max_queue_size and len(self._queue) >= self.max_queue_size:
+            raise TaskQueueFullError(len(self._queue))
+        
+        heapq.heappush(self._queue, (-task.priority, next(self._sequence), task_id))
+        self._runners[task_id] = runner
+        task.status = "queued"
+        task.message = "任务排队中，等待空闲执行槽位"
+        
+        self._dispatch()
+        position = self.get_queue_position(task_id)
+        if position:
+            logger.info(f"⏳ 任务 {task_id} 进入队列，排队位置: {position}")
+        return position
+    
+    def get_queue_position(self, task_id: str) -> int:
+        """获取任务的排队位置（从1开始），不在队列中返回0"""
+        for position, (_, _, queued_id) in enumerate(sorted(self._queue), start=1):
+            if queued_id == task_id:
+                return position
+        return 0
+    
+    def get_executor_status(self) -> Dict[str, Any]:
+        """获取执行器状态"""
+        return {
+            "max_workers": self.max_workers,
+            "running": len(self.running_tasks),
+            "queued": len(self._queue),
+            "max_queue_size": self.max_queue_size,
+            "busy_accounts": len(self._active_accounts)
+        }
+    
+    def _dispatch(self) -> None:
+        """在有空闲槽位时按优先级取出可执行的任务（跳过账号正忙的任务）"""
+        if len(self.running_tasks) >= self.max_workers or not self._queue:
+            return
+        
+        for entry in sorted(self._queue):
+            if len(self.running_tasks) >= self.max_workers:
+                break
+            task_id = entry[2]
+            task = self.tasks.get(task_id)
+            if task is None:
+                self._queue.remove(entry)
+                continue
+            if task.account in self._active_accounts:
+                continue
+            
+            self._queue.remove(entry)
+            self._active_accounts.add(task.account)
+            task.status = "pending"
+            task.message = "任务开始执行"
+            task.run_time = time.time()
+            self.running_tasks[task_id] = asyncio.create_task(self._run(task_id, self._runners.pop(task_id)))
+        
+        heapq.heapify(self._queue)
+    
+    async def _run(self, task_id: str, runner: Callable[[str], Awaitable[None]]) -> None:
+        """执行单个任务，结束后释放槽位并调度下一个任务"""
+        task = self.tasks.get(task_id)
+        try:
+            await runner(task_id)
+        except asyncio.CancelledError:
+            self.update_task(task_id, status="failed", message="任务已取消")
+            raise
+        except Exception as e:
+            logger.error(f"❌ 任务 {task_id} 执行异常: {e}")
+            self.update_task(task_id, status="failed", message=f"任务执行失败: {str(e)}")
+        finally:
+            self.running_tasks.pop(task_id, None)
+            if task is not None:
+                self._active_accounts.discard(task.account)
+            self._dispatch()
+    
     def get_task(self, task_id: str) -> PublishTask:
         """获取任务"""
         return self.tasks.get(task_id)
@@ -124,7 +238,10 @@ class MCPServer:
         self.config = config
         self.xhs_client = XHSClient(config)
         self.mcp = FastMCP("小红书MCP服务器")
-        self.task_manager = TaskManager()  # 添加任务管理器
+        self.task_manager = TaskManager(  # 发布任务执行器
+            max_workers=config.publish_max_workers,
+            max_queue_size=config.publish_queue_size
+        )
         self.scheduler_initialized = False  # 调度器初始化标志
         self.auth_server = create_smart_auth_server(config)  # 智能认证服务器
         self._setup_tools()
@@ -216,6 +333,10 @@ class MCPServer:
                     "storage_info": storage_manager.get_storage_info() if self.scheduler_initialized else None
                 }
                 
+                # 添加浏览器驱动池和发布队列状态
+                config_status["browser_pool"] = get_driver_pool(self.config).get_status()
+                config_status["publish_executor"] = self.task_manager.get_executor_status()
+                
                 logger.info(f"✅ 连接测试完成: {config_status}")
                 
                 result = {
@@ -234,7 +355,7 @@ class MCPServer:
         
         @self.mcp.tool()
         async def smart_publish_note(title: str, content: str, images=None, videos=None, 
-                                   topics=None, location: str = "") -> str:
+                                   topics=None, location: str = "", priority: int = 0) -> str:
             """
             发布小红书笔记（支持多种输入格式）
             
@@ -251,6 +372,7 @@ class MCPServer:
                 videos: 视频路径（目前仅支持本地文件）
                 topics: 话题，支持字符串或数组格式
                 location (str, optional): 位置信息
+                priority (int, optional): 任务优先级，数值越大越先执行，默认0
             
             Returns:
                 str: 任务ID和状态信息
@@ -282,16 +404,29 @@ class MCPServer:
                 logger.info(f"✅ 智能解析结果: 图片{len(note.images) if note.images else 0}张, 视频{len(note.videos) if note.videos else 0}个, 话题{len(note.topics) if note.topics else 0}个")
                 
                 # 创建异步任务
-                task_id = self.task_manager.create_task(note)
+                task_id = self.task_manager.create_task(
+                    note, account=self.config.cookies_file, priority=priority
+                )
                 
-                # 启动后台任务
-                async_task = asyncio.create_task(self._execute_publish_task(task_id))
-                self.task_manager.running_tasks[task_id] = async_task
+                # 提交到执行队列，有空闲槽位时立即开始
+                try:
+                    queue_position = self.task_manager.submit(task_id, self._execute_publish_task)
+                except TaskQueueFullError as e:
+                    self.task_manager.update_task(task_id, status="failed", message=e.message)
+                    return json.dumps({
+                        "success": False,
+                        "task_id": task_id,
+                        "message": e.message,
+                        "executor": self.task_manager.get_executor_status(),
+                        "suggestion": "请等待已有发布任务完成后再提交"
+                    }, ensure_ascii=False, indent=2)
                 
                 result = {
                     "success": True,
                     "task_id": task_id,
-                    "message": f"发布任务已启动，任务ID: {task_id}",
+                    "message": f"发布任务已启动，任务ID: {task_id}" if not queue_position
+                               else f"发布任务已排队，任务ID: {task_id}，排队位置: {queue_position}",
+                    "queue_position": queue_position,
                     "next_step": f"请使用 check_task_status('{task_id}') 查看进度",
                     "parsing_result": {
                         "images_parsed": note.images if note.images else [],
@@ -350,10 +485,19 @@ class MCPServer:
                 "is_completed": task.status in ["completed", "failed"]
             }
             
+            # 排队中的任务返回排队位置
+            if task.status == "queued":
+                result["queue_position"] = self.task_manager.get_queue_position(task_id)
+                result["executor"] = self.task_manager.get_executor_status()
+            
             # 如果任务完成，包含结果
             if task.result:
                 result["result"] = task.result
             
+            # 包含各步骤耗时
+            if task.spans:
+                result["spans"] = task.spans
+            
             return json.dumps(result, ensure_ascii=False, indent=2)
         
         @self.mcp.tool()
@@ -398,6 +542,28 @@ class MCPServer:
             
             return json.dumps(result, ensure_ascii=False, indent=2)
         
+        @self.mcp.tool()
+        async def get_publish_metrics(step: str = "") -> str:
+            """
+            获取发布流程各步骤耗时统计
+            
+            统计最近发布任务中访问发布页、切换模式、上传、填写标题/内容、话题、可见范围、提交
+            各步骤的耗时分布，用于定位变慢的步骤
+            
+            Args:
+                step (str, optional): 只查看指定步骤（navigate/mode_switch/upload/title_fill/
+                                      content_fill/topics/visibility/submit），默认全部
+            
+            Returns:
+                str: 各步骤的样本数、失败次数、平均值、p50、p95、最大值（秒）
+            """
+            logger.info(f"⏱️ 获取发布耗时统计: {step or '全部步骤'}")
+            result = {
+                "success": True,
+                "metrics": publish_metrics.summary(step or None)
+            }
+            return json.dumps(result, ensure_ascii=False, indent=2)
+        
         @self.mcp.tool()
         async def login_xiaohongshu(force_relogin: bool = False, quick_mode: bool = False) -> str:
             """
@@ -464,14 +630,30 @@ class MCPServer:
                 }, ensure_ascii=False, indent=2)
         
         @self.mcp.tool()
-        async def get_creator_data_analysis() -> str:
+        async def get_creator_data_analysis(data_type: str = "all", start_date: str = "", end_date: str = "",
+                                            dimension: str = "", fields: str = "", aggregate: str = "summary",
+                                            top_n: int = 10, sort_by: str = "views", cursor: str = "",
+                                            page_size: int = 50) -> str:
             """
-            获取创作者数据用于分析
+            获取创作者数据用于分析（服务端过滤、聚合和分页，返回紧凑结果）
+            
+            Args:
+                data_type: 数据类型 dashboard/content_analysis/fans，all为全部（分页时需指定单个类型）
+                start_date: 起始日期（含），格式YYYY-MM-DD
+                end_date: 结束日期（含），格式YYYY-MM-DD
+                dimension: 统计维度（仪表板、粉丝数据），例如"7天"
+                fields: 只返回这些字段，逗号分隔
+                aggregate: summary概览、none原始记录、sum/avg按日期汇总、top按sort_by取前top_n、
+                    latest最近采集的top_n条（只读数据文件末尾，不支持日期、维度过滤和分页）
+                top_n: top、summary和latest返回的条数
+                sort_by: top的排序字段，默认views
+                cursor: 分页游标，使用上一页返回的next_cursor
+                page_size: 每页条数（none/sum/avg），最大500
             
             Returns:
-                str: 包含所有创作者数据的详细信息用于数据分析
+                str: 查询结果
             """
-            logger.info("📊 获取创作者数据用于分析")
+            logger.info(f"📊 获取创作者数据用于分析: {data_type}, 聚合方式: {aggregate}")
             
             try:
                 # 检查cookies是否存在，数据分析需要登录状态
@@ -490,39 +672,40 @@ class MCPServer:
                         "suggestion": "请检查cookies状态并重启服务器"
                     }, ensure_ascii=False, indent=2)
                 
-                # 获取存储管理器
-                csv_storage = storage_manager.get_csv_storage()
+                data_types = list(DATA_TYPE_FIELDS) if data_type == "all" else [data_type]
+                field_list = [field.strip() for field in fields.split(",") if field.strip()] or None
+                if aggregate == "latest" and (start_date or end_date or dimension or cursor):
+                    raise ValueError("latest不支持日期、维度过滤和分页")
                 
-                # 读取所有数据
-                dashboard_data = await csv_storage.get_latest_data('dashboard', limit=100)
-                content_data = await csv_storage.get_latest_data('content_analysis', limit=100)
-                fans_data = await csv_storage.get_latest_data('fans', limit=100)
-                
-                # 获取存储信息
-                storage_info = storage_manager.get_storage_info()
+                # 先落盘写回队列中的数据，再读取历史数据（数据文件未变化时直接使用缓存的DataFrame）
+                await asyncio.to_thread(storage_manager.flush, 30)
+                results = await asyncio.to_thread(
+                    query_data_types,
+                    lambda name: storage_manager.read_frame(name, start_date or None, end_date or None,
+                                                            dimension or None),
+                    data_types, aggregate=aggregate, fields=field_list, top_n=top_n,
+                    sort_by=sort_by, cursor=cursor, page_size=page_size,
+                    load_latest=storage_manager.get_latest_data
+                )
                 
                 result = {
                     "success": True,
-                    "message": "创作者数据获取成功，可用于分析",
-                    "data_summary": {
-                        "dashboard_records": len(dashboard_data),
-                        "content_records": len(content_data),
-                        "fans_records": len(fans_data),
-                        "storage_info": storage_info
-                    },
-                    "dashboard_data": dashboard_data,
-                    "content_analysis_data": content_data,
-                    "fans_data": fans_data,
-                    "analysis_tips": {
-                        "dashboard": "仪表板数据包含账号整体表现指标",
-                        "content": "内容分析数据包含每篇笔记的详细表现",
-                        "fans": "粉丝数据包含粉丝增长趋势"
+                    "query": {
+                        "data_type": data_type, "start_date": start_date or None, "end_date": end_date or None,
+                        "dimension": dimension or None, "aggregate": aggregate
                     },
+                    "data": results,
+                    "storage": storage_manager.get_storage_info()['storage_types'],
                     "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
                 }
                 
-                return json.dumps(result, ensure_ascii=False, indent=2)
+                return json.dumps(result, ensure_ascii=False, separators=(",", ":"), default=str)
                 
+            except ValueError as e:
+                return json.dumps({
+                    "success": False,
+                    "message": f"查询参数无效: {str(e)}"
+                }, ensure_ascii=False, indent=2)
             except Exception as e:
                 error_msg = f"获取创作者数据失败: {str(e)}"
                 logger.error(f"❌ {error_msg}")
@@ -531,6 +714,49 @@ class MCPServer:
                     "message": error_msg
                 }, ensure_ascii=False, indent=2)
         
+        @self.mcp.tool()
+        async def get_creator_trends(start_date: str = "", end_date: str = "", z_threshold: float = 3.0,
+                                     top_n: int = 5) -> str:
+            """
+            获取创作者数据趋势分析（一次计算全部历史，返回紧凑的趋势汇总）
+            
+            包括7天/30天滚动平均、日变化和增长率、笔记浏览量增长、互动率以及异常波动
+            
+            Args:
+                start_date: 起始日期（含），格式YYYY-MM-DD
+                end_date: 结束日期（含），格式YYYY-MM-DD
+                z_threshold: 异常判定阈值（日变化偏离前30天均值的标准差倍数）
+                top_n: 返回增长最快、互动率最高的笔记条数
+            
+            Returns:
+                str: 趋势分析结果
+            """
+            logger.info("📈 获取创作者数据趋势分析")
+            
+            try:
+                def compute():
+                    storage_manager.flush(timeout=30)
+                    frames = {
+                        data_type: storage_manager.read_frame(data_type, start_date or None, end_date or None)
+                        for data_type in DATA_TYPE_FIELDS
+                    }
+                    return analyze_trends(frames, z_threshold=z_threshold, top_n=top_n)
+                
+                trends = await asyncio.to_thread(compute)
+                return json.dumps({
+                    "success": True,
+                    "trends": trends,
+                    "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+                }, ensure_ascii=False, separators=(",", ":"), default=str)
+                
+            except Exception as e:
+                error_msg = f"趋势分析失败: {str(e)}"
+                logger.error(f"❌ {error_msg}")
+                return json.dumps({
+                    "success": False,
+                    "message": error_msg
+                }, ensure_ascii=False, indent=2)
+        
     
     async def _execute_publish_task(self, task_id: str) -> None:
         """
@@ -544,13 +770,14 @@ class MCPServer:
             logger.error(f"❌ 任务 {task_id} 不存在")
             return
         
+        client = None
         try:
             # 阶段0：快速验证登录状态（仅检查cookies存在性）
             self.task_manager.update_task(task_id, status="validating", progress=5, message="正在快速验证登录状态...")
             
             try:
                 # 只检查cookies文件是否存在，避免重复的详细验证
-                cookies_file = Path(self.config.cookies_file)
+                cookies_file = Path(task.account or self.config.cookies_file)
                 if not cookies_file.exists():
                     self.task_manager.update_task(
                         task_id, 
@@ -587,54 +814,61 @@ class MCPServer:
                 return
             
             # 阶段1：初始化浏览器
-            # 创建新的客户端实例，避免并发冲突
-            client = XHSClient(self.config)
-            
-            # 阶段2：上传文件
-            if task.note.images or task.note.videos:
-                self.task_manager.update_task(task_id, status="uploading", progress=20, message="正在上传文件...")
+            # 从驱动池借出已预热的浏览器，发布完成后归还复用
+            async with get_driver_pool(self.config).session(task.account, priority=True) as browser_manager:
+                # 上传进度（0-100%）映射到任务进度20%-60%
+                def report_upload_progress(percent: int, text: str) -> None:
+                    self.task_manager.update_task(task_id, progress=20 + percent * 40 // 100,
+                                                  message=f"正在上传文件... {percent}%")
                 
-                # 执行发布过程
-                result = await client.publish_note(task.note)
+                client = XHSClient(self.config, browser_manager=browser_manager,
+                                   progress_callback=report_upload_progress)
                 
-                if result.success:
-                    self.task_manager.update_task(
-                        task_id, 
-                        status="completed", 
-                        progress=100, 
-                        message="发布成功！",
-                        result=result.to_dict()
-                    )
-                else:
-                    self.task_manager.update_task(
-                        task_id, 
-                        status="failed", 
-                        progress=0, 
-                        message=f"发布失败: {result.message}",
-                        result=result.to_dict()
-                    )
-            else:
-                # 没有文件的快速发布
-                self.task_manager.update_task(task_id, status="publishing", progress=60, message="正在发布笔记...")
+                # 阶段2：上传文件
+                if task.note.images or task.note.videos:
+                    self.task_manager.update_task(task_id, status="uploading", progress=20, message="正在上传文件...")
                 
-                result = await client.publish_note(task.note)
+                    # 执行发布过程
+                    result = await client.publish_note(task.note)
                 
-                if result.success:
-                    self.task_manager.update_task(
-                        task_id, 
-                        status="completed", 
-                        progress=100, 
-                        message="发布成功！",
-                        result=result.to_dict()
-                    )
+                    if result.success:
+                        self.task_manager.update_task(
+                            task_id, 
+                            status="completed", 
+                            progress=100, 
+                            message="发布成功！",
+                            result=result.to_dict()
+                        )
+                    else:
+                        self.task_manager.update_task(
+                            task_id, 
+                            status="failed", 
+                            progress=0, 
+                            message=f"发布失败: {result.message}",
+                            result=result.to_dict()
+                        )
                 else:
-                    self.task_manager.update_task(
-                        task_id, 
-                        status="failed", 
-                        progress=0, 
-                        message=f"发布失败: {result.message}",
-                        result=result.to_dict()
-                    )
+                    # 没有文件的快速发布
+                    self.task_manager.update_task(task_id, status="publishing", progress=60, message="正在发布笔记...")
+                
+                    result = await client.publish_note(task.note)
+                
+                    if result.success:
+                        self.task_manager.update_task(
+                            task_id, 
+                            status="completed", 
+                            progress=100, 
+                            message="发布成功！",
+                            result=result.to_dict()
+                        )
+                    else:
+                        self.task_manager.update_task(
+                            task_id, 
+                            status="failed", 
+                            progress=0, 
+                            message=f"发布失败: {result.message}",
+                            result=result.to_dict()
+                        )
                 
         except Exception as e:
             error_msg = f"任务执行失败: {str(e)}"
@@ -647,9 +881,9 @@ class MCPServer:
                 result={"success": False, "message": error_msg}
             )
         finally:
-            # 清理运行任务记录
-            if task_id in self.task_manager.running_tasks:
-                del self.task_manager.running_tasks[task_id]
+            # 记录各步骤耗时（失败的任务同样保留，便于定位卡住的步骤）
+            if client is not None:
+                task.spans = client.span_recorder.to_list()
 
     def _setup_resources(self) -> None:
         """设置MCP资源"""
@@ -661,6 +895,11 @@ class MCPServer:
             config_info["server_status"] = "running"
             return json.dumps(config_info, ensure_ascii=False, indent=2)
         
+        @self.mcp.resource("xhs://metrics/publish")
+        def get_xhs_publish_metrics() -> str:
+            """获取发布流程各步骤耗时统计（p50/p95）"""
+            return json.dumps(publish_metrics.summary(), ensure_ascii=False, indent=2)
+        
         @self.mcp.resource("xhs://help")
         def get_xhs_help() -> str:
             """获取小红书MCP服务器使用帮助"""
@@ -696,7 +935,12 @@ class MCPServer:
 ### 5. close_browser
 - 功能: 关闭浏览器
 
-### 6. test_publish_params
+### 6. get_publish_metrics
+- 功能: 查看发布流程各步骤耗时统计（p50/p95）
+- 参数:
+  - step: 步骤名称（可选）
+
+### 7. test_publish_params
 - 功能: 测试发布参数解析（调试用）
 - 参数:
   - title: 测试标题
@@ -706,6 +950,7 @@ class MCPServer:
 ## 可用资源
 
 - xhs://config - 查看服务器配置
+- xhs://metrics/publish - 查看发布各步骤耗时统计（p50/p95）
 - xhs://help - 查看此帮助信息
 
 ## 环境变量
@@ -758,6 +1003,23 @@ class MCPServer:
 """
             return prompt
     
+    def _prewarm_driver_pool(self) -> None:
+        """启动时在后台预热浏览器驱动池，首个发布任务无需等待浏览器启动"""
+        if not (self.config.enable_browser_pool and self.config.browser_pool_prewarm):
+            return
+        
+        if not self.xhs_client.cookie_manager.load_cookies():
+            logger.info("ℹ️ 未找到cookies，跳过浏览器预热")
+            return
+        
+        import threading
+        logger.info("🔥 后台预热浏览器驱动池...")
+        threading.Thread(
+            target=get_driver_pool(self.config).warm_up,
+            name="xhs-driver-pool-warmup",
+            daemon=True
+        ).start()
+    
     def _setup_signal_handlers(self) -> None:
         """设置信号处理器"""
         def signal_handler(signum, frame):
@@ -773,6 +1035,12 @@ class MCPServer:
                 if hasattr(self.xhs_client, 'browser_manager') and self.xhs_client.browser_manager.is_initialized:
                     logger.info("🧹 清理残留的浏览器实例...")
                     self.xhs_client.browser_manager.close_driver()
+                
+                # 关闭驱动池中的浏览器
+                get_driver_pool(self.config).close_all()
+                
+                # 关闭数据库连接
+                storage_manager.close()
             except Exception as cleanup_error:
                 logger.warning(f"⚠️ 清理资源时出错: {cleanup_error}")
             
@@ -813,7 +1081,8 @@ class MCPServer:
         # 工具已在__init__中注册
         logger.info(f"🎯 MCP工具列表:")
         for tool in ["test_connection", "smart_publish_note", "check_task_status", 
-                    "get_task_result", "login_xiaohongshu", "get_creator_data_analysis"]:
+                    "get_task_result", "get_publish_metrics", "login_xiaohongshu", "get_creator_data_analysis",
+                    "get_creator_trends"]:
             logger.info(f"   • {tool}")
         
         # 初始化数据采集（如果启用）
@@ -829,6 +1098,9 @@ class MCPServer:
         except Exception as e:
             logger.warning(f"⚠️ 数据采集功能初始化失败: {e}")
         
+        # 预热浏览器驱动池（如果启用）
+        self._prewarm_driver_pool()
+        
         # 使用stdio transport
         logger.info("🎯 MCP工具已注册，等待客户端连接...")
         self.mcp.run(transport="stdio")
@@ -877,8 +1149,10 @@ class MCPServer:
         logger.info("   • smart_publish_note - 发布小红书笔记（支持智能路径解析）")
         logger.info("   • check_task_status - 检查发布任务状态")
         logger.info("   • get_task_result - 获取已完成任务的结果")
+        logger.info("   • get_publish_metrics - 查看发布各步骤耗时统计")
         logger.info("   • login_xiaohongshu - 智能登录小红书")
         logger.info("   • get_creator_data_analysis - 获取创作者数据用于分析")
+        logger.info("   • get_creator_trends - 创作者数据趋势分析")
         
         logger.info("🔧 按 Ctrl+C 停止服务器")
         logger.info("💡 终止时的ASGI错误信息是正常现象，可以忽略")
@@ -894,6 +1168,9 @@ class MCPServer:
         except Exception as e:
             logger.warning(f"⚠️ 数据采集功能初始化失败: {e}")
         
+        # 预热浏览器驱动池（如果启用）
+        self._prewarm_driver_pool()
+        
         try:
             # 使用FastMCP内置的run方法，禁用uvicorn的日志以避免干扰MCP通信
             import logging
@@ -919,6 +1196,12 @@ class MCPServer:
                 if hasattr(self.xhs_client, 'browser_manager') and self.xhs_client.browser_manager.is_initialized:
                     logger.info("🧹 清理残留的浏览器实例...")
                     self.xhs_client.browser_manager.close_driver()
+                
+                # 关闭驱动池中的浏览器
+                get_driver_pool(self.config).close_all()
+                
+                # 关闭数据库连接
+                storage_manager.close()
             except Exception as cleanup_error:
                 logger.warning(f"⚠️ 清理资源时出错: {cleanup_error}")
             
@@ -9,13 +9,14 @@
 import os
 import json
 import time
-import pandas as pd
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
 from src.core.config import XHSConfig
 from src.core.browser import ChromeDriverManager
+from src.core.driver_pool import get_driver_pool
 from src.auth.cookie_manager import CookieManager
 # 数据收集函数会在需要时动态导入
 from src.utils.logger import get_logger
@@ -53,18 +54,9 @@ class ManualTools:
                 safe_print("💡 运行: python xhs_toolkit.py cookie save")
                 return False
             
-            # 初始化浏览器
-            self.browser_manager = ChromeDriverManager(self.config)
-            driver = self.browser_manager.create_driver()
-            cookies = self.cookie_manager.load_cookies()
-            
-            # 加载cookies到浏览器
-            driver.get("https://www.xiaohongshu.com")
-            for cookie in cookies:
-                try:
-                    driver.add_cookie(cookie)
-                except Exception as e:
-                    logger.warning(f"添加cookie失败: {e}")
+            # 从驱动池借出已加载cookies的浏览器
+            self.browser_manager = get_driver_pool(self.config).checkout()
+            driver = self.browser_manager.driver
             
             # 根据数据类型收集
             collectors = []
@@ -72,8 +64,8 @@ class ManualTools:
                 from src.xiaohongshu.data_collector.dashboard import collect_dashboard_data
                 collectors.append(("Dashboard", lambda dim: collect_dashboard_data(driver, save_data=True)))
             if data_type in ["content", "all"]:
-                from src.xiaohongshu.data_collector.content_analysis import collect_content_analysis_data
-                collectors.append(("Content", lambda dim: collect_content_analysis_data(driver, save_data=True)))
+                from src.xiaohongshu.data_collector.content_analysis import collect_content_analysis_data_sync
+                collectors.append(("Content", lambda dim: collect_content_analysis_data_sync(driver, save_data=True)))
             if data_type in ["fans", "all"]:
                 from src.xiaohongshu.data_collector.fans import collect_fans_data
                 collectors.append(("Fans", lambda dim: collect_fans_data(driver, save_data=True)))
@@ -122,7 +114,8 @@ class ManualTools:
             return False
         finally:
             if self.browser_manager:
-                self.browser_manager.close_driver()
+                get_driver_pool(self.config).checkin(self.browser_manager)
+                self.browser_manager = None
     
     def open_browser(self, page: str = "home", stay_open: bool = True) -> bool:
         """
@@ -210,13 +203,16 @@ class ManualTools:
             if not stay_open and self.browser_manager:
                 self.browser_manager.close_driver()
     
-    def export_data(self, format: str = "excel", output_dir: Optional[str] = None) -> bool:
+    def export_data(self, format: str = "excel", output_dir: Optional[str] = None,
+                    start_date: Optional[str] = None, end_date: Optional[str] = None) -> bool:
         """
-        导出数据到指定格式
+        流式导出数据到指定格式
         
         Args:
-            format: 导出格式 (excel/json)
+            format: 导出格式 (excel/json/jsonl/parquet)
             output_dir: 输出目录
+            start_date: 起始日期 YYYY-MM-DD
+            end_date: 结束日期 YYYY-MM-DD
             
         Returns:
             是否成功
@@ -224,147 +220,133 @@ class ManualTools:
         safe_print(f"📤 导出数据为{format}格式")
         
         try:
-            # 确定数据目录
-            data_dir = Path(self.config.data_path) / "creator_db"
-            if not data_dir.exists():
-                safe_print("❌ 未找到数据文件，请先收集数据")
+            from src.data.exporter import DataExporter, EXPORT_FORMATS, EXPORT_NAMES
+            from src.data.storage_manager import get_storage_manager
+            
+            if format not in EXPORT_FORMATS:
+                safe_print(f"❌ 不支持的格式: {format}")
+                safe_print(f"💡 支持的格式: {', '.join(EXPORT_FORMATS)}")
                 return False
             
+            # 等待尚未落盘的数据写入后再导出
+            storage_manager = get_storage_manager()
+            storage_manager.flush(timeout=30)
+            storage = storage_manager.get_csv_storage()
+            
             # 确定输出目录
             if output_dir:
                 output_path = Path(output_dir)
             else:
                 output_path = Path.cwd() / "exports"
-            output_path.mkdir(parents=True, exist_ok=True)
             
             # 时间戳
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
             if format == "excel":
-                # 创建Excel文件
-                excel_file = output_path / f"xhs_data_{timestamp}.xlsx"
-                with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
-                    # 导出各类数据
-                    data_files = {
-                        "Dashboard": data_dir / "dashboard_data.csv",
-                        "Content": data_dir / "content_analysis_data.csv",
-                        "Fans": data_dir / "fans_data.csv"
-                    }
-                    
-                    exported_sheets = []
-                    for sheet_name, csv_file in data_files.items():
-                        if csv_file.exists():
-                            df = pd.read_csv(csv_file)
-                            df.to_excel(writer, sheet_name=sheet_name, index=False)
-                            exported_sheets.append(sheet_name)
-                            safe_print(f"  ✅ 导出{sheet_name}数据")
-                    
-                    if exported_sheets:
-                        safe_print(f"\n✅ 数据已导出到: {excel_file}")
-                        return True
-                    else:
-                        safe_print("❌ 没有找到可导出的数据")
-                        return False
+                target = output_path / f"xhs_data_{timestamp}.xlsx"
+            else:
+                target = output_path / f"xhs_data_{timestamp}"
             
-            elif format == "json":
-                # 导出为JSON格式
-                json_dir = output_path / f"xhs_data_{timestamp}"
-                json_dir.mkdir(exist_ok=True)
-                
-                data_files = {
-                    "dashboard": data_dir / "dashboard_data.csv",
-                    "content": data_dir / "content_analysis_data.csv",
-                    "fans": data_dir / "fans_data.csv"
-                }
-                
-                exported_files = []
-                for name, csv_file in data_files.items():
-                    if csv_file.exists():
-                        df = pd.read_csv(csv_file)
-                        json_file = json_dir / f"{name}.json"
-                        df.to_json(json_file, orient='records', force_ascii=False, indent=2)
-                        exported_files.append(name)
-                        safe_print(f"  ✅ 导出{name}数据")
-                
-                if exported_files:
-                    safe_print(f"\n✅ 数据已导出到: {json_dir}")
-                    return True
-                else:
-                    safe_print("❌ 没有找到可导出的数据")
-                    return False
+            # 进度输出（三种数据并行导出，输出加锁避免交错）
+            progress_lock = threading.Lock()
             
-            else:
-                safe_print(f"❌ 不支持的格式: {format}")
-                safe_print("💡 支持的格式: excel, json")
+            def report_progress(data_type: str, rows: int) -> None:
+                with progress_lock:
+                    safe_print(f"  ⏳ {EXPORT_NAMES[data_type]}: 已导出 {rows} 行")
+            
+            exporter = DataExporter(
+                storage,
+                progress=report_progress,
+                headers=getattr(storage, 'field_chinese_mapping', None)
+            )
+            started = time.time()
+            counts = exporter.export(format, target, start_date=start_date, end_date=end_date)
+            
+            if not counts:
+                safe_print("❌ 没有找到可导出的数据")
                 return False
+            
+            for data_type, rows in counts.items():
+                safe_print(f"  ✅ 导出{EXPORT_NAMES[data_type]}数据: {rows} 行")
+            safe_print(f"\n✅ 数据已导出到: {target}（耗时 {time.time() - started:.1f}秒）")
+            return True
                 
         except Exception as e:
             safe_print(f"❌ 导出数据失败: {e}")
             logger.exception("导出数据异常")
             return False
     
-    def analyze_trends(self) -> bool:
+    def analyze_trends(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                       output_json: bool = False) -> bool:
         """
-        分析数据趋势
+        分析数据趋势（滚动平均、日变化、笔记增长、互动率和异常）
         
+        Args:
+            start_date: 起始日期 YYYY-MM-DD
+            end_date: 结束日期 YYYY-MM-DD
+            output_json: 以JSON格式输出完整分析结果
+            
         Returns:
             是否成功
         """
         safe_print("📈 分析数据趋势")
         
         try:
-            # 读取数据
-            data_dir = Path(self.config.data_path) / "creator_db"
+            from src.data.storage_manager import get_storage_manager
+            from src.data.trend_analytics import analyze_trends
+            
+            storage_manager = get_storage_manager()
+            storage_manager.flush(timeout=30)
+            frames = {
+                data_type: storage_manager.read_frame(data_type, start_date, end_date)
+                for data_type in ('dashboard', 'fans', 'content_analysis')
+            }
+            trends = analyze_trends(frames)
+            
+            if output_json:
+                safe_print(json.dumps(trends, ensure_ascii=False, indent=2))
+                return True
             
-            # Dashboard数据分析
-            dashboard_file = data_dir / "dashboard_data.csv"
-            if dashboard_file.exists():
-                safe_print("\n📊 Dashboard数据分析:")
-                df = pd.read_csv(dashboard_file)
-                if not df.empty:
-                    latest = df.iloc[-1]
-                    safe_print(f"  最新数据时间: {latest['采集时间']}")
-                    safe_print(f"  时间维度: {latest['时间维度']}")
-                    safe_print(f"  总浏览量: {latest['浏览']}")
-                    safe_print(f"  总点赞量: {latest['点赞']}")
-                    safe_print(f"  互动率: {latest['互动']}")
-                    
-                    # 计算趋势
-                    if len(df) > 1:
-                        prev = df.iloc[-2]
-                        view_change = int(latest['浏览']) - int(prev['浏览'])
-                        like_change = int(latest['点赞']) - int(prev['点赞'])
-                        safe_print(f"  浏览量变化: {'+' if view_change >= 0 else ''}{view_change}")
-                        safe_print(f"  点赞量变化: {'+' if like_change >= 0 else ''}{like_change}")
-            
-            # 粉丝数据分析
-            fans_file = data_dir / "fans_data.csv"
-            if fans_file.exists():
-                safe_print("\n👥 粉丝数据分析:")
-                df = pd.read_csv(fans_file)
-                if not df.empty:
-                    latest = df.iloc[-1]
-                    safe_print(f"  总粉丝数: {latest['总粉丝数']}")
-                    safe_print(f"  新增粉丝: {latest['新增粉丝']}")
-                    safe_print(f"  流失粉丝: {latest['流失粉丝']}")
-                    safe_print(f"  净增长: {int(latest['新增粉丝']) - int(latest['流失粉丝'])}")
-            
-            # 内容数据分析
-            content_file = data_dir / "content_analysis_data.csv"
-            if content_file.exists():
-                safe_print("\n📝 内容数据分析:")
-                df = pd.read_csv(content_file)
-                if not df.empty:
-                    safe_print(f"  总笔记数: {len(df)}")
-                    safe_print(f"  平均浏览量: {df['浏览'].astype(int).mean():.0f}")
-                    safe_print(f"  平均点赞量: {df['点赞'].astype(int).mean():.0f}")
-                    
-                    # 找出表现最好的笔记
-                    best_note = df.loc[df['浏览'].astype(int).idxmax()]
-                    safe_print(f"\n  🏆 表现最佳笔记:")
-                    safe_print(f"    标题: {best_note['标题']}")
-                    safe_print(f"    浏览: {best_note['浏览']}")
-                    safe_print(f"    点赞: {best_note['点赞']}")
+            metric_names = {
+                'views': '浏览量', 'likes': '点赞', 'interactions': '互动',
+                'total_fans': '总粉丝数', 'new_fans': '新增粉丝'
+            }
+            sections = (('dashboard', '📊 Dashboard数据趋势'), ('fans', '👥 粉丝数据趋势'))
+            for data_type, heading in sections:
+                summary = trends[data_type]
+                if not summary['days']:
+                    continue
+                safe_print(f"\n{heading}（{summary['first_date']} ~ {summary['last_date']}，{summary['days']}天）:")
+                for dimension, info in summary['dimensions'].items():
+                    safe_print(f"  [{dimension}] {info['date']}")
+                    for metric, values in info['metrics'].items():
+                        if metric not in metric_names:
+                            continue
+                        delta = values['delta']
+                        change = f"{'+' if delta >= 0 else ''}{delta:.0f}" if delta is not None else "-"
+                        safe_print(f"    {metric_names[metric]}: {values['value']}（日变化 {change}，"
+                                   f"7天均值 {values['avg_7d']}，30天均值 {values['avg_30d']}）")
+                    if info.get('engagement_rate') is not None:
+                        safe_print(f"    互动率: {info['engagement_rate']:.2%}")
+                for anomaly in summary['anomalies'][:5]:
+                    safe_print(f"  ⚠️ 异常: {anomaly['date']} [{anomaly['dimension']}] "
+                               f"{metric_names.get(anomaly['metric'], anomaly['metric'])} 变化 {anomaly['delta']}")
+            
+            content = trends['content_analysis']
+            if content['days']:
+                safe_print(f"\n📝 内容数据趋势（{content['notes']} 篇笔记）:")
+                safe_print("  🚀 浏览量增长最快:")
+                for note in content['top_growth']:
+                    safe_print(f"    {note['title']}: {note['views']}（{note['views_delta'] or 0:+.0f}）")
+                safe_print("  💬 互动率最高:")
+                for note in content['top_engagement']:
+                    safe_print(f"    {note['title']}: {note['engagement_rate']:.2%}")
+                for anomaly in content['anomalies'][:5]:
+                    safe_print(f"  ⚠️ 异常: {anomaly['date']} {anomaly['title']} 浏览量变化 {anomaly['delta']}")
+            
+            if not any(trends[data_type]['days'] for data_type in trends):
+                safe_print("❌ 没有找到可分析的数据")
+                safe_print("💡 运行: python xhs_toolkit.py manual collect")
+                return False
             
             return True
             
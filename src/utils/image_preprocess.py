@@ -0,0 +1,172 @@
+"""
+图片上传前预处理
+
+手机拍摄的原图动辄数MB，直接上传既慢又占带宽。上传前（可选）对图片做一次处理：
+- 按EXIF方向信息旋转为正确方向
+- 长边缩小到平台可用的最大分辨率
+- 按目标质量重新压缩，可选限制文件大小
+- 去除EXIF等元数据（包括拍摄位置）
+
+处理结果按原文件和参数的哈希命名，相同图片再次发布时直接复用。
+多张图片在进程池中并行处理（图片编码是CPU密集型操作）。需要安装可选依赖 Pillow
+"""
+
+import asyncio
+import atexit
+import hashlib
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import List, Optional
+
+from .logger import get_logger
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # 可选依赖
+    Image = ImageOps = None
+
+logger = get_logger(__name__)
+
+# 不处理的格式（动图重新编码会丢失动画）
+SKIP_EXTENSIONS = {'.gif'}
+
+# 限制文件大小时的最低压缩质量
+MIN_QUALITY = 50
+
+
+@dataclass(frozen=True)
+class PreprocessSettings:
+    """预处理参数"""
+    max_side: int = 2560
+    quality: int = 85
+    max_bytes: int = 0  # 0表示不限制文件大小
+
+    @classmethod
+    def from_env(cls) -> "PreprocessSettings":
+        """从环境变量读取参数"""
+        return cls(
+            max_side=int(os.getenv('IMAGE_MAX_SIDE', '2560')),
+            quality=int(os.getenv('IMAGE_QUALITY', '85')),
+            max_bytes=int(float(os.getenv('IMAGE_MAX_KB', '0')) * 1024)
+        )
+
+
+def is_available() -> bool:
+    """是否已安装Pillow"""
+    return Image is not None
+
+
+def preprocess_image(src: str, output_dir: str, settings: PreprocessSettings) -> str:
+    """
+    处理单张图片（在进程池中执行，因此是模块级函数）
+
+    Args:
+        src: 原图路径
+        output_dir: 输出目录
+        settings: 预处理参数
+
+    Returns:
+        处理后的图片路径；无需处理、处理后反而更大或处理失败时返回原图路径
+    """
+    src_path = Path(src)
+    if src_path.suffix.lower() in SKIP_EXTENSIONS:
+        return src
+
+    stat = src_path.stat()
+    key = hashlib.sha256(f"{src_path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}|{sorted(asdict(settings).items())}"
+                         .encode('utf-8')).hexdigest()[:16]
+
+    with Image.open(src_path) as original:
+        has_metadata = bool(original.info.get('exif') or original.getexif())
+        has_alpha = original.mode in ('RGBA', 'LA') or (original.mode == 'P' and 'transparency' in original.info)
+        ext = '.png' if has_alpha else '.jpg'
+        target = Path(output_dir) / f"{src_path.stem}_{key}{ext}"
+        if target.exists():
+            return str(target)
+
+        image = ImageOps.exif_transpose(original)
+        resized = max(image.size) > settings.max_side
+        if resized:
+            image.thumbnail((settings.max_side, settings.max_side), Image.LANCZOS)
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_target = target.with_name(f".{target.name}.tmp")
+        if has_alpha:
+            image.save(tmp_target, format='PNG', optimize=True)
+        else:
+            image = image.convert('RGB')
+            quality = settings.quality
+            while True:
+                image.save(tmp_target, format='JPEG', quality=quality, optimize=True, progressive=True)
+                if not settings.max_bytes or tmp_target.stat().st_size <= settings.max_bytes or quality <= MIN_QUALITY:
+                    break
+                quality = max(MIN_QUALITY, quality - 10)
+
+    # 尺寸合适、没有元数据时只有重新压缩一项收益，压缩后没有变小就沿用原图
+    if not (resized or has_metadata) and tmp_target.stat().st_size >= stat.st_size:
+        tmp_target.unlink()
+        return src
+
+    os.replace(tmp_target, target)
+    return str(target)
+
+
+# 全局进程池（首次处理多张图片时创建，进程退出时关闭）
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """获取预处理进程池"""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.getenv('IMAGE_PREPROCESS_WORKERS', '0')) or min(4, os.cpu_count() or 1)
+            _executor = ProcessPoolExecutor(max_workers=workers)
+            atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+        return _executor
+
+
+async def preprocess_images(paths: List[str], output_dir: str,
+                            settings: Optional[PreprocessSettings] = None) -> List[str]:
+    """
+    预处理多张图片，返回顺序与输入一致
+
+    单张图片在线程中处理，多张图片在进程池中并行处理；单张失败时沿用原图
+
+    Args:
+        paths: 原图路径列表
+        output_dir: 输出目录
+        settings: 预处理参数，默认从环境变量读取
+
+    Returns:
+        处理后的图片路径列表
+    """
+    if not paths:
+        return []
+    settings = settings or PreprocessSettings.from_env()
+    loop = asyncio.get_running_loop()
+
+    if len(paths) == 1:
+        futures = [asyncio.to_thread(preprocess_image, paths[0], output_dir, settings)]
+    else:
+        executor = _get_executor()
+        futures = [loop.run_in_executor(executor, preprocess_image, path, output_dir, settings) for path in paths]
+
+    results = await asyncio.gather(*futures, return_exceptions=True)
+
+    processed = []
+    for path, result in zip(paths, results):
+        if isinstance(result, Exception):
+            logger.warning(f"⚠️ 图片预处理失败，使用原图: {path}, 错误: {result}")
+            processed.append(path)
+        else:
+            if result != path:
+                logger.info(f"🗜️ 图片已预处理: {Path(path).name} {os.path.getsize(path) // 1024}KB -> "
+                            f"{os.path.getsize(result) // 1024}KB")
+            processed.append(result)
+    return processed
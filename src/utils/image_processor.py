@@ -8,6 +8,7 @@
 
 import os
 import asyncio
+import hashlib
 import aiohttp
 import tempfile
 from pathlib import Path
@@ -16,20 +17,30 @@ import uuid
 import json
 
 from .logger import get_logger
+from .media_cache import MediaCache, get_media_cache
+from . import image_preprocess
 
 logger = get_logger(__name__)
 
+# 下载失败时重试的HTTP状态码（限流和服务端临时错误）
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
 
 class ImageProcessor:
     """图片处理器，支持本地路径和URL下载"""
     
-    def __init__(self, temp_dir: str = None, base_dir: str = None):
+    def __init__(self, temp_dir: str = None, base_dir: str = None,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 media_cache: Optional[MediaCache] = None, preprocess: Optional[bool] = None):
         """
         初始化图片处理器
         
         Args:
             temp_dir: 临时文件目录路径
             base_dir: 用于解析相对路径的基础目录
+            session: 复用的HTTP会话，默认每次处理时创建一个共享连接池的会话
+            media_cache: 下载缓存，默认使用全局媒体缓存（MEDIA_CACHE=false时不缓存）
+            preprocess: 上传前是否预处理图片（纠正方向、缩小、压缩、去除元数据），默认读取IMAGE_PREPROCESS
         """
         # 设置临时目录
         if temp_dir:
@@ -43,6 +54,22 @@ class ImageProcessor:
         # 设置基础目录（用于相对路径解析）
         self.base_dir = Path(base_dir) if base_dir else Path.cwd()
         
+        # 下载配置：总并发数、同一域名的最大连接数、失败重试次数
+        self.session = session
+        self.max_concurrency = max(1, int(os.getenv('IMAGE_DOWNLOAD_CONCURRENCY', '4')))
+        self.per_host_limit = max(1, int(os.getenv('IMAGE_DOWNLOAD_PER_HOST', '2')))
+        self.max_retries = max(0, int(os.getenv('IMAGE_DOWNLOAD_RETRIES', '2')))
+        self.chunk_size = 64 * 1024
+        self.media_cache = media_cache if media_cache is not None else get_media_cache()
+        
+        # 上传前预处理（需要Pillow）
+        if preprocess is None:
+            preprocess = os.getenv('IMAGE_PREPROCESS', 'false').lower() == 'true'
+        if preprocess and not image_preprocess.is_available():
+            logger.warning("⚠️ 图片预处理需要安装Pillow: pip install Pillow，将直接上传原图")
+            preprocess = False
+        self.preprocess = preprocess
+        
         logger.info(f"图片处理器初始化，临时目录: {self.temp_dir}")
         logger.info(f"基础目录（用于相对路径）: {self.base_dir}")
     
@@ -73,25 +100,48 @@ class ImageProcessor:
         images_list = self._normalize_to_list(images_input)
         logger.info(f"📦 标准化后的图片列表: {images_list}")
         
-        # 处理每个图片
+        # 并发处理所有图片（网络图片共享一个连接池），结果按输入顺序返回
         local_paths = []
         failed_images = []
         
-        for idx, img in enumerate(images_list):
-            try:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        has_urls = any(isinstance(img, str) and img.strip().startswith(('http://', 'https://')) for img in images_list)
+        session = self.session
+        owns_session = session is None and has_urls
+        if owns_session:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host_limit),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        
+        async def process(idx: int, img: str) -> Optional[str]:
+            async with semaphore:
                 logger.info(f"🎯 处理第 {idx+1}/{len(images_list)} 张图片: {img}")
-                local_path = await self._process_single_image(img, idx)
-                if local_path:
-                    local_paths.append(local_path)
-                    logger.info(f"✅ 处理图片成功 [{idx+1}/{len(images_list)}]: {local_path}")
-                else:
-                    logger.warning(f"⚠️ 处理图片返回None [{idx+1}/{len(images_list)}]: {img}")
-                    failed_images.append(img)
-            except Exception as e:
-                logger.error(f"❌ 处理图片失败 [{idx+1}/{len(images_list)}]: {e}")
+                return await self._process_single_image(img, idx, session)
+        
+        try:
+            results = await asyncio.gather(
+                *(process(idx, img) for idx, img in enumerate(images_list)),
+                return_exceptions=True
+            )
+        finally:
+            if owns_session:
+                await session.close()
+        
+        for idx, (img, result) in enumerate(zip(images_list, results)):
+            if isinstance(result, Exception):
+                logger.error(f"❌ 处理图片失败 [{idx+1}/{len(images_list)}]: {result}")
                 logger.error(f"🔍 失败的图片: {img}")
-                failed_images.append(f"{img} (错误: {str(e)})")
-                continue
+                failed_images.append(f"{img} (错误: {str(result)})")
+            elif result:
+                local_paths.append(result)
+                logger.info(f"✅ 处理图片成功 [{idx+1}/{len(images_list)}]: {result}")
+            else:
+                logger.warning(f"⚠️ 处理图片返回None [{idx+1}/{len(images_list)}]: {img}")
+                failed_images.append(img)
+        
+        if self.preprocess and local_paths:
+            local_paths = await image_preprocess.preprocess_images(local_paths, str(self.temp_dir / 'processed'))
         
         logger.info(f"📸 图片处理完成，共处理 {len(local_paths)}/{len(images_list)} 张")
         logger.info(f"📦 最终返回的本地路径: {local_paths}")
@@ -158,13 +208,15 @@ class ImageProcessor:
             except:
                 return []
     
-    async def _process_single_image(self, img_input: str, index: int) -> Optional[str]:
+    async def _process_single_image(self, img_input: str, index: int,
+                                    session: Optional[aiohttp.ClientSession] = None) -> Optional[str]:
         """
         处理单个图片输入
         
         Args:
             img_input: 图片输入（字符串）
             index: 图片索引
+            session: 下载网络图片使用的HTTP会话
             
         Returns:
             Optional[str]: 本地文件路径，失败返回None
@@ -181,7 +233,7 @@ class ImageProcessor:
         if img_input.startswith(('http://', 'https://')):
             # 网络地址
             logger.info(f"🌐 检测到网络图片URL: {img_input}")
-            return await self._download_from_url(img_input, index)
+            return await self._download_from_url(img_input, index, session)
         
         # 尝试解析本地路径
         # 1. 首先尝试原始路径
@@ -215,22 +267,53 @@ class ImageProcessor:
         
         raise FileNotFoundError(f"无法找到图片文件: {img_input}")
     
-    async def _download_from_url(self, url: str, index: int) -> Optional[str]:
+    async def _download_from_url(self, url: str, index: int,
+                                 session: Optional[aiohttp.ClientSession] = None) -> Optional[str]:
         """
-        下载网络图片到本地
+        下载网络图片到本地（优先使用下载缓存；限流和服务端错误、连接错误、超时时按指数退避重试）
         
         Args:
             url: 图片URL
             index: 图片索引
+            session: HTTP会话，未提供时临时创建
             
         Returns:
             Optional[str]: 本地文件路径，失败返回None
         """
-        try:
-            logger.info(f"⬇️ 开始下载图片: {url}")
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+        # 新鲜期内的缓存直接使用，不发起网络请求
+        cached = self.media_cache.lookup(url) if self.media_cache else None
+        if cached and cached['fresh']:
+            linked = self._link_cached(cached, index)
+            if linked:
+                logger.info(f"📦 使用缓存图片: {url}")
+                return linked
+            # 缓存文件在查找之后被淘汰，重新下载
+            cached = None
+        
+        if session is None:
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as own_session:
+                return await self._download_from_url(url, index, own_session)
+        
+        # 有过期的缓存时发送条件请求
+        headers = self.media_cache.conditional_headers(cached) if cached else {}
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                logger.info(f"⬇️ 开始下载图片: {url}" + (f"（第{attempt + 1}次尝试）" if attempt else ""))
+                
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304 and cached:
+                        self.media_cache.revalidated(url)
+                        linked = self._link_cached(cached, index)
+                        if linked:
+                            logger.info(f"📦 图片未修改，使用缓存: {url}")
+                            return linked
+                        # 缓存文件在条件请求期间被淘汰（link已移除该URL的缓存记录），不带条件重新下载
+                        return await self._download_from_url(url, index, session)
+                    if response.status in RETRYABLE_STATUS and attempt < self.max_retries:
+                        logger.warning(f"⚠️ 下载图片暂时失败: {url}, 状态码: {response.status}，稍后重试")
+                        await asyncio.sleep(0.5 * 2 ** attempt)
+                        continue
                     if response.status != 200:
                         logger.error(f"❌ 下载图片失败: {url}, 状态码: {response.status}")
                         return None
@@ -243,21 +326,52 @@ class ImageProcessor:
                         url_path = Path(url.split('?')[0])
                         ext = url_path.suffix or '.jpg'
                     
-                    # 生成唯一文件名
-                    filename = f"download_{index}_{uuid.uuid4().hex[:8]}{ext}"
-                    filepath = self.temp_dir / filename
-                    
-                    # 保存文件
-                    content = await response.read()
-                    filepath.write_bytes(content)
+                    # 分块写入临时文件并计算内容哈希，下载完整后再改名，中断时不会留下不完整的图片
+                    part_path = self.temp_dir / f".download_{index}_{uuid.uuid4().hex[:8]}.part"
+                    digest = hashlib.sha256()
+                    try:
+                        with open(part_path, 'wb') as f:
+                            async for chunk in response.content.iter_chunked(self.chunk_size):
+                                digest.update(chunk)
+                                f.write(chunk)
+                        
+                        sha256 = digest.hexdigest()
+                        filepath = self._download_path(index, sha256, ext)
+                        if self.media_cache:
+                            self.media_cache.store(url, part_path, sha256, ext,
+                                                   etag=response.headers.get('ETag'),
+                                                   last_modified=response.headers.get('Last-Modified'),
+                                                   link_to=filepath)
+                        else:
+                            os.replace(part_path, filepath)
+                    finally:
+                        if part_path.exists():
+                            part_path.unlink()
                     
                     logger.info(f"✅ 下载图片成功: {url} -> {filepath}")
                     return str(filepath)
                     
-        except asyncio.TimeoutError:
-            raise Exception(f"下载图片超时: {url}")
-        except Exception as e:
-            raise Exception(f"下载图片失败: {url}, 错误: {str(e)}")
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                if attempt < self.max_retries:
+                    logger.warning(f"⚠️ 下载图片出错: {url}, 错误: {e}，稍后重试")
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+                    continue
+                if isinstance(e, asyncio.TimeoutError):
+                    raise Exception(f"下载图片超时: {url}")
+                raise Exception(f"下载图片失败: {url}, 错误: {str(e)}")
+            except Exception as e:
+                raise Exception(f"下载图片失败: {url}, 错误: {str(e)}")
+        
+        return None
+    
+    def _link_cached(self, cached: dict, index: int) -> Optional[str]:
+        """把缓存图片硬链接到临时目录，返回交给上传流程的路径，缓存文件已被淘汰时返回None"""
+        filepath = self.media_cache.link(cached, self._download_path(index, cached['sha256'], cached['path'].suffix))
+        return str(filepath) if filepath else None
+    
+    def _download_path(self, index: int, sha256: str, ext: str) -> Path:
+        """交给上传流程的文件路径（带随机后缀，并发发布同一图片时不会互相覆盖或删除）"""
+        return self.temp_dir / f"download_{index}_{sha256[:12]}_{uuid.uuid4().hex[:8]}{ext}"
     
     def _get_extension_from_content_type(self, content_type: str) -> str:
         """根据content-type获取文件扩展名"""
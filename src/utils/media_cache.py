@@ -0,0 +1,251 @@
+"""
+网络图片内容寻址缓存
+
+同一批图片URL经常在多次发布尝试和失败重试中重复出现。
+下载过的文件按内容的SHA-256保存（相同内容只存一份），另按URL记录ETag/Last-Modified：
+- 在新鲜期内再次使用同一URL时直接返回缓存文件，不发起任何网络请求
+- 超过新鲜期后发送条件请求（If-None-Match / If-Modified-Since），304时继续使用缓存
+- 缓存总大小有上限，超出时按最近最少使用淘汰
+- 交给上传流程的是缓存文件在临时目录中的硬链接，缓存淘汰不影响正在上传的文件
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class MediaCache:
+    """按内容哈希存储、按URL索引的下载缓存（JSON索引持久化，线程安全）"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024, fresh_seconds: float = 3600):
+        """
+        初始化媒体缓存
+
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存文件总大小上限（字节）
+            fresh_seconds: 新鲜期（秒），期内再次使用同一URL时不重新验证
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / 'objects'
+        self.index_file = self.cache_dir / 'index.json'
+        self.max_bytes = max_bytes
+        self.fresh_seconds = fresh_seconds
+        self._lock = threading.Lock()
+        # urls: URL -> {sha256, etag, last_modified, validated_at}
+        # objects: sha256 -> {ext, size, last_access}
+        self._index: Dict[str, Dict[str, Any]] = {'urls': {}, 'objects': {}}
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        查找URL对应的缓存条目
+
+        Returns:
+            {sha256, etag, last_modified, fresh, path}，没有缓存或缓存文件已丢失时返回None
+        """
+        with self._lock:
+            entry = self._index['urls'].get(url)
+            if entry is None:
+                return None
+            obj = self._index['objects'].get(entry['sha256'])
+            path = self._object_path(entry['sha256'], obj['ext']) if obj else None
+            if path is None or not path.exists():
+                self._index['urls'].pop(url, None)
+                return None
+            return {
+                **entry,
+                'path': path,
+                'fresh': time.time() - entry.get('validated_at', 0) < self.fresh_seconds
+            }
+
+    def conditional_headers(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """缓存条目对应的条件请求头"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, url: str) -> None:
+        """服务器返回304：缓存仍然有效，重新计算新鲜期"""
+        with self._lock:
+            entry = self._index['urls'].get(url)
+            if entry is not None:
+                entry['validated_at'] = time.time()
+        self._save()
+
+    def store(self, url: str, file_path: Path, sha256: str, ext: str,
+              etag: Optional[str] = None, last_modified: Optional[str] = None,
+              link_to: Optional[Path] = None) -> Path:
+        """
+        把下载完成的文件放入缓存（相同内容已存在时直接丢弃新文件）
+
+        Args:
+            url: 图片URL
+            file_path: 下载完成的文件（会被移动或删除）
+            sha256: 文件内容的SHA-256
+            ext: 文件扩展名
+            etag: 响应的ETag
+            last_modified: 响应的Last-Modified
+            link_to: 同时在该路径创建硬链接（在锁内完成，不会被其他线程的淘汰打断）
+
+        Returns:
+            缓存文件路径
+        """
+        with self._lock:
+            object_path = self._object_path(sha256, ext)
+            if object_path.exists():
+                file_path.unlink()
+            else:
+                object_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(file_path, object_path)
+
+            self._index['objects'][sha256] = {
+                'ext': ext,
+                'size': object_path.stat().st_size,
+                'last_access': time.time()
+            }
+            self._index['urls'][url] = {
+                'sha256': sha256,
+                'etag': etag,
+                'last_modified': last_modified,
+                'validated_at': time.time()
+            }
+            self._evict(keep=sha256)
+            if link_to is not None:
+                self._link_object(object_path, link_to)
+
+        self._save()
+        return object_path
+
+    def link(self, entry_or_sha: Any, target: Path) -> Optional[Path]:
+        """
+        在target创建缓存文件的硬链接（跨文件系统时复制），并记录最近使用时间
+
+        在锁内完成，lookup之后缓存文件被其他线程淘汰时返回None（调用方重新下载）
+
+        Args:
+            entry_or_sha: lookup返回的条目或SHA-256
+            target: 目标文件路径
+
+        Returns:
+            target，缓存文件已不存在时返回None
+        """
+        sha256 = entry_or_sha['sha256'] if isinstance(entry_or_sha, dict) else entry_or_sha
+        with self._lock:
+            obj = self._index['objects'].get(sha256)
+            object_path = self._object_path(sha256, obj['ext']) if obj else None
+            if object_path is None or not object_path.exists():
+                self._forget(sha256)
+                return None
+            obj['last_access'] = time.time()
+            return self._link_object(object_path, target)
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计"""
+        with self._lock:
+            return {
+                'urls': len(self._index['urls']),
+                'objects': len(self._index['objects']),
+                'bytes': sum(obj['size'] for obj in self._index['objects'].values()),
+                'max_bytes': self.max_bytes
+            }
+
+    def _object_path(self, sha256: str, ext: str) -> Path:
+        """内容哈希对应的缓存文件路径（按前两位分目录）"""
+        return self.objects_dir / sha256[:2] / f"{sha256}{ext}"
+
+    @staticmethod
+    def _link_object(object_path: Path, target: Path) -> Path:
+        """创建缓存文件的硬链接，跨文件系统时复制（调用方持有锁）"""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            target.unlink()
+        try:
+            os.link(object_path, target)
+        except OSError:
+            shutil.copyfile(object_path, target)
+        return target
+
+    def _forget(self, sha256: str) -> None:
+        """从索引中移除缓存文件及指向它的URL（调用方持有锁）"""
+        self._index['objects'].pop(sha256, None)
+        for url in [url for url, entry in self._index['urls'].items() if entry['sha256'] == sha256]:
+            del self._index['urls'][url]
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """超过大小上限时按最近使用时间淘汰（调用方持有锁）"""
+        objects = self._index['objects']
+        total = sum(obj['size'] for obj in objects.values())
+        for sha256, obj in sorted(objects.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            if sha256 == keep:
+                continue
+            path = self._object_path(sha256, obj['ext'])
+            if path.exists():
+                path.unlink()
+            self._forget(sha256)
+            total -= obj['size']
+            logger.debug(f"🧹 淘汰缓存图片: {sha256[:12]}")
+
+    def _save(self) -> None:
+        """保存索引（先写临时文件再替换）"""
+        with self._lock:
+            data = json.dumps(self._index)
+        try:
+            tmp_file = self.index_file.with_suffix('.tmp')
+            tmp_file.write_text(data, encoding='utf-8')
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            logger.warning(f"⚠️ 保存图片缓存索引失败: {e}")
+
+    def _load(self) -> None:
+        """加载索引，文件损坏时从空缓存开始"""
+        if not self.index_file.exists():
+            return
+        try:
+            index = json.loads(self.index_file.read_text(encoding='utf-8'))
+            self._index = {'urls': index.get('urls', {}), 'objects': index.get('objects', {})}
+            logger.debug(f"📂 加载图片缓存索引: {len(self._index['objects'])} 个文件")
+        except Exception as e:
+            logger.warning(f"⚠️ 读取图片缓存索引失败，将重新下载: {e}")
+
+
+# 全局媒体缓存实例（首次使用时按环境变量创建）
+_media_cache: Optional[MediaCache] = None
+_media_cache_lock = threading.Lock()
+
+
+def get_media_cache() -> Optional[MediaCache]:
+    """
+    获取全局媒体缓存实例
+
+    Returns:
+        MediaCache，MEDIA_CACHE=false时返回None
+    """
+    global _media_cache
+
+    if os.getenv('MEDIA_CACHE', 'true').lower() != 'true':
+        return None
+
+    with _media_cache_lock:
+        if _media_cache is None:
+            cache_dir = os.getenv('MEDIA_CACHE_DIR') or os.path.join(os.getenv('DATA_STORAGE_PATH', 'data'), 'cache', 'media')
+            _media_cache = MediaCache(
+                cache_dir,
+                max_bytes=int(float(os.getenv('MEDIA_CACHE_MAX_MB', '512')) * 1024 * 1024),
+                fresh_seconds=float(os.getenv('MEDIA_CACHE_FRESH_SECONDS', '3600'))
+            )
+        return _media_cache
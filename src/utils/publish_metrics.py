@@ -0,0 +1,170 @@
+"""
+小红书工具包发布耗时统计模块
+
+记录发布流程中每个步骤（导航、切换模式、上传、填写标题/内容、话题、可见范围、提交）的耗时，
+并按步骤汇总最近若干次发布的p50/p95分布，用于定位页面改版后变慢的Selenium步骤
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Deque, Dict, List, Optional, Any
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# 发布流程步骤名称及中文说明，按执行顺序排列
+PUBLISH_STEPS = {
+    "navigate": "访问发布页",
+    "mode_switch": "切换发布模式",
+    "upload": "上传文件",
+    "title_fill": "填写标题",
+    "content_fill": "填写内容",
+    "topics": "添加话题",
+    "visibility": "设置可见范围",
+    "submit": "提交发布"
+}
+
+
+@dataclass
+class StepSpan:
+    """单个步骤的耗时记录"""
+    name: str
+    started_at: float
+    duration: float = 0.0
+    success: bool = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        data = asdict(self)
+        data["duration"] = round(self.duration, 3)
+        data["label"] = PUBLISH_STEPS.get(self.name, self.name)
+        return data
+
+
+class PublishSpanRecorder:
+    """单次发布的步骤耗时记录器"""
+
+    def __init__(self):
+        self.spans: List[StepSpan] = []
+        self._open: Dict[str, float] = {}
+
+    def start(self, name: str) -> None:
+        """开始记录步骤"""
+        self._open[name] = time.monotonic()
+
+    def finish(self, name: str, success: bool = True) -> Optional[StepSpan]:
+        """结束记录步骤，未开始的步骤忽略"""
+        started = self._open.pop(name, None)
+        if started is None:
+            return None
+        span = StepSpan(name=name, started_at=time.time() - (time.monotonic() - started),
+                        duration=time.monotonic() - started, success=success)
+        self.spans.append(span)
+        logger.debug(f"⏱️ {PUBLISH_STEPS.get(name, name)}: {span.duration:.2f}秒")
+        return span
+
+    def fail_open(self) -> None:
+        """发布出错时，把仍在进行中的步骤记录为失败"""
+        for name in list(self._open):
+            self.finish(name, success=False)
+
+    @contextmanager
+    def span(self, name: str):
+        """
+        记录一个步骤耗时的上下文管理器，出错时标记为失败
+
+        Args:
+            name: 步骤名称，参见PUBLISH_STEPS
+        """
+        self.start(name)
+        try:
+            yield
+        except BaseException:
+            self.finish(name, success=False)
+            raise
+        self.finish(name)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """转换为字典列表"""
+        return [span.to_dict() for span in self.spans]
+
+
+class PublishMetrics:
+    """发布步骤耗时汇总（保留每个步骤最近的若干次记录）"""
+
+    def __init__(self, max_samples: int = 500):
+        self.max_samples = max_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._failures: Dict[str, int] = {}
+        self._publish_count = 0
+        self._lock = threading.Lock()
+
+    def record(self, recorder: PublishSpanRecorder) -> None:
+        """记录一次发布的所有步骤耗时"""
+        with self._lock:
+            self._publish_count += 1
+            for span in recorder.spans:
+                samples = self._samples.setdefault(span.name, deque(maxlen=self.max_samples))
+                samples.append(span.duration)
+                if not span.success:
+                    self._failures[span.name] = self._failures.get(span.name, 0) + 1
+
+    def summary(self, step: Optional[str] = None) -> Dict[str, Any]:
+        """
+        获取各步骤耗时分布
+
+        Args:
+            step: 只返回指定步骤，默认返回全部
+
+        Returns:
+            包含样本数、失败次数、平均值、p50、p95、最大值（秒）的字典
+        """
+        with self._lock:
+            samples = {name: list(values) for name, values in self._samples.items()
+                       if step is None or name == step}
+            failures = dict(self._failures)
+            publish_count = self._publish_count
+
+        order = list(PUBLISH_STEPS)
+        steps = {}
+        for name in sorted(samples, key=lambda n: order.index(n) if n in order else len(order)):
+            values = sorted(samples[name])
+            steps[name] = {
+                "label": PUBLISH_STEPS.get(name, name),
+                "count": len(values),
+                "failures": failures.get(name, 0),
+                "mean": round(sum(values) / len(values), 3),
+                "p50": round(_percentile(values, 50), 3),
+                "p95": round(_percentile(values, 95), 3),
+                "max": round(values[-1], 3)
+            }
+
+        return {
+            "publish_count": publish_count,
+            "max_samples_per_step": self.max_samples,
+            "steps": steps
+        }
+
+    def reset(self) -> None:
+        """清空统计"""
+        with self._lock:
+            self._samples.clear()
+            self._failures.clear()
+            self._publish_count = 0
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """最近秩法计算百分位数，输入需已排序"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+# 全局发布耗时统计实例
+publish_metrics = PublishMetrics()
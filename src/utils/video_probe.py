@@ -0,0 +1,472 @@
+"""
+视频上传前预检
+
+浏览器上传视频后最多要等待2分钟才能发现文件过大或编码不受支持。上传前先在本地读取视频信息：
+- 容器、视频/音频编码、时长、码率、分辨率、文件大小
+- 优先使用本地ffprobe；没有安装ffmpeg时，MP4/MOV文件用纯Python解析文件头（只读取box头，不读取媒体数据）
+- 超过大小/时长上限或没有视频轨道时直接拒绝
+- 容器或编码不兼容时，开启VIDEO_TRANSCODE且安装了ffmpeg时在本地转封装/转码，否则给出警告并上传原文件
+
+预检结果和转码结果按文件内容哈希缓存，同一个视频再次发布时不需要重新检查
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import struct
+import subprocess
+import threading
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# 上传兼容的容器和编码
+COMPATIBLE_CONTAINERS = {'mp4'}
+COMPATIBLE_VIDEO_CODECS = {'h264', 'hevc'}
+COMPATIBLE_AUDIO_CODECS = {'aac'}
+
+# MP4 sample entry -> 编码名称（与ffprobe的codec_name一致）
+MP4_CODECS = {
+    'avc1': 'h264', 'avc3': 'h264',
+    'hvc1': 'hevc', 'hev1': 'hevc',
+    'mp4v': 'mpeg4', 'av01': 'av1', 'vp09': 'vp9',
+    'mp4a': 'aac', 'ac-3': 'ac3', 'ec-3': 'eac3', 'Opus': 'opus', '.mp3': 'mp3'
+}
+
+# 只需要进入的MP4容器box
+MP4_CONTAINER_BOXES = {b'moov', b'trak', b'mdia', b'minf', b'stbl'}
+
+# 计算文件哈希时读取的头尾字节数（与文件大小一起作为缓存键，不读取整个视频）
+HASH_SAMPLE_BYTES = 1024 * 1024
+
+
+@dataclass
+class VideoInfo:
+    """视频信息"""
+    container: Optional[str] = None
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+    duration: Optional[float] = None  # 秒
+    bitrate: Optional[int] = None  # bit/s
+    width: Optional[int] = None
+    height: Optional[int] = None
+    size: int = 0
+    source: str = 'none'  # ffprobe / mp4 / none（无法读取，只知道文件大小）
+
+    def describe(self) -> str:
+        """简短描述，用于日志"""
+        parts = [self.container or '?', self.video_codec or '?']
+        if self.audio_codec:
+            parts.append(self.audio_codec)
+        if self.width and self.height:
+            parts.append(f"{self.width}x{self.height}")
+        if self.duration:
+            parts.append(f"{self.duration:.1f}s")
+        if self.bitrate:
+            parts.append(f"{self.bitrate // 1000}kbps")
+        parts.append(f"{self.size / 1024 / 1024:.1f}MB")
+        return ' '.join(parts)
+
+
+@dataclass(frozen=True)
+class VideoLimits:
+    """上传限制"""
+    max_bytes: int = 20 * 1024 * 1024 * 1024
+    max_duration: float = 4 * 3600
+    transcode: bool = False
+    transcode_timeout: float = 1800
+
+    @classmethod
+    def from_env(cls) -> "VideoLimits":
+        """从环境变量读取"""
+        return cls(
+            max_bytes=int(float(os.getenv('VIDEO_MAX_MB', '20480')) * 1024 * 1024),
+            max_duration=float(os.getenv('VIDEO_MAX_DURATION', str(4 * 3600))),
+            transcode=os.getenv('VIDEO_TRANSCODE', 'false').lower() == 'true',
+            transcode_timeout=float(os.getenv('VIDEO_TRANSCODE_TIMEOUT', '1800'))
+        )
+
+
+@dataclass
+class PreflightResult:
+    """预检结果"""
+    info: VideoInfo
+    action: str = 'ok'  # ok / remux / transcode / reject
+    reasons: List[str] = field(default_factory=list)
+
+
+def probe_video(path: str) -> VideoInfo:
+    """
+    读取视频信息：优先ffprobe，其次解析MP4/MOV文件头
+
+    Args:
+        path: 视频文件路径
+
+    Returns:
+        VideoInfo，两种方式都无法读取时只包含文件大小（source='none'）
+    """
+    size = os.path.getsize(path)
+    if shutil.which('ffprobe'):
+        try:
+            return _probe_ffprobe(path, size)
+        except Exception as e:
+            logger.warning(f"⚠️ ffprobe读取视频信息失败，尝试解析文件头: {e}")
+
+    try:
+        with open(path, 'rb') as f:
+            info = _probe_mp4(f, size)
+        if info is not None:
+            return info
+    except Exception as e:
+        logger.debug(f"解析MP4文件头失败: {e}")
+
+    return VideoInfo(size=size)
+
+
+def check_video(info: VideoInfo, limits: VideoLimits) -> PreflightResult:
+    """
+    根据视频信息判断需要的处理
+
+    Returns:
+        PreflightResult，action为reject时reasons说明原因
+    """
+    result = PreflightResult(info=info)
+
+    if info.size > limits.max_bytes:
+        result.reasons.append(f"文件大小{info.size / 1024 / 1024:.0f}MB超过上限{limits.max_bytes / 1024 / 1024:.0f}MB")
+    if info.duration and info.duration > limits.max_duration:
+        result.reasons.append(f"视频时长{info.duration:.0f}秒超过上限{limits.max_duration:.0f}秒")
+    if info.source != 'none' and not info.video_codec:
+        result.reasons.append("文件中没有视频轨道")
+    if result.reasons:
+        result.action = 'reject'
+        return result
+
+    if info.source == 'none':
+        return result
+
+    codecs_ok = (info.video_codec in COMPATIBLE_VIDEO_CODECS
+                 and (info.audio_codec is None or info.audio_codec in COMPATIBLE_AUDIO_CODECS))
+    if not codecs_ok:
+        result.action = 'transcode'
+        result.reasons.append(f"编码不兼容: 视频{info.video_codec}, 音频{info.audio_codec or '无'}")
+    elif info.container not in COMPATIBLE_CONTAINERS:
+        result.action = 'remux'
+        result.reasons.append(f"容器不兼容: {info.container}")
+    return result
+
+
+def convert_video(src: str, target: Path, action: str, timeout: float) -> Path:
+    """
+    用ffmpeg转封装（remux，不重新编码）或转码为H.264/AAC的MP4
+
+    Raises:
+        RuntimeError: ffmpeg执行失败或超时
+    """
+    if action == 'remux':
+        codec_args = ['-c', 'copy']
+    else:
+        codec_args = ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '23', '-pix_fmt', 'yuv420p',
+                      '-c:a', 'aac', '-b:a', '128k']
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_target = target.with_name(f".{target.stem}.tmp.mp4")
+    command = ['ffmpeg', '-y', '-v', 'error', '-i', src, *codec_args, '-movflags', '+faststart', str(tmp_target)]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip()[-500:] or f"ffmpeg退出码 {completed.returncode}")
+        os.replace(tmp_target, target)
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"ffmpeg处理超时（{timeout:.0f}秒）")
+    finally:
+        if tmp_target.exists():
+            tmp_target.unlink()
+    return target
+
+
+class VideoPreflight:
+    """视频预检（结果按文件哈希缓存到JSON文件，线程安全）"""
+
+    def __init__(self, cache_dir: str, limits: Optional[VideoLimits] = None):
+        """
+        初始化视频预检
+
+        Args:
+            cache_dir: 缓存目录（预检结果和转码后的文件）
+            limits: 上传限制，默认读取环境变量
+        """
+        self.cache_dir = Path(cache_dir)
+        self.converted_dir = self.cache_dir / 'converted'
+        self.index_file = self.cache_dir / 'index.json'
+        self.limits = limits or VideoLimits.from_env()
+        self._lock = threading.Lock()
+        # 文件哈希 -> {info, converted}
+        self._index: Dict[str, Dict[str, Any]] = {}
+        # (路径, mtime, 大小) -> 文件哈希，避免同一进程内重复读取文件
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._load()
+
+    def prepare(self, path: str) -> str:
+        """
+        检查视频，返回实际上传的文件路径
+
+        Args:
+            path: 本地视频文件路径
+
+        Returns:
+            原文件路径，或转封装/转码后的文件路径
+
+        Raises:
+            ValueError: 视频不满足上传要求
+        """
+        file_hash = self.file_hash(path)
+        with self._lock:
+            entry = self._index.get(file_hash)
+
+        if entry is None:
+            info = probe_video(path)
+            entry = {'info': asdict(info), 'converted': None}
+            with self._lock:
+                self._index[file_hash] = entry
+            self._save()
+            logger.info(f"🔍 视频信息（{info.source}）: {info.describe()}")
+        else:
+            info = VideoInfo(**entry['info'])
+            logger.info(f"🔍 视频信息（缓存）: {info.describe()}")
+
+        result = check_video(info, self.limits)
+        if result.action == 'reject':
+            raise ValueError(f"视频不满足上传要求: {'; '.join(result.reasons)}")
+        if result.action == 'ok':
+            return path
+
+        converted = entry.get('converted')
+        if converted and Path(converted).exists():
+            logger.info(f"♻️ 使用已转换的视频: {converted}")
+            return converted
+
+        if not self.limits.transcode or not shutil.which('ffmpeg'):
+            logger.warning(f"⚠️ {'; '.join(result.reasons)}，上传可能失败"
+                           f"（设置VIDEO_TRANSCODE=true并安装ffmpeg后可自动转换）")
+            return path
+
+        target = self.converted_dir / f"{file_hash[:16]}.mp4"
+        logger.info(f"🔧 {'转封装' if result.action == 'remux' else '转码'}视频: {'; '.join(result.reasons)}")
+        convert_video(path, target, result.action, self.limits.transcode_timeout)
+        with self._lock:
+            entry['converted'] = str(target)
+        self._save()
+        logger.info(f"✅ 视频转换完成: {target} ({target.stat().st_size / 1024 / 1024:.1f}MB)")
+        return str(target)
+
+    def file_hash(self, path: str) -> str:
+        """文件哈希：文件大小 + 头尾各1MB内容的SHA-256（大视频不需要整体读取）"""
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._hashes.get(memo_key)
+        if cached:
+            return cached
+
+        digest = hashlib.sha256(str(stat.st_size).encode('ascii'))
+        with open(path, 'rb') as f:
+            digest.update(f.read(HASH_SAMPLE_BYTES))
+            if stat.st_size > HASH_SAMPLE_BYTES:
+                f.seek(max(HASH_SAMPLE_BYTES, stat.st_size - HASH_SAMPLE_BYTES))
+                digest.update(f.read(HASH_SAMPLE_BYTES))
+        file_hash = digest.hexdigest()
+        with self._lock:
+            self._hashes[memo_key] = file_hash
+        return file_hash
+
+    def _save(self) -> None:
+        """保存缓存索引（先写临时文件再替换）"""
+        with self._lock:
+            data = json.dumps(self._index, ensure_ascii=False)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix('.tmp')
+            tmp_file.write_text(data, encoding='utf-8')
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            logger.warning(f"⚠️ 保存视频预检缓存失败: {e}")
+
+    def _load(self) -> None:
+        """加载缓存索引，文件损坏时从空缓存开始"""
+        if not self.index_file.exists():
+            return
+        try:
+            self._index = json.loads(self.index_file.read_text(encoding='utf-8'))
+        except Exception as e:
+            logger.warning(f"⚠️ 读取视频预检缓存失败，将重新检查: {e}")
+
+
+def _probe_ffprobe(path: str, size: int) -> VideoInfo:
+    """用ffprobe读取视频信息"""
+    completed = subprocess.run(
+        ['ffprobe', '-v', 'error', '-print_format', 'json', '-show_format', '-show_streams', path],
+        capture_output=True, text=True, timeout=30, check=True
+    )
+    data = json.loads(completed.stdout)
+    fmt = data.get('format', {})
+    info = VideoInfo(size=size, source='ffprobe', container=_container_name(fmt.get('format_name', '')))
+    for stream in data.get('streams', []):
+        if stream.get('codec_type') == 'video' and info.video_codec is None:
+            if stream.get('disposition', {}).get('attached_pic'):
+                continue  # 封面图
+            info.video_codec = stream.get('codec_name')
+            info.width = stream.get('width')
+            info.height = stream.get('height')
+        elif stream.get('codec_type') == 'audio' and info.audio_codec is None:
+            info.audio_codec = stream.get('codec_name')
+    if fmt.get('duration'):
+        info.duration = float(fmt['duration'])
+    if fmt.get('bit_rate'):
+        info.bitrate = int(fmt['bit_rate'])
+    elif info.duration:
+        info.bitrate = int(size * 8 / info.duration)
+    return info
+
+
+def _container_name(format_name: str) -> str:
+    """ffprobe的format_name转为容器名称"""
+    names = format_name.split(',')
+    if 'mov' in names or 'mp4' in names:
+        return 'mp4'
+    if 'matroska' in names or 'webm' in names:
+        return 'mkv'
+    if 'asf' in names:
+        return 'wmv'
+    return names[0] if names else ''
+
+
+def _probe_mp4(f: BinaryIO, size: int) -> Optional[VideoInfo]:
+    """
+    解析MP4/MOV（ISO BMFF）文件头：ftyp、moov/mvhd（时长）、trak/tkhd（分辨率）、
+    mdia/hdlr（轨道类型）、stbl/stsd（编码）。不是MP4文件时返回None
+    """
+    header = f.read(8)
+    if len(header) < 8 or header[4:8] not in (b'ftyp', b'moov', b'mdat', b'free', b'wide', b'skip'):
+        return None
+    f.seek(0)
+
+    info = VideoInfo(size=size, source='mp4', container='mp4')
+    tracks: List[Dict[str, Any]] = []
+    found_moov = False
+
+    for box_type, start, end in _iter_boxes(f, 0, size):
+        if box_type != b'moov':
+            continue
+        found_moov = True
+        for child_type, child_start, child_end in _iter_boxes(f, start, end):
+            if child_type == b'mvhd':
+                info.duration = _read_mvhd_duration(f, child_start)
+            elif child_type == b'trak':
+                tracks.append(_read_track(f, child_start, child_end))
+        break
+
+    if not found_moov:
+        return None
+
+    for track in tracks:
+        if track.get('handler') == 'vide' and info.video_codec is None:
+            info.video_codec = track.get('codec')
+            info.width, info.height = track.get('width'), track.get('height')
+        elif track.get('handler') == 'soun' and info.audio_codec is None:
+            info.audio_codec = track.get('codec')
+    if info.duration:
+        info.bitrate = int(size * 8 / info.duration)
+    return info
+
+
+def _iter_boxes(f: BinaryIO, start: int, end: int):
+    """遍历[start, end)范围内的box，返回(类型, 内容起点, 结束位置)"""
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        box_size, box_type = struct.unpack('>I4s', header)
+        content = offset + 8
+        if box_size == 1:
+            box_size = struct.unpack('>Q', f.read(8))[0]
+            content += 8
+        elif box_size == 0:
+            box_size = end - offset
+        if box_size < content - offset:
+            return  # 损坏的box
+        yield box_type, content, min(offset + box_size, end)
+        offset += box_size
+
+
+def _read_mvhd_duration(f: BinaryIO, start: int) -> Optional[float]:
+    """mvhd中的时长（秒）"""
+    f.seek(start)
+    version = f.read(4)[0]
+    if version == 1:
+        timescale, duration = struct.unpack('>16xIQ', f.read(28))
+    else:
+        timescale, duration = struct.unpack('>8xII', f.read(16))
+    return duration / timescale if timescale else None
+
+
+def _read_track(f: BinaryIO, start: int, end: int) -> Dict[str, Any]:
+    """读取一个trak的轨道类型、编码和分辨率"""
+    track: Dict[str, Any] = {}
+    for box_type, box_start, box_end in _walk(f, start, end):
+        if box_type == b'tkhd':
+            f.seek(box_start)
+            version = f.read(1)[0]
+            # tkhd末尾是16.16定点数的宽和高
+            f.seek(box_start + (88 if version == 1 else 76))
+            width, height = struct.unpack('>II', f.read(8))
+            if width and height:
+                track['width'], track['height'] = width >> 16, height >> 16
+        elif box_type == b'hdlr':
+            f.seek(box_start + 8)
+            track.setdefault('handler', f.read(4).decode('latin-1'))
+        elif box_type == b'stsd':
+            # stsd: version/flags(4) + entry_count(4) + 第一个sample entry的size(4) + 类型(4)
+            f.seek(box_start + 12)
+            fourcc = f.read(4).decode('latin-1')
+            track['codec'] = MP4_CODECS.get(fourcc, fourcc.strip().lower())
+    return track
+
+
+def _walk(f: BinaryIO, start: int, end: int):
+    """深度优先遍历trak下需要的box"""
+    for box_type, box_start, box_end in _iter_boxes(f, start, end):
+        yield box_type, box_start, box_end
+        if box_type in MP4_CONTAINER_BOXES:
+            yield from _walk(f, box_start, box_end)
+
+
+# 全局视频预检实例（首次使用时按环境变量创建）
+_video_preflight: Optional[VideoPreflight] = None
+_video_preflight_lock = threading.Lock()
+
+
+def get_video_preflight() -> Optional[VideoPreflight]:
+    """
+    获取全局视频预检实例
+
+    Returns:
+        VideoPreflight，VIDEO_PREFLIGHT=false时返回None
+    """
+    global _video_preflight
+
+    if os.getenv('VIDEO_PREFLIGHT', 'true').lower() != 'true':
+        return None
+
+    with _video_preflight_lock:
+        if _video_preflight is None:
+            cache_dir = os.path.join(os.getenv('DATA_STORAGE_PATH', 'data'), 'cache', 'video')
+            _video_preflight = VideoPreflight(cache_dir)
+        return _video_preflight
@@ -4,6 +4,7 @@
 支持多种视频输入格式的处理：
 - 本地文件路径（绝对路径和相对路径）
 - 多种输入格式（字符串、数组、JSON等）
+- 上传前预检（容器、编码、时长、大小），按需转封装/转码
 """
 
 import os
@@ -12,6 +13,7 @@ from pathlib import Path
 from typing import List, Union, Optional, Tuple
 
 from .logger import get_logger
+from .video_probe import VideoPreflight, get_video_preflight
 
 logger = get_logger(__name__)
 
@@ -19,15 +21,17 @@ logger = get_logger(__name__)
 class VideoProcessor:
     """视频处理器，支持多种路径格式"""
     
-    def __init__(self, base_dir: str = None):
+    def __init__(self, base_dir: str = None, preflight: Optional[VideoPreflight] = None):
         """
         初始化视频处理器
         
         Args:
             base_dir: 用于解析相对路径的基础目录
+            preflight: 上传前预检，默认使用全局实例（VIDEO_PREFLIGHT=false时不检查）
         """
         # 设置基础目录（用于相对路径解析）
         self.base_dir = Path(base_dir) if base_dir else Path.cwd()
+        self.preflight = preflight if preflight is not None else get_video_preflight()
         logger.info(f"视频处理器初始化，基础目录: {self.base_dir}")
     
     def process_videos(self, videos_input: Union[str, List, None]) -> Tuple[List[str], Optional[str]]:
@@ -69,6 +73,8 @@ class VideoProcessor:
             try:
                 logger.info(f"🎯 处理视频: {video}")
                 local_path = self._process_single_video(video)
+                if local_path and self.preflight:
+                    local_path = self.preflight.prepare(local_path)
                 if local_path:
                     local_paths.append(local_path)
                     logger.info(f"✅ 处理视频成功: {local_path}")
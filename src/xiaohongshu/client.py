@@ -22,26 +22,38 @@ from ..utils.text_utils import clean_text_for_browser, truncate_text
 from ..utils.logger import get_logger
 from .models import XHSNote, XHSSearchResult, XHSUser, XHSPublishResult
 from .components.content_filler import XHSContentFiller
-from .constants import XHSConfig
+from .components.page_waiter import XHSPageWaiter, UploadProgressCallback
+from ..utils.publish_metrics import PublishSpanRecorder, publish_metrics
+from .constants import XHSConfig, XHSSelectors
 
 logger = get_logger(__name__)
 
 
+# 上传进度元素（读取aria-valuenow、progress的value或文字中的百分比）
+UPLOAD_PROGRESS_SELECTORS = [XHSSelectors.UPLOAD_PROGRESS, "[role='progressbar']", "progress"]
+
+
 class XHSClient:
     """小红书客户端类"""
     
-    def __init__(self, config: CoreConfig):
+    def __init__(self, config: CoreConfig, browser_manager: Optional[ChromeDriverManager] = None,
+                 progress_callback: Optional[UploadProgressCallback] = None):
         """
         初始化小红书客户端
         
         Args:
             config: 配置管理器实例
+            browser_manager: 可选的浏览器管理器（例如从驱动池借出的已预热浏览器）
+            progress_callback: 文件上传进度回调 progress_callback(百分比, 进度文字)
         """
         self.config = config
-        self.browser_manager = ChromeDriverManager(config)
+        self.browser_manager = browser_manager or ChromeDriverManager(config)
         self.cookie_manager = CookieManager(config)
         self.session = requests.Session()
         self.content_filler = None  # 延迟初始化，需要browser_manager运行时才能创建
+        self.page_waiter = XHSPageWaiter(self.browser_manager)
+        self.span_recorder = PublishSpanRecorder()
+        self.progress_callback = progress_callback
         self._setup_session()
     
     def _setup_session(self) -> None:
@@ -75,18 +87,24 @@ class XHSClient:
         """
         logger.info(f"📝 开始发布小红书笔记: {note.title}")
         
+        # 外部传入的已启动浏览器由调用方负责归还，不在这里关闭
+        owns_driver = not self.browser_manager.is_initialized
+        
         try:
-            # 创建浏览器驱动
-            driver = self.browser_manager.create_driver()
-            
-            # 导航到创作者中心
-            self.browser_manager.navigate_to_creator_center()
-            
-            # 加载cookies
-            cookies = self.cookie_manager.load_cookies()
-            cookie_result = self.browser_manager.load_cookies(cookies)
-            
-            logger.info(f"🍪 Cookies加载结果: {cookie_result}")
+            if owns_driver:
+                # 创建浏览器驱动
+                driver = self.browser_manager.create_driver()
+                
+                # 导航到创作者中心
+                self.browser_manager.navigate_to_creator_center()
+                
+                # 加载cookies
+                cookies = self.cookie_manager.load_cookies()
+                cookie_result = self.browser_manager.load_cookies(cookies)
+                
+                logger.info(f"🍪 Cookies加载结果: {cookie_result}")
+            else:
+                logger.info("♻️ 复用已预热的浏览器驱动")
             
             # 访问发布页面
             return await self._publish_note_process(note)
@@ -98,41 +116,61 @@ class XHSClient:
                 raise PublishError(f"发布笔记过程出错: {str(e)}", publish_step="初始化") from e
         finally:
             # 确保浏览器被关闭
-            self.browser_manager.close_driver()
+            if owns_driver:
+                self.browser_manager.close_driver()
     
     async def _publish_note_process(self, note: XHSNote) -> XHSPublishResult:
         """执行发布笔记的具体流程"""
         driver = self.browser_manager.driver
+        # 每次发布使用新的等待器和耗时记录器，单独统计本次各步骤耗时
+        self.page_waiter = XHSPageWaiter(self.browser_manager)
+        self.span_recorder = PublishSpanRecorder()
+        spans = self.span_recorder
         
         try:
+            spans.start("navigate")
             logger.info("🌐 直接访问小红书发布页面...")
             driver.get("https://creator.xiaohongshu.com/publish/publish?from=menu")
-            await asyncio.sleep(5)  # 等待页面基本加载
+            await self.page_waiter.wait_for_page_ready("页面加载", url_contains="publish")
             
             if "publish" not in driver.current_url:
                 raise PublishError("无法访问发布页面，可能需要重新登录", publish_step="页面访问")
             
             logger.info("⏳ 等待页面元素完全渲染...")
-            await asyncio.sleep(3)  # 等待页面元素完全渲染
+            await self.page_waiter.wait_for_any_visible(
+                [XHSSelectors.CREATOR_TABS, XHSSelectors.FILE_UPLOAD_INPUT, XHSSelectors.FILE_UPLOAD_INPUT_ALT],
+                XHSConfig.PAGE_LOAD_TIME, "页面渲染"
+            )
+            spans.finish("navigate")
             
             # 根据内容类型切换发布模式
-            await self._switch_publish_mode(note)
+            with spans.span("mode_switch"):
+                await self._switch_publish_mode(note)
             
             # 处理文件上传（图片/视频）
-            await self._handle_file_upload(note)
+            with spans.span("upload"):
+                await self._handle_file_upload(note)
             
-            # 填写笔记内容
+            # 填写笔记内容（标题、内容、话题、可见范围分别在内部计时）
             await self._fill_note_content(note)
             
             # 发布笔记
-            return await self._submit_note(note)
+            with spans.span("submit"):
+                result = await self._submit_note(note)
+            result.step_timings = dict(self.page_waiter.timings)
+            result.spans = spans.to_list()
+            logger.info(f"⏱️ 各步骤等待耗时: {result.step_timings}")
+            return result
             
         except Exception as e:
+            spans.fail_open()
             self.browser_manager.take_screenshot("publish_error_screenshot.png")
             if isinstance(e, PublishError):
                 raise
             else:
                 raise PublishError(f"发布流程执行失败: {str(e)}", publish_step="流程执行") from e
+        finally:
+            publish_metrics.record(spans)
 
     async def _switch_publish_mode(self, note: XHSNote) -> None:
         """根据笔记内容类型切换发布模式（图文/视频）"""
@@ -162,7 +200,11 @@ class XHSClient:
                     if image_tab:
                         image_tab.click()
                         logger.info("✅ 已切换到图文发布模式")
-                        await asyncio.sleep(2)  # 等待界面切换完成
+                        # 等待图片上传控件出现，即界面切换完成（上传input是隐藏的，只检查是否存在）
+                        await self.page_waiter.wait_for_any_present(
+                            ["[accept*='image']", XHSSelectors.FILE_UPLOAD_INPUT],
+                            XHSConfig.MODE_SWITCH_TIME, "切换发布模式"
+                        )
                     else:
                         logger.warning("⚠️ 未找到图文发布选项卡，可能已经在图文模式")
                         
@@ -186,7 +228,10 @@ class XHSClient:
                     if video_tab and "active" not in video_tab.get_attribute("class"):
                         video_tab.click()
                         logger.info("✅ 已切换到视频发布模式")
-                        await asyncio.sleep(2)
+                        await self.page_waiter.wait_until(
+                            lambda d: "active" in (video_tab.get_attribute("class") or ""),
+                            XHSConfig.MODE_SWITCH_TIME, "切换发布模式"
+                        )
                     else:
                         logger.info("✅ 已在视频发布模式")
                         
@@ -273,28 +318,32 @@ class XHSClient:
                     if len(files_to_upload) > 1:
                         logger.info("🔄 尝试上传其余文件...")
                         for i, file_path in enumerate(files_to_upload[1:], 2):
-                            await asyncio.sleep(2)
-                            # 尝试找到新的上传按钮
-                            add_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), '添加')]")
-                            if not add_buttons:
+                            # 等待新的上传按钮出现
+                            add_button = await self.page_waiter.wait_for_any_visible(
+                                ["//button[contains(text(), '添加')]"], XHSConfig.SHORT_WAIT_TIME, "多文件上传"
+                            )
+                            if not add_button:
                                 raise PublishError(f"无法找到添加按钮上传第{i}个文件", publish_step="多文件上传")
                             
-                            add_buttons[0].click()
-                            await asyncio.sleep(1)
+                            add_button.click()
                             # 重新查找input
-                            new_input = driver.find_element(By.XPATH, "//input[@type='file']")
+                            new_input = await self.page_waiter.wait_until(
+                                lambda d: d.find_element(By.XPATH, "//input[@type='file']"),
+                                XHSConfig.SHORT_WAIT_TIME, "多文件上传", raise_on_timeout=True
+                            )
                             new_input.send_keys(file_path)
                             logger.info(f"✅ 第{i}个文件已上传: {file_path}")
                 
-                # 给时间让上传开始
-                await asyncio.sleep(3)
-                
                 # 如果有视频，等待上传完成
                 if has_video:
                     await self._wait_for_video_upload_complete()
                 else:
-                    # 图片上传给少量时间
-                    await asyncio.sleep(2)
+                    # 图片上传后才会出现编辑区，以标题输入框出现作为上传完成的标志
+                    await self.page_waiter.wait_for_upload(
+                        XHSConfig.FILE_UPLOAD_TIME, "文件上传",
+                        success=[XHSSelectors.TITLE_INPUT_ALT, XHSSelectors.TITLE_INPUT],
+                        progress=UPLOAD_PROGRESS_SELECTORS, on_progress=self.progress_callback
+                    )
                     
         except Exception as e:
             logger.error(f"❌ 处理文件上传时出错: {e}")
@@ -309,7 +358,7 @@ class XHSClient:
             # 滚动到页面底部，可见范围设置在最底部
             logger.info("📜 滚动到页面底部查找可见范围设置...")
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(2)  # 等待页面渲染
+            await self.page_waiter.wait_for_dom_idle("设置可见范围")  # 等待页面渲染
             
             # 查找可见范围设置按钮的多种选择器
             visibility_selectors = [
@@ -392,41 +441,23 @@ class XHSClient:
             
             logger.info("⏳ 等待视频上传完成...")
             
-            # 等待上传成功标识出现 - 使用轮询方式
+            # 页面内监听上传成功标识和进度，状态变化后立即返回
             success_selectors = [
-                "//div[contains(text(), '上传成功')]",
-                "//span[contains(text(), '上传成功')]", 
                 "//*[contains(text(), '上传成功')]",
-                "//div[contains(@class, 'success')]"
+                XHSSelectors.VIDEO_COMPLETE
+            ]
+            error_selectors = [
+                "//*[contains(text(), '上传失败')]",
+                XHSSelectors.UPLOAD_ERROR
             ]
             
             max_wait_time = 120  # 最大等待2分钟，避免MCP超时
-            check_interval = 2   # 每2秒检查一次
-            elapsed_time = 0
-            success_found = False
-            
-            while elapsed_time < max_wait_time and not success_found:
-                # 检查所有可能的成功标识
-                for selector in success_selectors:
-                    try:
-                        elements = driver.find_elements(By.XPATH, selector)
-                        for element in elements:
-                            if element.is_displayed() and "上传成功" in element.text:
-                                logger.info("✅ 视频上传完成！")
-                                success_found = True
-                                break
-                        if success_found:
-                            break
-                    except Exception:
-                        continue
-                
-                if not success_found:
-                    logger.debug(f"⏳ 继续等待上传完成... ({elapsed_time}s/{max_wait_time}s)")
-                    await asyncio.sleep(check_interval)
-                    elapsed_time += check_interval
-            
-            if not success_found:
-                logger.warning(f"⚠️ 等待{max_wait_time}秒后未检测到上传成功标识，继续流程")
+            state = await self.page_waiter.wait_for_upload(
+                max_wait_time, "文件上传", success=success_selectors, error=error_selectors,
+                progress=UPLOAD_PROGRESS_SELECTORS, on_progress=self.progress_callback
+            )
+            if state == "success":
+                logger.info("✅ 视频上传完成！")
             
             # 尝试获取视频信息
             try:
@@ -452,9 +483,8 @@ class XHSClient:
         if not self.content_filler:
             self.content_filler = XHSContentFiller(self.browser_manager)
         
-        await asyncio.sleep(2)  # 等待上传完成
-        
         # 填写标题
+        self.span_recorder.start("title_fill")
         try:
             logger.info("✏️ 填写标题...")
             # 检查标题长度
@@ -476,6 +506,9 @@ class XHSClient:
                 ".input"
             ]
             
+            # 等待编辑区渲染出标题输入框
+            await self.page_waiter.wait_for_any_visible(title_selectors, XHSConfig.DEFAULT_WAIT_TIME, "填写标题")
+            
             title_input = None
             for selector in title_selectors:
                 try:
@@ -507,14 +540,13 @@ class XHSClient:
             
         except Exception as e:
             raise PublishError(f"填写标题失败: {str(e)}", publish_step="填写标题") from e
+        self.span_recorder.finish("title_fill")
         
         # 填写内容
+        self.span_recorder.start("content_fill")
         try:
             logger.info("📝 填写内容...")
             
-            # 等待页面加载完成
-            await asyncio.sleep(2)
-            
             # 尝试多个内容选择器（根据最新的小红书页面结构）
             content_selectors = [
                 ".ql-editor",  # Quill编辑器
@@ -541,6 +573,11 @@ class XHSClient:
                 "//div[contains(@data-placeholder, '分享')]"
             ]
             
+            # 等待内容编辑器出现
+            await self.page_waiter.wait_for_any_visible(
+                [XHSSelectors.CONTENT_EDITOR, "div[contenteditable='true']", XHSSelectors.CONTENT_TEXTAREA_CONTAINER],
+                XHSConfig.DEFAULT_WAIT_TIME, "填写内容"
+            )
             content_input = None
             
             # 先尝试CSS选择器
@@ -679,8 +716,10 @@ class XHSClient:
             
         except Exception as e:
             raise PublishError(f"填写内容失败: {str(e)}", publish_step="填写内容") from e
+        self.span_recorder.finish("content_fill")
         
         # 填写话题
+        self.span_recorder.start("topics")
         if note.topics and len(note.topics) > 0:
             try:
                 logger.info(f"🏷️ 开始填写话题: {note.topics}")
@@ -697,11 +736,14 @@ class XHSClient:
         else:
             logger.info("📋 没有话题需要填写")
         
-        await asyncio.sleep(2)
+        # 等待话题下拉框等界面变化稳定
+        await self.page_waiter.wait_for_dom_idle("填写话题")
+        self.span_recorder.finish("topics")
         
         # 设置可见范围（在所有内容填写完成后）
         if note.visibility == "private":
-            await self._set_visibility_private()
+            with self.span_recorder.span("visibility"):
+                await self._set_visibility_private()
     
     async def _submit_note(self, note: XHSNote) -> XHSPublishResult:
         """提交发布笔记"""
@@ -718,17 +760,15 @@ class XHSClient:
                 self.browser_manager.take_screenshot(screenshot_path)
                 logger.info(f"📸 预览截图已保存: {screenshot_path}")
                 
-                # 在dry_run模式下，保持浏览器打开供查看
-                logger.info("⏰ 保持浏览器打开30秒供查看...")
-                logger.info("📌 你可以检查：")
-                logger.info("   - 图片是否上传成功")
-                logger.info("   - 标题和内容是否正确")
-                logger.info("   - 话题标签是否添加")
-                logger.info("   - 可见范围设置")
-                await asyncio.sleep(30)
-                
-                logger.info("⏰ 即将关闭浏览器...")
-                await asyncio.sleep(3)
+                # 在dry_run模式下，保持浏览器打开供查看（无头模式下无人查看，直接结束）
+                if not self.config.headless:
+                    logger.info("⏰ 保持浏览器打开30秒供查看...")
+                    logger.info("📌 你可以检查：")
+                    logger.info("   - 图片是否上传成功")
+                    logger.info("   - 标题和内容是否正确")
+                    logger.info("   - 话题标签是否添加")
+                    logger.info("   - 可见范围设置")
+                    await asyncio.sleep(30)
                 
                 return XHSPublishResult(
                     success=True,
@@ -765,9 +805,15 @@ class XHSClient:
             if not submit_btn:
                 raise PublishError("无法找到发布按钮", publish_step="查找发布按钮")
             
+            publish_url = driver.current_url
             submit_btn.click()
             logger.info("✅ 发布按钮已点击")
-            await asyncio.sleep(3)
+            
+            # 等待跳转离开编辑页或出现发布成功提示
+            await self.page_waiter.wait_until(
+                lambda d: d.current_url != publish_url or d.find_elements(By.XPATH, "//*[contains(text(), '发布成功')]"),
+                XHSConfig.PUBLISH_WAIT_TIME, "提交发布"
+            )
             
             current_url = driver.current_url
             logger.info(f"📍 发布后页面URL: {current_url}")
@@ -1003,6 +1049,7 @@ class XHSClient:
             结构化数据字典，包含账号概览、内容分析、粉丝数据
         """
         from .data_collector import collect_dashboard_data, collect_content_analysis_data, collect_fans_data
+        from .data_collector.utils import run_in_collector
         
         logger.info("📊 开始采集创作者数据中心数据...")
         
@@ -1026,7 +1073,7 @@ class XHSClient:
             try:
                 # 采集账号概览数据
                 logger.info("🏠 开始采集账号概览数据...")
-                dashboard_data = collect_dashboard_data(driver, date)
+                dashboard_data = await run_in_collector(collect_dashboard_data, driver)
                 result["data"]["dashboard"] = dashboard_data
                 
                 # 等待间隔，遵守采集规范
@@ -1034,7 +1081,7 @@ class XHSClient:
                 
                 # 采集内容分析数据
                 logger.info("📊 开始采集内容分析数据...")
-                content_data = collect_content_analysis_data(driver, date)
+                content_data = await collect_content_analysis_data(driver, date)
                 result["data"]["content_analysis"] = content_data
                 
                 # 等待间隔
@@ -1042,7 +1089,7 @@ class XHSClient:
                 
                 # 采集粉丝数据
                 logger.info("👥 开始采集粉丝数据...")
-                fans_data = collect_fans_data(driver, date)
+                fans_data = await run_in_collector(collect_fans_data, driver)
                 result["data"]["fans"] = fans_data
                 
                 logger.info("✅ 创作者数据采集完成")
@@ -1074,6 +1121,7 @@ class XHSClient:
             账号概览数据字典
         """
         from .data_collector.dashboard import collect_dashboard_data
+        from .data_collector.utils import run_in_collector
         
         logger.info("🏠 开始采集账号概览数据...")
         
@@ -1082,7 +1130,7 @@ class XHSClient:
             cookies = self.cookie_manager.load_cookies()
             self.browser_manager.load_cookies(cookies)
             
-            result = await collect_dashboard_data(driver, date, save_data)
+            result = await run_in_collector(collect_dashboard_data, driver, save_data)
             
         except Exception as e:
             logger.error(f"❌ 采集账号概览数据失败: {e}")
@@ -1138,6 +1186,7 @@ class XHSClient:
             粉丝数据字典
         """
         from .data_collector.fans import collect_fans_data
+        from .data_collector.utils import run_in_collector
         
         logger.info("👥 开始采集粉丝数据...")
         
@@ -1146,7 +1195,7 @@ class XHSClient:
             cookies = self.cookie_manager.load_cookies()
             self.browser_manager.load_cookies(cookies)
             
-            result = await collect_fans_data(driver, date, save_data)
+            result = await run_in_collector(collect_fans_data, driver, save_data)
             
         except Exception as e:
             logger.error(f"❌ 采集粉丝数据失败: {e}")
@@ -9,6 +9,7 @@ from .content_filler import XHSContentFiller
 from .topic_automation import XHSTopicAutomation, AdvancedXHSTopicAutomation
 from .publisher import XHSPublisher
 from .data_collector import XHSDataCollector
+from .page_waiter import XHSPageWaiter
 
 __all__ = [
     'XHSFileUploader', 
@@ -17,4 +18,5 @@ __all__ = [
     'AdvancedXHSTopicAutomation',
     'XHSPublisher',
     'XHSDataCollector',
+    'XHSPageWaiter',
 ] 
\ No newline at end of file
@@ -4,7 +4,6 @@
 专门负责数据采集相关功能，遵循单一职责原则
 """
 
-import asyncio
 from typing import Dict, Any, Optional
 from datetime import datetime
 
@@ -12,7 +11,8 @@ from ..interfaces import IBrowserManager
 from ..data_collector import (
     collect_dashboard_data,
     collect_content_analysis_data,
-    collect_fans_data
+    collect_fans_data,
+    run_in_collector
 )
 from ...core.exceptions import handle_exception
 from ...utils.logger import get_logger
@@ -46,10 +46,7 @@ class XHSDataCollector:
         logger.info(f"🔍 开始采集账号概览数据: {date or '当前日期'}")
         
         try:
-            data = await collect_dashboard_data(
-                driver=self.browser_manager.driver,
-                date=date
-            )
+            data = await run_in_collector(collect_dashboard_data, self.browser_manager.driver)
             
             logger.info("✅ 账号概览数据采集完成")
             return data
@@ -98,10 +95,7 @@ class XHSDataCollector:
         logger.info(f"👥 开始采集粉丝数据: {date or '当前日期'}")
         
         try:
-            data = await collect_fans_data(
-                driver=self.browser_manager.driver,
-                date=date
-            )
+            data = await run_in_collector(collect_fans_data, self.browser_manager.driver)
             
             logger.info("✅ 粉丝数据采集完成")
             return data
@@ -126,16 +120,15 @@ class XHSDataCollector:
         try:
             results = {}
             
-            # 并行采集所有数据
-            tasks = [
-                self.collect_dashboard_data(date),
-                self.collect_content_analysis_data(date),
-                self.collect_fans_data(date)
-            ]
+            # 采集函数在线程池中执行，但共用同一个浏览器，只能依次采集
+            collected = []
+            for collect in (self.collect_dashboard_data, self.collect_content_analysis_data, self.collect_fans_data):
+                try:
+                    collected.append(await collect(date))
+                except Exception as e:
+                    collected.append(e)
             
-            dashboard_data, content_data, fans_data = await asyncio.gather(
-                *tasks, return_exceptions=True
-            )
+            dashboard_data, content_data, fans_data = collected
             
             # 处理结果
             if not isinstance(dashboard_data, Exception):
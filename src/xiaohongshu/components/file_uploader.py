@@ -4,9 +4,8 @@
 专门负责文件上传处理，遵循单一职责原则
 """
 
-import asyncio
 import os
-from typing import List
+from typing import List, Optional
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -16,6 +15,7 @@ from ..interfaces import IFileUploader, IBrowserManager
 from ..constants import (XHSConfig, XHSSelectors, XHSMessages, 
                         get_file_upload_selectors, is_supported_image_format, 
                         is_supported_video_format)
+from .page_waiter import XHSPageWaiter, UploadProgressCallback
 from ...core.exceptions import PublishError, handle_exception
 from ...utils.logger import get_logger
 
@@ -25,14 +25,18 @@ logger = get_logger(__name__)
 class XHSFileUploader(IFileUploader):
     """小红书文件上传器"""
     
-    def __init__(self, browser_manager: IBrowserManager):
+    def __init__(self, browser_manager: IBrowserManager,
+                 progress_callback: Optional[UploadProgressCallback] = None):
         """
         初始化文件上传器
         
         Args:
             browser_manager: 浏览器管理器
+            progress_callback: 上传进度回调 progress_callback(百分比, 进度文字)
         """
         self.browser_manager = browser_manager
+        self.progress_callback = progress_callback
+        self.page_waiter = XHSPageWaiter(browser_manager)
     
     @handle_exception
     async def upload_files(self, files: List[str], file_type: str) -> bool:
@@ -199,51 +203,25 @@ class XHSFileUploader(IFileUploader):
         # 根据文件类型设置不同的等待时间
         if file_type == "video":
             max_wait_time = XHSConfig.VIDEO_PROCESSING_TIME
-            check_interval = 5
+            success_selectors = [XHSSelectors.UPLOAD_SUCCESS, XHSSelectors.VIDEO_COMPLETE]
         else:
             max_wait_time = XHSConfig.FILE_UPLOAD_TIME
-            check_interval = 2
+            success_selectors = [XHSSelectors.UPLOAD_SUCCESS]
         
-        waited_time = 0
-        
-        while waited_time < max_wait_time:
-            try:
-                # 检查上传成功标识
-                success_elements = driver.find_elements(By.CSS_SELECTOR, XHSSelectors.UPLOAD_SUCCESS)
-                if success_elements and any(elem.is_displayed() for elem in success_elements):
-                    logger.info("✅ 检测到上传成功标识")
-                    return True
-                
-                # 检查上传错误标识
-                error_elements = driver.find_elements(By.CSS_SELECTOR, XHSSelectors.UPLOAD_ERROR)
-                if error_elements and any(elem.is_displayed() for elem in error_elements):
-                    logger.error("❌ 检测到上传错误标识")
-                    return False
-                
-                # 检查视频处理完成标识（仅视频文件）
-                if file_type == "video":
-                    complete_elements = driver.find_elements(By.CSS_SELECTOR, XHSSelectors.VIDEO_COMPLETE)
-                    if complete_elements and any(elem.is_displayed() for elem in complete_elements):
-                        logger.info("✅ 视频处理完成")
-                        return True
-                    
-                    # 检查视频处理中标识
-                    processing_elements = driver.find_elements(By.CSS_SELECTOR, XHSSelectors.VIDEO_PROCESSING)
-                    if processing_elements and any(elem.is_displayed() for elem in processing_elements):
-                        logger.info("🔄 视频处理中...")
-                
-                # 等待检查间隔
-                await asyncio.sleep(check_interval)
-                waited_time += check_interval
-                
-                # 每10秒打印一次进度
-                if waited_time % 10 == 0:
-                    logger.info(f"⏳ 上传进行中... 已等待{waited_time}秒")
-                
-            except Exception as e:
-                logger.warning(f"⚠️ 检查上传状态时出错: {e}")
-                await asyncio.sleep(check_interval)
-                waited_time += check_interval
+        # 页面内的MutationObserver记录上传状态，状态变化后立即返回
+        state = await self.page_waiter.wait_for_upload(
+            max_wait_time, "文件上传",
+            success=success_selectors,
+            error=[XHSSelectors.UPLOAD_ERROR],
+            progress=[XHSSelectors.UPLOAD_PROGRESS],
+            on_progress=self.progress_callback
+        )
+        if state == "success":
+            logger.info("✅ 检测到上传成功标识")
+            return True
+        if state == "error":
+            logger.error("❌ 检测到上传错误标识")
+            return False
         
         # 超时后的最后检查
         logger.warning(f"⏰ 等待上传超时({max_wait_time}秒)，进行最后检查...")
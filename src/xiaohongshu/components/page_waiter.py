@@ -0,0 +1,351 @@
+"""
+小红书页面等待器
+
+用短间隔轮询的条件等待替代固定时长的sleep，页面就绪后立即继续，并记录每个步骤的实际等待时间。
+文件上传状态由页面内的MutationObserver记录，Python端通过异步脚本等待状态变化，不再逐个元素检查可见性
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, Optional, Any, Sequence
+from selenium.webdriver.common.by import By
+
+from ..constants import XHSConfig
+from ...core.exceptions import PublishError
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 一次性返回页面就绪状态、DOM节点数和已发起的资源请求数，避免多次WebDriver往返
+_PAGE_STATE_SCRIPT = """
+return [
+    document.readyState,
+    document.getElementsByTagName('*').length,
+    (window.performance && performance.getEntriesByType)
+        ? performance.getEntriesByType('resource').length : 0
+];
+"""
+
+# 在页面中安装上传状态监视器（同一页面只创建一个MutationObserver，重复安装时只更新配置并重置状态）
+# 状态记录在window.__xhsUploadMonitor: state(pending/success/error)、progress(0-100)、text、version
+_UPLOAD_MONITOR_SCRIPT = """
+var m = window.__xhsUploadMonitor;
+if (!m) {
+    m = window.__xhsUploadMonitor = {listeners: [], scheduled: false};
+    m.visible = function (el) {
+        return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    };
+    m.find = function (selectors) {
+        for (var i = 0; i < selectors.length; i++) {
+            var sel = selectors[i], nodes = [];
+            try {
+                if (sel.indexOf('//') === 0) {
+                    var snap = document.evaluate(sel, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                    for (var j = 0; j < snap.snapshotLength; j++) nodes.push(snap.snapshotItem(j));
+                } else {
+                    nodes = document.querySelectorAll(sel);
+                }
+            } catch (e) { continue; }
+            for (var k = 0; k < nodes.length; k++) if (m.visible(nodes[k])) return nodes[k];
+        }
+        return null;
+    };
+    m.percent = function (el) {
+        var value = el.getAttribute('aria-valuenow');
+        if (value === null && el.tagName === 'PROGRESS') value = el.value / (el.max || 1) * 100;
+        if (value === null) {
+            var match = /(\\d{1,3}(?:\\.\\d+)?)\\s*%/.exec(el.textContent || '');
+            value = match ? match[1] : null;
+        }
+        return value === null || isNaN(parseFloat(value)) ? null : Math.max(0, Math.min(100, Math.round(parseFloat(value))));
+    };
+    m.evaluate = function () {
+        m.scheduled = false;
+        var cfg = m.cfg, state = m.state, progress = m.progress, text = m.text;
+        var errorEl = m.find(cfg.error);
+        var successEl = errorEl ? null : m.find(cfg.success);
+        if (errorEl) { state = 'error'; text = (errorEl.textContent || '').trim().slice(0, 200); }
+        else if (successEl) { state = 'success'; progress = 100; text = (successEl.textContent || '').trim().slice(0, 200); }
+        else {
+            var progressEl = m.find(cfg.progress);
+            if (progressEl) {
+                var percent = m.percent(progressEl);
+                if (percent !== null) progress = percent;
+                text = (progressEl.textContent || '').trim().slice(0, 200);
+            }
+        }
+        if (state !== m.state || progress !== m.progress || text !== m.text) {
+            m.state = state; m.progress = progress; m.text = text; m.version++;
+            var listeners = m.listeners.slice();
+            for (var i = 0; i < listeners.length; i++) listeners[i]();
+        }
+    };
+    m.schedule = function () {
+        if (!m.scheduled) { m.scheduled = true; setTimeout(m.evaluate, 50); }
+    };
+    m.observer = new MutationObserver(m.schedule);
+    m.observer.observe(document.documentElement, {
+        subtree: true, childList: true, characterData: true, attributes: true,
+        attributeFilter: ['class', 'style', 'hidden', 'value', 'aria-valuenow']
+    });
+}
+m.cfg = arguments[0];
+m.state = 'pending'; m.progress = null; m.text = ''; m.version = 0;
+m.evaluate();
+return true;
+"""
+
+# 等待上传状态变化：状态版本与arguments[0]不同时立即返回，否则最多等待arguments[1]毫秒；页面已刷新（没有监视器）时返回null
+_UPLOAD_WAIT_SCRIPT = """
+var version = arguments[0], waitMs = arguments[1], done = arguments[arguments.length - 1];
+var m = window.__xhsUploadMonitor;
+if (!m) { done(null); return; }
+var snapshot = function () { return {state: m.state, progress: m.progress, text: m.text, version: m.version}; };
+if (m.version !== version) { done(snapshot()); return; }
+var finished = false;
+var finish = function () {
+    if (finished) return;
+    finished = true;
+    m.listeners = m.listeners.filter(function (f) { return f !== finish; });
+    done(snapshot());
+};
+m.listeners.push(finish);
+setTimeout(finish, waitMs);
+"""
+
+# 单次异步脚本等待状态变化的最长时间（秒），需小于WebDriver的脚本超时
+_UPLOAD_WAIT_CHUNK = 5.0
+
+# 上传进度回调: on_progress(百分比, 页面上的进度文字)
+UploadProgressCallback = Callable[[int, str], None]
+
+
+class XHSPageWaiter:
+    """小红书页面条件等待器"""
+
+    def __init__(self, browser_manager, poll_interval: float = XHSConfig.WAIT_POLL_INTERVAL):
+        """
+        初始化页面等待器
+
+        Args:
+            browser_manager: 浏览器管理器
+            poll_interval: 条件轮询间隔（秒）
+        """
+        self.browser_manager = browser_manager
+        self.poll_interval = poll_interval
+        self.timings: Dict[str, float] = {}
+
+    @property
+    def driver(self):
+        """当前浏览器驱动"""
+        return self.browser_manager.driver
+
+    async def wait_until(self, condition: Callable[[Any], Any], timeout: float, step: str,
+                         raise_on_timeout: bool = False, poll_interval: Optional[float] = None) -> Any:
+        """
+        轮询等待条件成立
+
+        Args:
+            condition: 以driver为参数的条件函数，返回真值即视为成立（抛出异常视为未成立）
+            timeout: 最长等待时间（秒）
+            step: 步骤名称，用于日志和耗时统计
+            raise_on_timeout: 超时时是否抛出PublishError，否则返回None继续流程
+            poll_interval: 轮询间隔，默认使用初始化时的间隔
+
+        Returns:
+            条件函数的返回值，超时返回None
+        """
+        interval = poll_interval or self.poll_interval
+        start = time.monotonic()
+        deadline = start + timeout
+
+        while True:
+            try:
+                result = condition(self.driver)
+                if result:
+                    self._record(step, start)
+                    return result
+            except Exception as e:
+                logger.debug(f"等待条件检查出错({step}): {e}")
+
+            if time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(interval)
+
+        elapsed = self._record(step, start)
+        if raise_on_timeout:
+            raise PublishError(f"等待{step}超时({elapsed:.1f}秒)", publish_step=step)
+        logger.warning(f"⚠️ 等待{step}超时({elapsed:.1f}秒)，继续执行...")
+        return None
+
+    async def wait_for_page_ready(self, step: str, timeout: float = XHSConfig.PAGE_LOAD_TIME,
+                                  url_contains: Optional[str] = None) -> bool:
+        """
+        等待页面加载完成（document.readyState为complete，且URL符合预期）
+
+        Args:
+            step: 步骤名称
+            timeout: 最长等待时间（秒）
+            url_contains: 期望URL包含的片段
+        """
+        def page_ready(driver):
+            if url_contains and url_contains not in driver.current_url:
+                return False
+            return driver.execute_script("return document.readyState") == "complete"
+
+        return bool(await self.wait_until(page_ready, timeout, step))
+
+    async def wait_for_any_visible(self, selectors: Iterable[str], timeout: float, step: str,
+                                   raise_on_timeout: bool = False) -> Any:
+        """
+        等待任一选择器对应的元素可见
+
+        Args:
+            selectors: CSS选择器或XPath（以//开头）列表
+            timeout: 最长等待时间（秒）
+            step: 步骤名称
+            raise_on_timeout: 超时时是否抛出异常
+
+        Returns:
+            第一个可见的元素，超时返回None
+        """
+        selectors = list(selectors)
+
+        def any_visible(driver):
+            for selector in selectors:
+                by = By.XPATH if selector.startswith("//") else By.CSS_SELECTOR
+                for element in driver.find_elements(by, selector):
+                    if element.is_displayed():
+                        return element
+            return None
+
+        return await self.wait_until(any_visible, timeout, step, raise_on_timeout=raise_on_timeout)
+
+    async def wait_for_any_present(self, selectors: Iterable[str], timeout: float, step: str,
+                                   raise_on_timeout: bool = False) -> Any:
+        """
+        等待任一选择器对应的元素出现在DOM中（不要求可见，文件上传input通常是隐藏的）
+
+        Args:
+            selectors: CSS选择器或XPath（以//开头）列表
+            timeout: 最长等待时间（秒）
+            step: 步骤名称
+            raise_on_timeout: 超时时是否抛出异常
+
+        Returns:
+            第一个找到的元素，超时返回None
+        """
+        selectors = list(selectors)
+
+        def any_present(driver):
+            for selector in selectors:
+                by = By.XPATH if selector.startswith("//") else By.CSS_SELECTOR
+                elements = driver.find_elements(by, selector)
+                if elements:
+                    return elements[0]
+            return None
+
+        return await self.wait_until(any_present, timeout, step, raise_on_timeout=raise_on_timeout)
+
+    async def wait_for_dom_idle(self, step: str, timeout: float = XHSConfig.SHORT_WAIT_TIME,
+                                quiet_period: float = XHSConfig.DOM_QUIET_PERIOD) -> bool:
+        """
+        等待页面安静：DOM节点数和网络资源请求数在quiet_period内不再变化
+
+        用于没有明确完成标识的操作（例如点击后的界面切换、滚动后的懒加载）
+
+        Args:
+            step: 步骤名称
+            timeout: 最长等待时间（秒）
+            quiet_period: 需要保持不变的时长（秒）
+        """
+        state = {"last": None, "since": time.monotonic()}
+
+        def dom_idle(driver):
+            ready, node_count, resource_count = driver.execute_script(_PAGE_STATE_SCRIPT)
+            snapshot = (node_count, resource_count)
+            now = time.monotonic()
+            if snapshot != state["last"]:
+                state["last"] = snapshot
+                state["since"] = now
+                return False
+            return ready == "complete" and now - state["since"] >= quiet_period
+
+        return bool(await self.wait_until(dom_idle, timeout, step))
+
+    async def wait_for_upload(self, timeout: float, step: str, success: Sequence[str],
+                              error: Sequence[str] = (), progress: Sequence[str] = (),
+                              on_progress: Optional[UploadProgressCallback] = None) -> Optional[str]:
+        """
+        等待文件上传完成
+
+        在页面中安装MutationObserver，DOM变化时在页面内判断上传状态；Python端用异步脚本等待状态变化，
+        上传完成后几十毫秒内即可返回，每次状态变化只需要一次WebDriver调用
+
+        Args:
+            timeout: 最长等待时间（秒）
+            step: 步骤名称
+            success: 上传成功标识的CSS选择器或XPath（以//开头）
+            error: 上传失败标识
+            progress: 进度元素（读取aria-valuenow、progress的value或文字中的百分比）
+            on_progress: 进度回调，进度变化时调用
+
+        Returns:
+            'success'、'error'，超时返回None
+        """
+        config = {"success": list(success), "error": list(error), "progress": list(progress)}
+        start = time.monotonic()
+        deadline = start + timeout
+        installed = False
+        version = -1
+        last_progress = None
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                if not installed:
+                    self.driver.execute_script(_UPLOAD_MONITOR_SCRIPT, config)
+                    installed, version = True, -1
+                # 异步脚本会阻塞到状态变化，放到线程中执行避免阻塞事件循环
+                snapshot = await asyncio.to_thread(
+                    self.driver.execute_async_script, _UPLOAD_WAIT_SCRIPT, version,
+                    int(min(remaining, _UPLOAD_WAIT_CHUNK) * 1000)
+                )
+            except Exception as e:
+                logger.debug(f"读取上传状态出错({step}): {e}")
+                installed = False
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            if snapshot is None:
+                installed = False  # 页面已刷新，重新安装监视器
+                continue
+            version = snapshot["version"]
+
+            if snapshot["progress"] is not None and snapshot["progress"] != last_progress:
+                last_progress = snapshot["progress"]
+                logger.debug(f"📶 {step}进度: {last_progress}%")
+                if on_progress:
+                    try:
+                        on_progress(int(last_progress), snapshot["text"] or "")
+                    except Exception as e:
+                        logger.debug(f"上传进度回调出错: {e}")
+
+            if snapshot["state"] in ("success", "error"):
+                elapsed = self._record(step, start)
+                if snapshot["state"] == "error":
+                    logger.warning(f"⚠️ {step}失败({elapsed:.1f}秒): {snapshot['text']}")
+                return snapshot["state"]
+
+        elapsed = self._record(step, start)
+        logger.warning(f"⚠️ 等待{step}超时({elapsed:.1f}秒)，继续执行...")
+        return None
+
+    def _record(self, step: str, start: float) -> float:
+        """累计记录步骤等待耗时"""
+        elapsed = time.monotonic() - start
+        self.timings[step] = round(self.timings.get(step, 0.0) + elapsed, 3)
+        logger.debug(f"⏱️ {step}: 等待{elapsed:.2f}秒")
+        return elapsed
@@ -76,6 +76,9 @@ class XHSConfig:
     PAGE_LOAD_TIME = 20
     FILE_UPLOAD_TIME = 60
     VIDEO_PROCESSING_TIME = 120
+    MODE_SWITCH_TIME = 5
+    WAIT_POLL_INTERVAL = 0.25  # 条件等待的轮询间隔
+    DOM_QUIET_PERIOD = 0.5  # 页面无变化持续该时长即视为稳定
     
     # 重试配置
     MAX_RETRIES = 3
@@ -5,15 +5,19 @@
 """
 
 from .dashboard import collect_dashboard_data
-from .content_analysis import collect_content_analysis_data
+from .content_analysis import collect_content_analysis_data, collect_content_analysis_data_sync
 from .fans import collect_fans_data
-from .utils import clean_number, wait_for_element, extract_text_safely
+from .utils import clean_number, wait_for_element, extract_text_safely, run_in_collector
+from .parallel import collect_pages
 
 __all__ = [
     'collect_dashboard_data',
     'collect_content_analysis_data', 
+    'collect_content_analysis_data_sync',
     'collect_fans_data',
     'clean_number',
     'wait_for_element',
-    'extract_text_safely'
+    'extract_text_safely',
+    'run_in_collector',
+    'collect_pages'
 ] 
\ No newline at end of file
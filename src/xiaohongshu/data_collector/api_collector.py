@@ -0,0 +1,460 @@
+"""
+接口数据采集模块
+
+创作者中心页面本身通过XHR加载JSON数据。本模块借助Chrome性能日志捕获这些接口响应，
+直接解析成与页面元素采集相同结构的记录，省去逐个单元格的WebElement往返，也不受页面样式改版影响。
+捕获或解析失败时自动回退到页面元素采集。
+
+需要设置 COLLECTION_BACKEND=api，浏览器才会开启性能日志
+"""
+
+import base64
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .utils import clean_number, wait_for_page_load, run_in_collector
+from src.utils.logger import get_logger
+from src.data.storage_manager import get_storage_manager
+
+logger = get_logger(__name__)
+
+# 各页面加载数据的接口URL特征（子串匹配）
+DASHBOARD_API_KEYWORDS = ("/api/galaxy/creator/data/note_stats", "/api/galaxy/creator/home/")
+FANS_API_KEYWORDS = ("/api/galaxy/creator/data/fans",)
+NOTE_LIST_API_KEYWORDS = ("/api/galaxy/creator/data/note_detail", "/api/galaxy/creator/datacenter/note")
+
+# 接口字段名 -> 记录字段名（接口字段命名不统一，按顺序取第一个出现的）
+DASHBOARD_FIELD_ALIASES = {
+    "views": ("view_count", "read_count", "views", "watch_count"),
+    "likes": ("like_count", "liked_count", "likes"),
+    "collects": ("collect_count", "collected_count", "collects", "fav_count"),
+    "comments": ("comment_count", "comments"),
+    "shares": ("share_count", "shares"),
+    "interactions": ("interaction_count", "interactions", "engage_count")
+}
+
+FANS_FIELD_ALIASES = {
+    "total_fans": ("fans_count", "total_fans", "fans_total"),
+    "new_fans": ("rise_fans_count", "new_fans", "fans_increase"),
+    "lost_fans": ("leave_fans_count", "lost_fans", "fans_decrease")
+}
+
+NOTE_FIELD_ALIASES = {
+    "title": ("title", "note_title", "display_title"),
+    "publish_time": ("publish_time", "post_time", "create_time"),
+    "views": ("view_count", "read_count", "views"),
+    "likes": ("like_count", "liked_count", "likes"),
+    "comments": ("comment_count", "comments"),
+    "collects": ("collect_count", "collected_count", "collects"),
+    "fans_growth": ("rise_fans_count", "fans_growth", "follow_count"),
+    "shares": ("share_count", "shares"),
+    "avg_watch_time": ("avg_view_time", "avg_watch_time"),
+    "danmu_count": ("danmaku_count", "danmu_count")
+}
+
+
+# ==================== 网络响应捕获 ====================
+
+def parse_performance_entries(entries: Iterable[Dict[str, Any]],
+                              url_keywords: Iterable[str]) -> Tuple[Dict[str, str], set]:
+    """
+    解析Chrome性能日志，找出URL匹配的JSON响应
+
+    Args:
+        entries: driver.get_log("performance")返回的日志条目
+        url_keywords: URL特征子串
+
+    Returns:
+        (匹配的请求ID -> URL, 已加载完成的请求ID集合)
+    """
+    url_keywords = tuple(url_keywords)
+    matched: Dict[str, str] = {}
+    finished = set()
+
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+
+        method = message.get("method")
+        params = message.get("params", {})
+        if method == "Network.responseReceived":
+            response = params.get("response", {})
+            url = response.get("url", "")
+            if "json" in response.get("mimeType", "") and any(keyword in url for keyword in url_keywords):
+                matched[params.get("requestId")] = url
+        elif method == "Network.loadingFinished":
+            finished.add(params.get("requestId"))
+
+    return matched, finished
+
+
+def decode_response_body(body_result: Dict[str, Any]) -> Optional[Any]:
+    """解析Network.getResponseBody的返回值为JSON对象"""
+    body = body_result.get("body", "")
+    if body_result.get("base64Encoded"):
+        body = base64.b64decode(body).decode("utf-8")
+    try:
+        return json.loads(body)
+    except (TypeError, ValueError):
+        return None
+
+
+class NetworkCapture:
+    """基于Chrome性能日志的接口响应捕获器"""
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+        self._matched: Dict[str, str] = {}
+        self._finished: set = set()
+        self._fetched: set = set()
+
+    def reset(self) -> None:
+        """丢弃已产生的日志，只关注之后发起的请求"""
+        try:
+            self.driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"读取性能日志失败: {e}")
+        self._matched.clear()
+        self._finished.clear()
+        self._fetched.clear()
+
+    def wait_for_responses(self, url_keywords: Iterable[str], timeout: float = 15,
+                           poll_interval: float = 0.5, settle_time: float = 1.0) -> List[Dict[str, Any]]:
+        """
+        等待匹配的接口响应加载完成并读取响应体
+
+        Args:
+            url_keywords: URL特征子串
+            timeout: 最长等待时间（秒）
+            poll_interval: 轮询间隔（秒）
+            settle_time: 捕获到第一个响应后再等待的时间，收集同一页面的其余接口
+
+        Returns:
+            [{"url": 接口URL, "data": 解析后的JSON}]，超时返回已捕获的部分
+        """
+        url_keywords = tuple(url_keywords)
+        responses: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + timeout
+        settle_deadline = None
+
+        while time.monotonic() < deadline:
+            matched, finished = parse_performance_entries(self.driver.get_log("performance"), url_keywords)
+            self._matched.update(matched)
+            self._finished.update(finished)
+
+            for request_id, url in self._matched.items():
+                if request_id in self._fetched or request_id not in self._finished:
+                    continue
+                self._fetched.add(request_id)
+                try:
+                    body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                except Exception as e:
+                    logger.debug(f"读取接口响应失败 {url}: {e}")
+                    continue
+                data = decode_response_body(body)
+                if data is not None:
+                    responses.append({"url": url, "data": data})
+                    logger.debug(f"📡 捕获接口响应: {url}")
+
+            if responses:
+                settle_deadline = settle_deadline or time.monotonic() + settle_time
+                if time.monotonic() >= settle_deadline:
+                    break
+            time.sleep(poll_interval)
+
+        return responses
+
+
+# ==================== 响应解析 ====================
+
+def _find_value(payload: Any, aliases: Tuple[str, ...]) -> Any:
+    """在嵌套的JSON中按别名顺序查找第一个出现的字段值"""
+    stack = [payload]
+    found: Dict[str, Any] = {}
+    while stack:
+        node = stack.pop(0)
+        if isinstance(node, dict):
+            for alias in aliases:
+                if alias in node and alias not in found and not isinstance(node[alias], (dict, list)):
+                    found[alias] = node[alias]
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    for alias in aliases:
+        if alias in found:
+            return found[alias]
+    return None
+
+
+def _to_int(value: Any) -> int:
+    """接口数值可能是数字或带单位的字符串，统一转换为整数"""
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return int(value)
+    return clean_number(str(value))
+
+
+def _format_publish_time(value: Any) -> str:
+    """发布时间可能是毫秒/秒时间戳或字符串"""
+    if isinstance(value, (int, float)) and value > 0:
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds).strftime("%Y-%m-%d %H:%M")
+    return str(value or "").strip()
+
+
+def _find_note_items(payload: Any) -> List[Dict[str, Any]]:
+    """查找包含笔记标题字段的对象列表"""
+    title_aliases = NOTE_FIELD_ALIASES["title"]
+    stack = [payload]
+    while stack:
+        node = stack.pop(0)
+        if isinstance(node, list):
+            if node and all(isinstance(item, dict) for item in node) and \
+                    any(alias in node[0] for alias in title_aliases):
+                return node
+            stack.extend(node)
+        elif isinstance(node, dict):
+            stack.extend(node.values())
+    return []
+
+
+def parse_dashboard_response(payload: Any, dimension: str) -> Optional[Dict[str, Any]]:
+    """
+    解析账号概览接口响应
+
+    Args:
+        payload: 接口JSON
+        dimension: 时间维度（7天/30天）
+
+    Returns:
+        与页面采集相同结构的仪表板记录，未找到任何指标返回None
+    """
+    values = {field: _find_value(payload, aliases) for field, aliases in DASHBOARD_FIELD_ALIASES.items()}
+    if all(value is None for value in values.values()):
+        return None
+
+    record = {"dimension": dimension, "timestamp": time.time()}
+    record.update({field: _to_int(value) for field, value in values.items()})
+    if record["interactions"] == 0:
+        record["interactions"] = record["likes"] + record["collects"] + record["comments"] + record["shares"]
+    return record
+
+
+def parse_fans_response(payload: Any, dimension: str) -> Optional[Dict[str, Any]]:
+    """
+    解析粉丝数据接口响应
+
+    Args:
+        payload: 接口JSON
+        dimension: 时间维度（7天/30天）
+
+    Returns:
+        与页面采集相同结构的粉丝记录，未找到任何指标返回None
+    """
+    values = {field: _find_value(payload, aliases) for field, aliases in FANS_FIELD_ALIASES.items()}
+    if all(value is None for value in values.values()):
+        return None
+
+    record = {"dimension": dimension}
+    record.update({field: _to_int(value) for field, value in values.items()})
+    return record
+
+
+def parse_note_list_response(payload: Any, limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    解析笔记列表接口响应
+
+    Args:
+        payload: 接口JSON
+        limit: 最多返回的笔记数量
+
+    Returns:
+        与页面表格采集相同字段的笔记列表（字段见COLUMN_MAPPING）
+    """
+    notes = []
+    extract_time = datetime.now().isoformat()
+    for row_index, item in enumerate(_find_note_items(payload)[:limit]):
+        note = {"row_index": row_index, "extract_time": extract_time, "has_detail_button": False}
+        for field, aliases in NOTE_FIELD_ALIASES.items():
+            value = _find_value(item, aliases)
+            if field == "title":
+                note[field] = str(value or "").strip()
+            elif field == "publish_time":
+                note[field] = _format_publish_time(value)
+            elif field == "avg_watch_time":
+                note[field] = str(value) if value is not None else ""
+            else:
+                note[field] = _to_int(value)
+        if note["title"]:
+            notes.append(note)
+    return notes
+
+
+# ==================== 采集入口 ====================
+
+def _capture_dimensions(driver: WebDriver, url: str, keywords: Tuple[str, ...], parser,
+                        switch_to_30day) -> List[Dict[str, Any]]:
+    """打开页面捕获7天维度接口，再切换到30天维度捕获一次"""
+    capture = NetworkCapture(driver)
+    capture.reset()
+    driver.get(url)
+    wait_for_page_load(driver)
+
+    records = []
+    for dimension in ("7天", "30天"):
+        if dimension == "30天":
+            capture.reset()
+            if not switch_to_30day(driver):
+                logger.warning("⚠️ 30天维度切换失败，只保留7天数据")
+                break
+
+        record = None
+        for response in capture.wait_for_responses(keywords):
+            record = parser(response["data"], dimension)
+            if record:
+                break
+        if record:
+            records.append(record)
+            logger.info(f"📡 {dimension}维度接口数据: {record}")
+        else:
+            logger.warning(f"⚠️ 未捕获到{dimension}维度的接口数据")
+    return records
+
+
+def collect_dashboard_data_via_api(driver: WebDriver, save_data: bool = True) -> Dict[str, Any]:
+    """
+    通过接口响应采集仪表板数据，失败时回退到页面元素采集
+
+    Args:
+        driver: WebDriver实例（需开启性能日志）
+        save_data: 是否保存数据到存储
+    """
+    from .dashboard import collect_dashboard_data, _switch_to_30day_dimension
+
+    logger.info("📡 通过接口采集仪表板数据...")
+    try:
+        all_data = _capture_dimensions(driver, "https://creator.xiaohongshu.com/new/home",
+                                       DASHBOARD_API_KEYWORDS, parse_dashboard_response,
+                                       _switch_to_30day_dimension)
+    except Exception as e:
+        logger.warning(f"⚠️ 接口采集仪表板数据出错: {e}")
+        all_data = []
+
+    if not all_data:
+        logger.warning("⚠️ 接口采集未获得仪表板数据，回退到页面元素采集")
+        return collect_dashboard_data(driver, save_data=save_data)
+
+    if save_data:
+        get_storage_manager().save_dashboard_data(all_data)
+        logger.info(f"✅ 仪表板数据保存成功，共保存 {len(all_data)} 个维度的数据")
+
+    return {
+        "success": True,
+        "data": all_data,
+        "source": "api",
+        "message": f"成功采集 {len(all_data)} 个维度的仪表板数据"
+    }
+
+
+def collect_fans_data_via_api(driver: WebDriver, save_data: bool = True) -> Dict[str, Any]:
+    """
+    通过接口响应采集粉丝数据，失败时回退到页面元素采集
+
+    Args:
+        driver: WebDriver实例（需开启性能日志）
+        save_data: 是否保存数据到存储
+    """
+    from .fans import collect_fans_data, _switch_to_30day_dimension
+
+    logger.info("📡 通过接口采集粉丝数据...")
+    collect_time = time.strftime('%Y-%m-%d %H:%M:%S')
+    try:
+        all_data = _capture_dimensions(driver, "https://creator.xiaohongshu.com/creator/fans",
+                                       FANS_API_KEYWORDS, parse_fans_response,
+                                       _switch_to_30day_dimension)
+    except Exception as e:
+        logger.warning(f"⚠️ 接口采集粉丝数据出错: {e}")
+        all_data = []
+
+    if not all_data:
+        logger.warning("⚠️ 接口采集未获得粉丝数据，回退到页面元素采集")
+        return collect_fans_data(driver, save_data=save_data)
+
+    if save_data:
+        get_storage_manager().save_fans_data([{"timestamp": collect_time, **item} for item in all_data])
+        logger.info("💾 粉丝数据已保存到存储")
+
+    return {
+        "success": True,
+        "data": all_data,
+        "collect_time": collect_time,
+        "source": "api",
+        "error": None
+    }
+
+
+def collect_content_analysis_data_via_api_sync(driver: WebDriver, limit: int = 50,
+                                               save_data: bool = True) -> Dict[str, Any]:
+    """
+    通过接口响应采集内容分析的笔记列表数据，失败时回退到页面元素采集
+
+    接口模式只采集列表指标，不逐篇打开详情页，观众来源/画像字段保持默认值
+
+    Args:
+        driver: WebDriver实例（需开启性能日志）
+        limit: 最大采集笔记数量
+        save_data: 是否保存数据到存储
+    """
+    from .content_analysis import (
+        collect_content_analysis_data_sync, _save_notes, _generate_summary
+    )
+
+    logger.info("📡 通过接口采集内容分析数据...")
+    notes: List[Dict[str, Any]] = []
+    try:
+        capture = NetworkCapture(driver)
+        capture.reset()
+        driver.get("https://creator.xiaohongshu.com/statistics/data-analysis")
+        wait_for_page_load(driver)
+        for response in capture.wait_for_responses(NOTE_LIST_API_KEYWORDS, timeout=30):
+            notes = parse_note_list_response(response["data"], limit)
+            if notes:
+                break
+    except Exception as e:
+        logger.warning(f"⚠️ 接口采集内容分析数据出错: {e}")
+
+    if not notes:
+        logger.warning("⚠️ 接口采集未获得笔记列表，回退到页面元素采集")
+        return collect_content_analysis_data_sync(driver, limit=limit, save_data=save_data)
+
+    logger.info(f"✅ 接口采集到 {len(notes)} 篇笔记")
+    if save_data:
+        try:
+            _save_notes(notes)
+        except Exception as e:
+            logger.error(f"❌ 保存内容分析数据时出错: {e}")
+
+    return {
+        "success": True,
+        "collect_time": datetime.now().isoformat(),
+        "page_url": driver.current_url,
+        "source": "api",
+        "notes": notes,
+        "summary": _generate_summary(notes)
+    }
+
+
+async def collect_content_analysis_data_via_api(driver: WebDriver, limit: int = 50,
+                                                save_data: bool = True) -> Dict[str, Any]:
+    """通过接口采集内容分析数据（异步版本，在数据采集线程池中执行）"""
+    return await run_in_collector(collect_content_analysis_data_via_api_sync, driver,
+                                  limit=limit, save_data=save_data)
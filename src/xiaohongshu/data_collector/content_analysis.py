@@ -7,7 +7,10 @@
 3. 观众分析数据：性别分布、年龄分布、城市分布、兴趣分布
 """
 
+import os
+import queue
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from selenium.webdriver.common.by import By
@@ -18,13 +21,22 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 from .utils import (
     clean_number, wait_for_element, extract_text_safely, 
-    find_element_by_selectors, wait_for_page_load, safe_click, scroll_to_element
+    find_element_by_selectors, wait_for_page_load, safe_click, scroll_to_element,
+    run_in_collector
 )
+from .detail_cache import NoteDetailCache
+from .note_state import NoteStateIndex
 from src.utils.logger import get_logger
 from src.data.storage_manager import get_storage_manager
 
 logger = get_logger(__name__)
 
+# 内容分析页面地址
+CONTENT_ANALYSIS_URL = "https://creator.xiaohongshu.com/statistics/data-analysis"
+
+# 增量保存时等待写回队列落盘的最长时间（秒）
+NOTE_PERSIST_TIMEOUT = 60
+
 # 内容分析页面选择器配置
 CONTENT_ANALYSIS_SELECTORS = {
     # 文章列表页面选择器 - 基于Playwright调试结果更新
@@ -62,6 +74,24 @@ COLUMN_MAPPING = {
 async def collect_content_analysis_data(driver: WebDriver, date: Optional[str] = None, 
                                  limit: int = 50, save_data: bool = True) -> Dict[str, Any]:
     """
+    采集内容分析数据（异步版本，在数据采集线程池中执行，不阻塞事件循环）
+    
+    Args:
+        driver: WebDriver实例
+        date: 采集日期，默认当天
+        limit: 最大采集笔记数量
+        save_data: 是否保存数据到存储
+        
+    Returns:
+        包含内容分析数据的字典
+    """
+    return await run_in_collector(collect_content_analysis_data_sync, driver, date=date,
+                                  limit=limit, save_data=save_data)
+
+
+def collect_content_analysis_data_sync(driver: WebDriver, date: Optional[str] = None, 
+                                       limit: int = 50, save_data: bool = True) -> Dict[str, Any]:
+    """
     采集内容分析数据
     
     Args:
@@ -76,7 +106,7 @@ async def collect_content_analysis_data(driver: WebDriver, date: Optional[str] =
     logger.info("📊 开始采集内容分析数据...")
     
     # 导航到内容分析页面
-    content_url = "https://creator.xiaohongshu.com/statistics/data-analysis"
+    content_url = CONTENT_ANALYSIS_URL
     try:
         driver.get(content_url)
         logger.info(f"📍 访问内容分析页面: {content_url}")
@@ -140,11 +170,7 @@ async def collect_content_analysis_data(driver: WebDriver, date: Optional[str] =
         # 保存数据到存储
         if save_data and enhanced_notes_data:
             try:
-                # 格式化数据用于存储
-                formatted_notes = _format_notes_for_storage(enhanced_notes_data)
-                storage_manager = get_storage_manager()
-                storage_manager.save_content_analysis_data(formatted_notes)
-                logger.info("💾 内容分析数据已保存到存储")
+                content_data["saved_count"] = _save_notes(enhanced_notes_data)
             except Exception as e:
                 logger.error(f"❌ 保存内容分析数据时出错: {e}")
         
@@ -156,8 +182,90 @@ async def collect_content_analysis_data(driver: WebDriver, date: Optional[str] =
     return content_data
 
 
+# 表头行关键词，包含这些关键词的行不是笔记数据
+HEADER_KEYWORDS = ['笔记基础信息', '观看', '点赞', '评论', '收藏', '涨粉', '分享', '操作']
+
+# 单元格选择器（按顺序尝试）
+CELL_SELECTORS = ['.el-table__cell', 'td', 'th', '[class*="cell"]']
+
+# 操作列中的详情数据按钮选择器（按顺序尝试）
+DETAIL_BUTTON_SELECTORS = [
+    '.note-detail',
+    'button[class*="detail"]',
+    'a[class*="detail"]',
+    'span[class*="detail"]',
+    'button:contains("详情")',
+    'a:contains("详情")',
+    'button',  # 最后尝试任何按钮
+    'a'        # 最后尝试任何链接
+]
+
+# 在浏览器中一次性序列化整个表格：返回每行的单元格文本和详情按钮元素
+NOTE_TABLE_SCRIPT = """
+const [rowSelectors, headerKeywords, cellSelectors, detailSelectors, actionIndex, limit] = arguments;
+let rows = [];
+for (const selector of rowSelectors) {
+    rows = Array.from(document.querySelectorAll(selector));
+    if (rows.length) break;
+}
+const result = [];
+for (const row of rows) {
+    const rowText = (row.innerText || '').trim();
+    if (!rowText || headerKeywords.some(keyword => rowText.includes(keyword))) continue;
+
+    let cells = [];
+    for (const selector of cellSelectors) {
+        cells = Array.from(row.querySelectorAll(selector));
+        if (cells.length) break;
+    }
+
+    let detail = null;
+    const actionCell = cells[actionIndex];
+    if (actionCell) {
+        for (const selector of detailSelectors) {
+            try { detail = actionCell.querySelector(selector); } catch (e) { detail = null; }
+            if (detail) break;
+        }
+    }
+
+    result.push({cells: cells.map(cell => (cell.innerText || '').trim()), detail: detail});
+    if (result.length >= limit) break;
+}
+return result;
+"""
+
+
 def _collect_notes_list_data(driver: WebDriver, limit: int) -> List[Dict[str, Any]]:
-    """采集笔记列表数据（基于Playwright测试结果）"""
+    """采集笔记列表数据：一次脚本调用取回整个表格，失败时回退到逐行提取"""
+    action_index = next(index for index, field in COLUMN_MAPPING.items() if field == 'actions')
+    
+    try:
+        rows = driver.execute_script(
+            NOTE_TABLE_SCRIPT, CONTENT_ANALYSIS_SELECTORS['note_rows'], HEADER_KEYWORDS,
+            CELL_SELECTORS, DETAIL_BUTTON_SELECTORS, action_index, limit
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ 批量提取表格失败，回退到逐行提取: {e}")
+        return _collect_notes_list_data_by_rows(driver, limit)
+    
+    if not rows:
+        logger.warning("⚠️ 未找到任何笔记行")
+        return []
+    
+    logger.info(f"📋 批量提取到 {len(rows)} 行有效数据")
+    
+    notes_data = []
+    for i, row in enumerate(rows):
+        note_data = _build_note_data(row.get('cells') or [], i, row.get('detail'))
+        if note_data:
+            notes_data.append(note_data)
+            logger.debug(f"📝 笔记 {i+1}: {note_data.get('title', 'Unknown')}")
+    
+    return notes_data
+
+
+def _collect_notes_list_data_by_rows(driver: WebDriver, limit: int) -> List[Dict[str, Any]]:
+    """逐行采集笔记列表数据（基于Playwright测试结果）"""
     notes_data = []
     
     try:
@@ -176,14 +284,13 @@ def _collect_notes_list_data(driver: WebDriver, limit: int) -> List[Dict[str, An
             return notes_data
         
         # 过滤掉表头行 - 跳过包含"笔记基础信息"、"观看"、"点赞"等表头关键词的行
-        header_keywords = ['笔记基础信息', '观看', '点赞', '评论', '收藏', '涨粉', '分享', '操作']
         filtered_rows = []
         
         for row in note_rows:
             try:
                 row_text = row.text.strip()
                 # 检查是否为表头行
-                is_header = any(keyword in row_text for keyword in header_keywords)
+                is_header = any(keyword in row_text for keyword in HEADER_KEYWORDS)
                 if not is_header and row_text:  # 不是表头且有内容
                     filtered_rows.append(row)
             except:
@@ -209,144 +316,290 @@ def _collect_notes_list_data(driver: WebDriver, limit: int) -> List[Dict[str, An
 
 
 def _extract_note_data_from_row(row, row_index: int) -> Optional[Dict[str, Any]]:
-    """从表格行中提取笔记数据（基于Playwright测试结果）"""
+    """从表格行元素中提取笔记数据"""
     try:
         # 查找行中的所有单元格 - 使用更通用的选择器
-        cell_selectors = ['.el-table__cell', 'td', 'th', '[class*="cell"]']
         cells = []
         
-        for selector in cell_selectors:
+        for selector in CELL_SELECTORS:
             cells = row.find_elements(By.CSS_SELECTOR, selector)
             if cells:
                 logger.debug(f"使用选择器 {selector} 找到 {len(cells)} 个单元格")
                 break
         
-        if len(cells) < 3:  # 至少需要标题、时间、数据
-            logger.warning(f"⚠️ 行 {row_index} 单元格数量不足: {len(cells)}")
-            return None
+        cell_texts = [extract_text_safely(cell) for cell in cells]
         
-        note_data = {
-            "row_index": row_index,
-            "extract_time": datetime.now().isoformat()
-        }
-        
-        # 按列索引提取数据
+        # 操作列，查找详情数据按钮 - 使用多个选择器
+        detail_button = None
         for col_index, cell in enumerate(cells):
-            try:
-                cell_text = extract_text_safely(cell)
-                if not cell_text:
-                    continue
-                
-                field_name = COLUMN_MAPPING.get(col_index, f"column_{col_index}")
-                
-                if field_name == 'title':
-                    # 标题列，提取笔记标题 - 过滤掉"发布于"及其后面的内容
-                    title_text = cell_text.strip()
-                    if '发布于' in title_text:
-                        title_text = title_text.split('发布于')[0].strip()
-                    note_data['title'] = title_text
-                    
-                elif field_name == 'publish_time':
-                    # 发布时间列
-                    note_data['publish_time'] = cell_text.strip()
-                    
-                elif field_name in ['views', 'likes', 'comments', 'collects', 'fans_growth', 'shares', 'danmu_count']:
-                    # 数值列，清理并转换为整数
-                    cleaned_value = clean_number(cell_text)
-                    note_data[field_name] = cleaned_value
-                    
-                elif field_name == 'avg_watch_time':
-                    # 时长列，保持原始格式
-                    note_data[field_name] = cell_text.strip()
-                    
-                elif field_name == 'actions':
-                    # 操作列，查找详情数据按钮 - 使用多个选择器
-                    detail_button_selectors = [
-                        '.note-detail',
-                        'button[class*="detail"]',
-                        'a[class*="detail"]',
-                        'span[class*="detail"]',
-                        'button:contains("详情")',
-                        'a:contains("详情")',
-                        'button',  # 最后尝试任何按钮
-                        'a'        # 最后尝试任何链接
-                    ]
-                    
-                    detail_button = None
-                    for btn_selector in detail_button_selectors:
-                        try:
-                            detail_button = cell.find_element(By.CSS_SELECTOR, btn_selector)
-                            if detail_button:
-                                logger.debug(f"找到详情按钮，使用选择器: {btn_selector}")
-                                break
-                        except:
-                            continue
-                    
-                    if detail_button:
-                        note_data['has_detail_button'] = True
-                        note_data['detail_button_element'] = detail_button
-                    else:
-                        note_data['has_detail_button'] = False
-                    
-            except Exception as e:
-                logger.debug(f"处理列 {col_index} 时出错: {e}")
+            if COLUMN_MAPPING.get(col_index) != 'actions':
                 continue
+            for btn_selector in DETAIL_BUTTON_SELECTORS:
+                try:
+                    detail_button = cell.find_element(By.CSS_SELECTOR, btn_selector)
+                    if detail_button:
+                        logger.debug(f"找到详情按钮，使用选择器: {btn_selector}")
+                        break
+                except:
+                    continue
         
-        return note_data if note_data.get('title') else None
+        return _build_note_data(cell_texts, row_index, detail_button)
         
     except Exception as e:
         logger.warning(f"⚠️ 提取行数据时出错: {e}")
         return None
 
 
-def _enhance_notes_with_detail_data(driver: WebDriver, notes_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """为每篇笔记采集详细数据"""
-    enhanced_notes = []
+def _build_note_data(cell_texts: List[str], row_index: int, detail_button=None) -> Optional[Dict[str, Any]]:
+    """
+    按列索引把单元格文本转换为笔记数据
     
-    for i, note in enumerate(notes_data):
+    Args:
+        cell_texts: 按列顺序排列的单元格文本
+        row_index: 行序号
+        detail_button: 详情数据按钮元素（可选）
+        
+    Returns:
+        笔记数据字典，没有标题时返回None
+    """
+    if len(cell_texts) < 3:  # 至少需要标题、时间、数据
+        logger.warning(f"⚠️ 行 {row_index} 单元格数量不足: {len(cell_texts)}")
+        return None
+    
+    note_data = {
+        "row_index": row_index,
+        "extract_time": datetime.now().isoformat()
+    }
+    
+    # 按列索引提取数据
+    for col_index, cell_text in enumerate(cell_texts):
         try:
-            logger.info(f"📊 采集笔记 {i+1}/{len(notes_data)} 的详细数据: {note.get('title', 'Unknown')}")
+            field_name = COLUMN_MAPPING.get(col_index, f"column_{col_index}")
             
-            # 点击详情数据按钮
-            if note.get('has_detail_button') and note.get('detail_button_element'):
-                detail_button = note['detail_button_element']
-                
-                # 滚动到按钮可见
-                driver.execute_script("arguments[0].scrollIntoView(true);", detail_button)
-                time.sleep(1)
-                
-                # 点击详情按钮
-                detail_button.click()
-                logger.info(f"✅ 成功点击详情数据按钮")
-                
-                # 等待详情页面加载
-                time.sleep(3)
-                
-                # 采集详情页面数据
-                detail_data = _collect_detail_page_data(driver)
+            if field_name == 'actions':
+                # 操作列，记录详情数据按钮
+                note_data['has_detail_button'] = detail_button is not None
+                if detail_button is not None:
+                    note_data['detail_button_element'] = detail_button
+                continue
+            
+            if not cell_text:
+                continue
+            
+            if field_name == 'title':
+                # 标题列，提取笔记标题 - 过滤掉"发布于"及其后面的内容
+                note_data['title'] = _clean_title(cell_text)
                 
-                # 合并数据
-                enhanced_note = {**note, **detail_data}
-                enhanced_notes.append(enhanced_note)
+            elif field_name == 'publish_time':
+                # 发布时间列
+                note_data['publish_time'] = cell_text.strip()
                 
-                # 返回列表页面
-                _return_to_list_page(driver)
+            elif field_name in ['views', 'likes', 'comments', 'collects', 'fans_growth', 'shares', 'danmu_count']:
+                # 数值列，清理并转换为整数
+                note_data[field_name] = clean_number(cell_text)
                 
-            else:
-                logger.warning(f"⚠️ 笔记 {note.get('title')} 没有详情按钮")
-                enhanced_notes.append(note)
+            elif field_name == 'avg_watch_time':
+                # 时长列，保持原始格式
+                note_data[field_name] = cell_text.strip()
                 
+        except Exception as e:
+            logger.debug(f"处理列 {col_index} 时出错: {e}")
+            continue
+    
+    return note_data if note_data.get('title') else None
+
+
+def _clean_title(cell_text: str) -> str:
+    """清理标题列文本：去掉"发布于"及其后面的内容"""
+    title_text = cell_text.strip()
+    if '发布于' in title_text:
+        title_text = title_text.split('发布于')[0].strip()
+    return title_text
+
+
+def _enhance_notes_with_detail_data(driver: WebDriver, notes_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    为每篇笔记采集详细数据
+    
+    列表指标与上次采集相同的笔记直接复用缓存的详情数据；其余笔记在启用浏览器驱动池时，
+    由当前浏览器和从驱动池借到的空闲浏览器（最多CONTENT_DETAIL_WORKERS个）并发打开详情页采集
+    """
+    cache = NoteDetailCache() if os.getenv('CONTENT_DETAIL_CACHE', 'true').lower() == 'true' else None
+    details: Dict[int, Dict[str, Any]] = {}
+    pending = []
+    
+    for i, note in enumerate(notes_data):
+        cached = cache.get(note) if cache else None
+        if cached is not None:
+            details[i] = cached
+        elif note.get('has_detail_button'):
+            pending.append(i)
+        else:
+            logger.warning(f"⚠️ 笔记 {note.get('title')} 没有详情按钮")
+    
+    if details:
+        logger.info(f"♻️ {len(details)} 篇笔记指标未变化，复用缓存的详情数据")
+    
+    if pending:
+        from src.core.driver_pool import get_driver_pool
+        driver_pool = get_driver_pool()
+        workers = min(int(os.getenv('CONTENT_DETAIL_WORKERS', '3')), len(pending), driver_pool.max_size)
+        
+        start = time.monotonic()
+        if driver_pool.enabled and workers > 1:
+            collected = _collect_details_concurrently(driver, driver_pool, notes_data, pending, workers)
+        else:
+            collected = _collect_details_sequentially(driver, notes_data, pending)
+        logger.info(f"📊 采集 {len(collected)}/{len(pending)} 篇笔记详情，耗时 {time.monotonic() - start:.1f}秒")
+        
+        for i, detail in collected.items():
+            details[i] = detail
+            if cache and _has_detail_values(detail):
+                cache.put(notes_data[i], detail)
+    
+    if cache:
+        cache.save()
+    
+    return [{**note, **details.get(i, {})} for i, note in enumerate(notes_data)]
+
+
+def _collect_details_sequentially(driver: WebDriver, notes_data: List[Dict[str, Any]],
+                                  pending: List[int]) -> Dict[int, Dict[str, Any]]:
+    """使用当前浏览器依次采集笔记详情"""
+    jobs = queue.Queue()
+    for i in pending:
+        jobs.put(i)
+    
+    results: Dict[int, Dict[str, Any]] = {}
+    _detail_worker(driver, notes_data, jobs, results)
+    return results
+
+
+def _collect_details_concurrently(driver: WebDriver, driver_pool, notes_data: List[Dict[str, Any]],
+                                  pending: List[int], workers: int) -> Dict[int, Dict[str, Any]]:
+    """
+    当前浏览器与从驱动池借到的空闲浏览器共同消费详情采集队列
+    
+    只借用同一账号已启动的空闲浏览器（不等待、不新建、不回收其他账号的浏览器），
+    借不到时由已有的浏览器继续处理剩余笔记
+    """
+    jobs = queue.Queue()
+    for i in pending:
+        jobs.put(i)
+    
+    results: Dict[int, Dict[str, Any]] = {}
+    
+    def leased_worker(worker_index: int) -> None:
+        try:
+            browser_manager = driver_pool.checkout(timeout=0, launch=False)
+        except Exception as e:
+            logger.debug(f"详情采集线程 {worker_index} 未借到空闲浏览器: {e}")
+            return
+        
+        discard = False
+        try:
+            _detail_worker(browser_manager.driver, notes_data, jobs, results)
+        except Exception as e:
+            discard = True
+            logger.warning(f"⚠️ 详情采集线程 {worker_index} 出错: {e}")
+        finally:
+            driver_pool.checkin(browser_manager, discard=discard)
+    
+    logger.info(f"🚀 使用最多 {workers} 个浏览器并发采集 {len(pending)} 篇笔记详情")
+    with ThreadPoolExecutor(max_workers=workers - 1, thread_name_prefix="xhs-detail") as executor:
+        futures = [executor.submit(leased_worker, n) for n in range(1, workers)]
+        # 当前浏览器也参与采集
+        _detail_worker(driver, notes_data, jobs, results)
+        for future in futures:
+            future.result()
+    
+    return results
+
+
+def _detail_worker(driver: WebDriver, notes_data: List[Dict[str, Any]], jobs: "queue.Queue[int]",
+                   results: Dict[int, Dict[str, Any]]) -> None:
+    """从队列中取出笔记，逐篇打开详情页采集，直到队列为空"""
+    while True:
+        try:
+            i = jobs.get_nowait()
+        except queue.Empty:
+            return
+        
+        note = notes_data[i]
+        try:
+            logger.info(f"📊 采集笔记 {i+1}/{len(notes_data)} 的详细数据: {note.get('title', 'Unknown')}")
+            detail_data = _collect_note_detail(driver, note)
+            if detail_data is not None:
+                results[i] = detail_data
         except Exception as e:
             logger.error(f"❌ 采集笔记详细数据时出错: {e}")
-            enhanced_notes.append(note)  # 保留基础数据
-            
             # 尝试返回列表页面
             try:
                 _return_to_list_page(driver)
             except:
                 pass
+
+
+def _collect_note_detail(driver: WebDriver, note: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """在指定浏览器中打开笔记详情页并采集数据，完成后返回列表页面"""
+    if "data-analysis" not in driver.current_url:
+        driver.get(CONTENT_ANALYSIS_URL)
+        wait_for_page_load(driver, timeout=30)
+    
+    # 每次都在当前页面重新定位按钮：返回列表页后之前取到的元素已失效，其他浏览器也无法使用
+    detail_button = _locate_detail_button(driver, note.get('title', ''), note.get('row_index'))
+    if detail_button is None:
+        logger.warning(f"⚠️ 未找到笔记 {note.get('title')} 的详情按钮")
+        return None
+    
+    driver.execute_script("arguments[0].scrollIntoView(true);", detail_button)
+    detail_button.click()
+    logger.info(f"✅ 成功点击详情数据按钮")
+    
+    # 等待详情页面加载并采集
+    wait_for_page_load(driver, timeout=10)
+    detail_data = _collect_detail_page_data(driver)
+    
+    # 返回列表页面
+    _return_to_list_page(driver)
+    return detail_data
+
+
+def _locate_detail_button(driver: WebDriver, title: str, row_index: Optional[int] = None, timeout: float = 20):
+    """
+    在列表页中定位笔记的详情按钮（等待表格渲染）
+    
+    按采集列表时的行序号定位并核对标题，多篇笔记同名时不会打开其他笔记的详情；
+    行序号对不上（列表顺序变化）时，只在标题唯一时按标题定位
+    """
+    action_index = next(index for index, field in COLUMN_MAPPING.items() if field == 'actions')
+    deadline = time.monotonic() + timeout
     
-    return enhanced_notes
+    while True:
+        try:
+            rows = driver.execute_script(
+                NOTE_TABLE_SCRIPT, CONTENT_ANALYSIS_SELECTORS['note_rows'], HEADER_KEYWORDS,
+                CELL_SELECTORS, DETAIL_BUTTON_SELECTORS, action_index, 1000
+            ) or []
+            titles = [_clean_title((row.get('cells') or [''])[0]) for row in rows]
+            if row_index is not None and row_index < len(rows) and titles[row_index] == title:
+                if rows[row_index].get('detail'):
+                    return rows[row_index]['detail']
+            elif titles.count(title) == 1:
+                row = rows[titles.index(title)]
+                if row.get('detail'):
+                    return row['detail']
+        except Exception as e:
+            logger.debug(f"定位详情按钮出错: {e}")
+        
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(0.5)
+
+
+def _has_detail_values(detail_data: Dict[str, Any]) -> bool:
+    """详情数据是否采集到了内容（全部为默认值时不写入缓存，下次重新采集）"""
+    return any(value not in ("0%", "") for value in detail_data.values())
 
 
 def _collect_detail_page_data(driver: WebDriver) -> Dict[str, Any]:
@@ -534,7 +787,7 @@ def _return_to_list_page(driver: WebDriver) -> None:
             return
         
         # 方法2：直接导航到列表页面
-        driver.get("https://creator.xiaohongshu.com/statistics/data-analysis")
+        driver.get(CONTENT_ANALYSIS_URL)
         time.sleep(3)
         logger.info("✅ 重新导航到列表页面")
         
@@ -542,6 +795,41 @@ def _return_to_list_page(driver: WebDriver) -> None:
         logger.warning(f"⚠️ 返回列表页面失败: {e}")
 
 
+def _save_notes(notes_data: List[Dict[str, Any]]) -> int:
+    """
+    保存笔记数据到存储
+    
+    启用增量采集（INCREMENTAL_COLLECTION=true）时，只追加新增或指标有变化的笔记，
+    否则按日期覆盖保存全部笔记
+    
+    Returns:
+        实际写入的笔记数量
+    """
+    # 格式化数据用于存储
+    formatted_notes = _format_notes_for_storage(notes_data)
+    storage_manager = get_storage_manager()
+    
+    if os.getenv('INCREMENTAL_COLLECTION', 'false').lower() != 'true':
+        storage_manager.save_content_analysis_data(formatted_notes)
+        logger.info("💾 内容分析数据已保存到存储")
+        return len(formatted_notes)
+    
+    state_index = NoteStateIndex()
+    changed_notes = state_index.changed_notes(formatted_notes)
+    if not changed_notes:
+        logger.info(f"💾 {len(formatted_notes)} 篇笔记均无变化，跳过保存")
+        return 0
+    
+    storage_manager.append_content_analysis_data(changed_notes)
+    # 启用写回队列时追加只是入队，确认落盘成功后才记入索引，否则下次采集重新保存
+    if not storage_manager.flush(timeout=NOTE_PERSIST_TIMEOUT):
+        logger.warning(f"⚠️ {len(changed_notes)} 篇笔记未确认写入，下次采集时重新保存")
+        return 0
+    state_index.mark_persisted(changed_notes, seen_notes=formatted_notes)
+    logger.info(f"💾 增量保存 {len(changed_notes)}/{len(formatted_notes)} 篇有变化的笔记")
+    return len(changed_notes)
+
+
 def _format_notes_for_storage(notes_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """格式化笔记数据用于存储"""
     formatted_notes = []
@@ -0,0 +1,105 @@
+"""
+笔记详情数据缓存模块
+
+笔记详情页（观众来源、观众分析）的采集需要逐篇打开页面，代价很高。
+缓存按笔记记录上次采集到的详情数据及当时的列表指标，指标没有变化的笔记直接复用缓存，无需再次打开详情页
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 参与指纹计算的列表指标：任一指标变化都说明详情数据可能已变化
+FINGERPRINT_FIELDS = ('views', 'likes', 'comments', 'collects', 'fans_growth', 'shares', 'danmu_count')
+
+
+def note_key(note: Dict[str, Any]) -> str:
+    """笔记唯一标识：标题 + 发布时间"""
+    return f"{note.get('title', '')}|{note.get('publish_time', '')}"
+
+
+def metrics_fingerprint(note: Dict[str, Any]) -> Tuple[Any, ...]:
+    """笔记列表指标指纹"""
+    return tuple(note.get(field, 0) for field in FINGERPRINT_FIELDS)
+
+
+class NoteDetailCache:
+    """笔记详情数据缓存（JSON文件持久化，线程安全）"""
+
+    def __init__(self, cache_file: Optional[str] = None):
+        """
+        初始化详情缓存
+
+        Args:
+            cache_file: 缓存文件路径，默认为 {DATA_STORAGE_PATH}/cache/note_detail_cache.json
+        """
+        if cache_file is None:
+            cache_file = os.path.join(os.getenv('DATA_STORAGE_PATH', 'data'), 'cache', 'note_detail_cache.json')
+        self.cache_file = Path(cache_file)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def get(self, note: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        获取指标未变化笔记的缓存详情
+
+        Returns:
+            详情数据字典，没有缓存或指标已变化时返回None
+        """
+        with self._lock:
+            entry = self._entries.get(note_key(note))
+        if entry and tuple(entry.get('fingerprint', ())) == metrics_fingerprint(note):
+            return dict(entry['detail'])
+        return None
+
+    def put(self, note: Dict[str, Any], detail: Dict[str, Any]) -> None:
+        """记录笔记详情数据及当前指标指纹"""
+        with self._lock:
+            self._entries[note_key(note)] = {
+                'fingerprint': list(metrics_fingerprint(note)),
+                'detail': dict(detail),
+                'update_time': datetime.now().isoformat()
+            }
+            self._dirty = True
+
+    def save(self) -> None:
+        """保存缓存到文件（先写临时文件再替换，避免写到一半的文件）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+            logger.debug(f"💾 详情缓存已保存: {len(entries)} 篇笔记")
+        except Exception as e:
+            logger.warning(f"⚠️ 保存详情缓存失败: {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """从文件加载缓存，文件损坏时从空缓存开始"""
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+            logger.debug(f"📂 加载详情缓存: {len(self._entries)} 篇笔记")
+        except Exception as e:
+            logger.warning(f"⚠️ 读取详情缓存失败，将重新采集详情: {e}")
+            self._entries = {}
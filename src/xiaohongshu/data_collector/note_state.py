@@ -0,0 +1,111 @@
+"""
+笔记状态索引模块
+
+记录每篇笔记（标题 + 发布时间）上次持久化时的指标指纹。
+增量采集时只保存指纹发生变化的笔记，未变化的笔记不再重复写入存储。
+长时间没有出现在采集列表中的笔记（已删除等）从索引中清理，索引文件不会无限增长
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .detail_cache import metrics_fingerprint, note_key
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class NoteStateIndex:
+    """笔记状态索引（JSON文件持久化，线程安全）"""
+
+    def __init__(self, index_file: Optional[str] = None, max_age_days: Optional[float] = None):
+        """
+        初始化状态索引
+
+        Args:
+            index_file: 索引文件路径，默认为 {DATA_STORAGE_PATH}/cache/note_state_index.json
+            max_age_days: 笔记超过该天数未出现在采集列表中时从索引清理，默认读取 NOTE_STATE_MAX_AGE_DAYS（30天）
+        """
+        if index_file is None:
+            index_file = os.path.join(os.getenv('DATA_STORAGE_PATH', 'data'), 'cache', 'note_state_index.json')
+        if max_age_days is None:
+            max_age_days = float(os.getenv('NOTE_STATE_MAX_AGE_DAYS', '30'))
+        self.index_file = Path(index_file)
+        self.max_age = timedelta(days=max_age_days)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def changed_notes(self, notes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        筛选出新增或指标有变化的笔记
+
+        Args:
+            notes: 本次采集的笔记列表
+
+        Returns:
+            需要持久化的笔记列表（保持原有顺序）
+        """
+        with self._lock:
+            return [note for note in notes
+                    if tuple(self._entries.get(note_key(note), {}).get('fingerprint', ())) != metrics_fingerprint(note)]
+
+    def mark_persisted(self, notes: List[Dict[str, Any]], seen_notes: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        记录笔记已持久化，清理过期条目，并把索引写入文件
+
+        Args:
+            notes: 已持久化的笔记
+            seen_notes: 本次采集列表中的全部笔记，用于刷新最近出现时间；为空时只刷新notes
+        """
+        now = datetime.now()
+        now_text = now.isoformat()
+        expire_before = (now - self.max_age).isoformat()
+        with self._lock:
+            for note in notes:
+                self._entries[note_key(note)] = {
+                    'fingerprint': list(metrics_fingerprint(note)),
+                    'persisted_at': now_text,
+                    'seen_at': now_text
+                }
+            for note in seen_notes or ():
+                entry = self._entries.get(note_key(note))
+                if entry is not None:
+                    entry['seen_at'] = now_text
+
+            # 采集可能只覆盖部分分页，不能按单次列表清理，只清理长时间未出现的笔记
+            expired = [key for key, entry in self._entries.items()
+                       if entry.get('seen_at', entry.get('persisted_at', '')) < expire_before]
+            for key in expired:
+                del self._entries[key]
+            entries = dict(self._entries)
+
+        if expired:
+            logger.info(f"🧹 清理 {len(expired)} 条长时间未出现的笔记状态")
+
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            logger.warning(f"⚠️ 保存笔记状态索引失败: {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """从文件加载索引，文件损坏时从空索引开始（下次全部保存）"""
+        if not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ 读取笔记状态索引失败，将全部重新保存: {e}")
+            self._entries = {}
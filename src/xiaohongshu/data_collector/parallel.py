@@ -0,0 +1,82 @@
+"""
+多页面并发采集模块
+
+账号概览、内容分析、粉丝数据三个页面互不依赖，可以各自借用驱动池中的独立浏览器同时采集，
+整轮采集的耗时约等于最慢的那个页面，而不是所有页面耗时之和
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (页面名称, 以driver为参数、返回采集结果的协程函数)
+PageCollector = Tuple[str, Callable[[WebDriver], Awaitable[Dict[str, Any]]]]
+
+
+async def collect_pages(driver_pool, collectors: List[PageCollector],
+                        parallel: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    采集多个数据页面
+
+    Args:
+        driver_pool: 浏览器驱动池（ChromeDriverPool）
+        collectors: 待采集的页面列表
+        parallel: 是否每个页面使用独立浏览器并发采集，否则共用一个浏览器依次采集
+
+    Returns:
+        按页面名称索引的采集结果，每个结果附带elapsed_seconds
+    """
+    if not collectors:
+        return {}
+
+    if not parallel:
+        return await _collect_sequentially(driver_pool, collectors)
+
+    # 为发布任务保留的浏览器不用于采集
+    available = driver_pool.max_size - driver_pool.reserved
+    if driver_pool.enabled and available < len(collectors):
+        logger.warning(f"⚠️ 驱动池只有 {available} 个浏览器可用于采集，{len(collectors)} 个页面中的部分页面需要排队采集，"
+                       f"可将 BROWSER_POOL_SIZE 设置为 {len(collectors) + driver_pool.reserved}")
+
+    logger.info(f"🚀 并发采集 {len(collectors)} 个页面: {', '.join(name for name, _ in collectors)}")
+    results = await asyncio.gather(*[
+        _collect_in_own_browser(driver_pool, name, collect) for name, collect in collectors
+    ])
+    return dict(zip((name for name, _ in collectors), results))
+
+
+async def _collect_in_own_browser(driver_pool, name: str,
+                                  collect: Callable[[WebDriver], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """借用一个独立浏览器采集单个页面，出错的浏览器不再放回驱动池"""
+    start = time.monotonic()
+    try:
+        async with driver_pool.session() as browser_manager:
+            result = await collect(browser_manager.driver)
+    except Exception as e:
+        logger.error(f"❌ {name}数据采集失败: {e}")
+        result = {"success": False, "error": str(e)}
+
+    result["elapsed_seconds"] = round(time.monotonic() - start, 2)
+    return result
+
+
+async def _collect_sequentially(driver_pool, collectors: List[PageCollector]) -> Dict[str, Dict[str, Any]]:
+    """共用一个浏览器依次采集各页面"""
+    results = {}
+    async with driver_pool.session() as browser_manager:
+        for name, collect in collectors:
+            start = time.monotonic()
+            try:
+                result = await collect(browser_manager.driver)
+            except Exception as e:
+                logger.error(f"❌ {name}数据采集失败: {e}")
+                result = {"success": False, "error": str(e)}
+            result["elapsed_seconds"] = round(time.monotonic() - start, 2)
+            results[name] = result
+    return results
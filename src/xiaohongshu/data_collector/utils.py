@@ -6,7 +6,11 @@
 
 import time
 import re
-from typing import Optional, List, Any
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Any, Callable
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -18,6 +22,39 @@ from ...utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 数据采集专用线程池：Selenium调用和页面等待都是阻塞的，放到线程中执行，避免卡住MCP服务器的事件循环
+COLLECTOR_MAX_WORKERS = 4
+_collector_executor: Optional[ThreadPoolExecutor] = None
+_collector_executor_lock = threading.Lock()
+
+
+def get_collector_executor() -> ThreadPoolExecutor:
+    """获取数据采集专用线程池（首次调用时创建）"""
+    global _collector_executor
+    
+    with _collector_executor_lock:
+        if _collector_executor is None:
+            _collector_executor = ThreadPoolExecutor(
+                max_workers=COLLECTOR_MAX_WORKERS,
+                thread_name_prefix="xhs-collector"
+            )
+        return _collector_executor
+
+
+async def run_in_collector(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    在数据采集线程池中执行同步采集函数
+    
+    Args:
+        func: 同步采集函数
+        *args, **kwargs: 传给采集函数的参数
+        
+    Returns:
+        采集函数的返回值
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_collector_executor(), functools.partial(func, *args, **kwargs))
+
 
 def clean_number(text: str) -> int:
     """
@@ -6,6 +6,7 @@
 
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, field_validator
+import asyncio
 import logging
 
 # 设置logger
@@ -312,7 +313,8 @@ class XHSNote(BaseModel):
             import os
             base_dir = os.environ.get('MCP_WORKING_DIR', os.getcwd())
             processor = VideoProcessor(base_dir=base_dir)
-            processed_videos, error_msg = processor.process_videos(videos)
+            # 预检和转码可能耗时较长，在线程中执行避免阻塞事件循环
+            processed_videos, error_msg = await asyncio.to_thread(processor.process_videos, videos)
             
             if error_msg and not processed_videos:
                 # 如果没有成功处理任何视频，抛出友好的错误信息
@@ -389,6 +391,8 @@ class XHSPublishResult(BaseModel):
     note_title: Optional[str] = None
     final_url: Optional[str] = None
     error_type: Optional[str] = None
+    step_timings: Optional[Dict[str, float]] = None  # 各步骤等待耗时（秒）
+    spans: Optional[List[Dict[str, Any]]] = None  # 各步骤完整耗时记录
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
@@ -397,7 +401,9 @@ class XHSPublishResult(BaseModel):
             "message": self.message,
             "note_title": self.note_title,
             "final_url": self.final_url,
-            "error_type": self.error_type
+            "error_type": self.error_type,
+            "step_timings": self.step_timings,
+            "spans": self.spans
         }
 
 
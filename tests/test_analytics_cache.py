@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+测试分析数据缓存：签名校验、LRU淘汰、内存上限和写入失效
+"""
+
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.analytics_cache import AnalyticsCache
+from src.data.storage_manager import StorageManager
+
+
+def test_signature_change_reloads():
+    cache = AnalyticsCache()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return [{"views": len(loads)}]
+
+    assert cache.get_or_load("latest", (1, 100), loader) == [{"views": 1}]
+    assert cache.get_or_load("latest", (1, 100), loader) == [{"views": 1}]
+    assert cache.get_or_load("latest", (2, 120), loader) == [{"views": 2}]
+    assert cache.stats()["hits"] == 1 and len(loads) == 2
+
+
+def test_lru_eviction_and_memory_cap():
+    cache = AnalyticsCache(max_entries=2, max_bytes=10_000)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    cache.get("a")
+    cache.put("c", [3])
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, [1])
+
+    cache.put("huge", ["x" * 20_000])
+    assert cache.get("huge") == (False, None)
+    assert cache.stats()["bytes"] <= 10_000
+
+
+def test_invalidate_during_load_discards_result():
+    cache = AnalyticsCache()
+
+    def loader():
+        cache.invalidate()
+        return "stale"
+
+    assert cache.get_or_load("k", None, loader) == "stale"
+    assert cache.get("k") == (False, None)
+
+
+def test_storage_manager_write_changes_signature(tmp_path):
+    manager = StorageManager()
+    manager.initialize(data_path=str(tmp_path))
+    before = manager.get_data_signature("fans")
+
+    manager.save_fans_data([{"dimension": "7天", "total_fans": 10}])
+    assert manager.flush(timeout=5)
+
+    assert manager.get_data_signature("fans") != before
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+测试创作者数据查询：日期过滤、聚合、Top N和游标分页
+"""
+
+import sys
+import os
+import asyncio
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.analytics_query import query_creator_data, query_data_types
+from src.data.storage.csv_storage import CSVStorage
+
+
+def write_content_history(storage: CSVStorage) -> None:
+    """写入两天的内容分析数据（笔记b第二天浏览量增长）"""
+    rows = [
+        ['2024-06-01T08:00:00', '2024-06-01T08:00:00', '', 'a', '图文', '2024-05-30', '100'],
+        ['2024-06-01T08:00:00', '2024-06-01T08:00:00', '', 'b', '视频', '2024-05-31', '50'],
+        ['2024-06-02T08:00:00', '2024-06-02T08:00:00', '', 'a', '图文', '2024-05-30', '120'],
+        ['2024-06-02T08:00:00', '2024-06-02T08:00:00', '', 'b', '视频', '2024-05-31', '300'],
+    ]
+    headers = storage.content_analysis_chinese_headers[:7]
+    with open(storage.content_analysis_file, 'w', encoding='utf-8') as f:
+        f.write(','.join(headers) + '\n')
+        for row in rows:
+            f.write(','.join(row) + '\n')
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = CSVStorage({'data_dir': str(tmp_path)})
+    write_content_history(storage)
+    return storage
+
+
+def test_top_uses_latest_snapshot(storage):
+    result = query_creator_data(storage.read_frame('content_analysis'), 'content_analysis',
+                                aggregate='top', top_n=1, fields=['title'])
+    assert result['records'] == [{'title': 'b', 'views': 300}]
+
+
+def test_sum_by_date_with_date_filter(storage):
+    frame = storage.read_frame('content_analysis', start_date='2024-06-02')
+    result = query_creator_data(frame, 'content_analysis', aggregate='sum', fields=['views'])
+    assert result['records'] == [{'date': '2024-06-02', 'views': 420}]
+
+
+def test_cursor_pagination(storage):
+    frame = storage.read_frame('content_analysis')
+    first = query_creator_data(frame, 'content_analysis', aggregate='none', fields=['title', 'views'], page_size=3)
+    second = query_creator_data(frame, 'content_analysis', aggregate='none', fields=['title', 'views'],
+                                page_size=3, cursor=first['next_cursor'])
+
+    assert first['total'] == 4 and len(first['records']) == 3
+    assert first['records'][0]['views'] in (120, 300)
+    assert len(second['records']) == 1 and second['next_cursor'] is None
+
+
+def test_summary_and_invalid_parameters(storage):
+    frame = storage.read_frame('content_analysis')
+    summary = query_creator_data(frame, 'content_analysis', top_n=1)
+
+    assert summary['notes'] == 2 and summary['totals']['views'] == 420
+    assert summary['last_date'] == '2024-06-02'
+    with pytest.raises(ValueError):
+        query_creator_data(frame, 'content_analysis', fields=['unknown'])
+    with pytest.raises(ValueError):
+        query_creator_data(frame, 'content_analysis', aggregate='none', cursor='abc')
+
+
+def test_top_over_all_types_skips_types_without_sort_field(storage):
+    # MCP默认参数 data_type=all、sort_by=views：粉丝数据没有views字段
+    results = query_data_types(storage.read_frame, ['dashboard', 'content_analysis', 'fans'],
+                               aggregate='top', top_n=1, fields=['title'])
+
+    assert results['content_analysis']['records'] == [{'title': 'b', 'views': 300}]
+    assert results['dashboard']['records'] == []
+    assert results['fans']['error'] == 'fans不能按views排序'
+    with pytest.raises(ValueError):
+        query_data_types(storage.read_frame, ['fans'], aggregate='top')
+
+
+def test_latest_reads_only_latest_records(storage):
+    def load_frame(data_type):
+        raise AssertionError("latest不应加载全部历史")
+
+    def load_latest(data_type, limit):
+        return asyncio.run(storage.get_latest_data(data_type, limit))
+
+    results = query_data_types(load_frame, ['content_analysis', 'fans'], aggregate='latest', top_n=2,
+                               fields=['title', 'views'], load_latest=load_latest)
+
+    assert results['content_analysis']['records'] == [{'title': 'b', 'views': 300}, {'title': 'a', 'views': 120}]
+    assert results['fans']['records'] == []
+    # 直接传入DataFrame时结果一致
+    frame = storage.read_frame('content_analysis')
+    assert query_creator_data(frame, 'content_analysis', aggregate='latest', top_n=2,
+                              fields=['title', 'views']) == results['content_analysis']
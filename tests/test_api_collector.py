@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+测试接口数据采集：使用录制的创作者中心接口响应和Chrome性能日志
+"""
+
+import sys
+import os
+import json
+import base64
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.xiaohongshu.data_collector.api_collector import (
+    NetworkCapture, DASHBOARD_API_KEYWORDS, decode_response_body,
+    parse_dashboard_response, parse_fans_response, parse_note_list_response,
+    parse_performance_entries
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "creator_api"
+
+
+def load_fixture(name):
+    with open(FIXTURES / name, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class FakeDriver:
+    """回放录制的性能日志和接口响应体"""
+
+    def __init__(self, entries, bodies):
+        self._logs = [entries]
+        self.bodies = bodies
+
+    def get_log(self, log_type):
+        assert log_type == "performance"
+        return self._logs.pop(0) if self._logs else []
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert cmd == "Network.getResponseBody"
+        return self.bodies[params["requestId"]]
+
+
+def test_parse_performance_entries_matches_finished_json_responses():
+    matched, finished = parse_performance_entries(load_fixture("performance_log.json"), DASHBOARD_API_KEYWORDS)
+
+    assert set(matched) == {"1000.1", "1000.3"}
+    assert "1000.1" in finished and "1000.3" not in finished
+
+
+def test_network_capture_reads_only_finished_bodies():
+    body = json.dumps(load_fixture("dashboard_note_stats.json"))
+    driver = FakeDriver(load_fixture("performance_log.json"), {
+        "1000.1": {"body": base64.b64encode(body.encode("utf-8")).decode(), "base64Encoded": True}
+    })
+
+    responses = NetworkCapture(driver).wait_for_responses(DASHBOARD_API_KEYWORDS, timeout=1,
+                                                          poll_interval=0.01, settle_time=0)
+
+    assert len(responses) == 1
+    assert responses[0]["url"].endswith("type=7d")
+    assert responses[0]["data"]["data"]["note_stats"]["view_count"] == 12580
+
+
+def test_decode_response_body_plain_and_invalid():
+    assert decode_response_body({"body": '{"a": 1}', "base64Encoded": False}) == {"a": 1}
+    assert decode_response_body({"body": "<html>", "base64Encoded": False}) is None
+
+
+def test_parse_dashboard_response():
+    record = parse_dashboard_response(load_fixture("dashboard_note_stats.json"), "7天")
+
+    assert record["dimension"] == "7天"
+    assert (record["views"], record["likes"], record["collects"]) == (12580, 863, 412)
+    assert (record["comments"], record["shares"]) == (97, 35)
+    # 接口未返回互动总数时按各项互动求和
+    assert record["interactions"] == 863 + 412 + 97 + 35
+
+
+def test_parse_fans_response():
+    record = parse_fans_response(load_fixture("fans_overall.json"), "30天")
+
+    assert record == {"dimension": "30天", "total_fans": 3421, "new_fans": 126, "lost_fans": 18}
+
+
+def test_parse_note_list_response():
+    notes = parse_note_list_response(load_fixture("note_list.json"))
+
+    assert [note["title"] for note in notes] == ["夏日清爽穿搭分享", "一周减脂餐食谱"]
+    assert notes[0]["views"] == 5230 and notes[0]["fans_growth"] == 21
+    assert notes[0]["publish_time"].startswith("2024-06-2")
+    # 带单位的字符串数值与页面采集一样经过clean_number处理
+    assert notes[1]["views"] == 12000
+    assert notes[1]["danmu_count"] == 3
+    assert parse_note_list_response(load_fixture("note_list.json"), limit=1)[0]["row_index"] == 0
+
+
+def test_parsers_return_nothing_for_unrelated_payload():
+    assert parse_dashboard_response({"code": 0, "data": {}}, "7天") is None
+    assert parse_fans_response({"code": 0}, "7天") is None
+    assert parse_note_list_response({"data": {"items": []}}) == []
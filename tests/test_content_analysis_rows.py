@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+测试内容分析表格的批量提取：一次脚本调用返回的单元格文本按列映射解析；同名笔记按行序号定位详情按钮
+"""
+
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.xiaohongshu.data_collector.content_analysis import (
+    _build_note_data, _collect_notes_list_data, _locate_detail_button
+)
+
+ROW_CELLS = ["夏日清爽穿搭分享\n发布于2024-06-20", "2024-06-20 18:30", "1.2万", "863", "97",
+             "412", "21", "35", "32秒", "3", "详情数据"]
+
+
+class FakeDriver:
+    """只响应execute_script的假驱动"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        limit = args[-1]
+        return self.rows[:limit]
+
+
+def test_build_note_data_maps_columns():
+    note = _build_note_data(ROW_CELLS, 0, detail_button="button")
+
+    assert note["title"] == "夏日清爽穿搭分享"
+    assert note["publish_time"] == "2024-06-20 18:30"
+    assert (note["views"], note["likes"], note["comments"], note["collects"]) == (12000, 863, 97, 412)
+    assert (note["fans_growth"], note["shares"], note["danmu_count"]) == (21, 35, 3)
+    assert note["avg_watch_time"] == "32秒"
+    assert note["has_detail_button"] and note["detail_button_element"] == "button"
+
+
+def test_build_note_data_rejects_short_or_untitled_rows():
+    assert _build_note_data(["标题", "时间"], 0) is None
+    assert _build_note_data(["", "2024-06-20", "10"], 0) is None
+
+
+def test_collect_notes_list_uses_single_script_call():
+    driver = FakeDriver([{"cells": ROW_CELLS, "detail": None}] * 5)
+
+    notes = _collect_notes_list_data(driver, limit=3)
+
+    assert driver.calls == 1
+    assert [note["row_index"] for note in notes] == [0, 1, 2]
+    assert notes[0]["has_detail_button"] is False
+
+
+def test_duplicate_titles_locate_their_own_detail_button():
+    rows = [{"cells": ["同名笔记\n发布于2024-06-20"], "detail": "button-0"},
+            {"cells": ["另一篇"], "detail": "button-1"},
+            {"cells": ["同名笔记\n发布于2024-06-22"], "detail": "button-2"}]
+    driver = FakeDriver(rows)
+
+    assert _locate_detail_button(driver, "同名笔记", 0, timeout=0) == "button-0"
+    assert _locate_detail_button(driver, "同名笔记", 2, timeout=0) == "button-2"
+    # 行序号对不上时，只有标题唯一才按标题定位
+    assert _locate_detail_button(driver, "另一篇", 0, timeout=0) == "button-1"
+    assert _locate_detail_button(driver, "同名笔记", 1, timeout=0) is None
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+测试CSV存储的最新数据读取：证明文件有序后只读末尾，否则用堆扫描全文件，结果与全量排序一致
+"""
+
+import sys
+import os
+import asyncio
+import random
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.storage.csv_storage import CSVStorage
+
+
+def write_fans_rows(storage, timestamps):
+    lines = [",".join(storage.fans_chinese_headers)]
+    for i, ts in enumerate(timestamps):
+        lines.append(f"{ts},{ts},,7天,{i},1,0")
+    storage.fans_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def expected_latest(timestamps, limit):
+    rows = [{"created_at": ts, "total_fans": str(i)} for i, ts in enumerate(timestamps)]
+    # 同一时间的行以后写入的为新
+    rows.sort(key=lambda row: (row["created_at"], int(row["total_fans"])), reverse=True)
+    return [(row["created_at"], row["total_fans"]) for row in rows[:limit]]
+
+
+def latest(storage, limit):
+    rows = asyncio.run(storage.get_latest_data("fans", limit=limit))
+    return [(row["created_at"], row["total_fans"]) for row in rows]
+
+
+def test_ordered_file_reads_tail_only_after_full_scan(tmp_path):
+    storage = CSVStorage({"data_dir": str(tmp_path)})
+    timestamps = [f"2024-06-{day:02d}T08:00:00" for day in range(1, 29)]
+    write_fans_rows(storage, timestamps)
+    storage._iter_lines_reversed = _counting(storage._iter_lines_reversed, counter := [])
+
+    # 第一次读取扫描整个文件并记录文件有序
+    assert latest(storage, 3) == expected_latest(timestamps, 3)
+    assert len(counter) == len(timestamps)
+
+    counter.clear()
+    assert latest(storage, 3) == expected_latest(timestamps, 3)
+    assert len(counter) == 3
+    assert latest(storage, 100) == expected_latest(timestamps, 100)
+
+
+def test_newer_row_in_the_middle_is_not_missed(tmp_path):
+    storage = CSVStorage({"data_dir": str(tmp_path)})
+    timestamps = ["2024-01-01T08:00:00", "2024-01-09T08:00:00", "2024-01-02T08:00:00", "2024-01-03T08:00:00"]
+    write_fans_rows(storage, timestamps)
+
+    assert latest(storage, 2) == [("2024-01-09T08:00:00", "1"), ("2024-01-03T08:00:00", "3")]
+    assert latest(storage, 2) == [("2024-01-09T08:00:00", "1"), ("2024-01-03T08:00:00", "3")]
+
+
+def test_modified_file_is_scanned_again(tmp_path):
+    storage = CSVStorage({"data_dir": str(tmp_path)})
+    timestamps = [f"2024-06-{day:02d}T08:00:00" for day in range(1, 10)]
+    write_fans_rows(storage, timestamps)
+    assert latest(storage, 2) == expected_latest(timestamps, 2)
+
+    # 文件被改写后，之前记录的有序状态不再可信
+    timestamps = timestamps[:3] + ["2024-07-01T08:00:00"] + timestamps[3:]
+    write_fans_rows(storage, timestamps)
+
+    assert latest(storage, 2) == expected_latest(timestamps, 2)
+
+
+def test_unordered_file_matches_full_sort(tmp_path):
+    storage = CSVStorage({"data_dir": str(tmp_path)})
+    timestamps = [f"2024-{month:02d}-01T08:00:00" for month in range(1, 13)] * 3
+    random.Random(7).shuffle(timestamps)
+    timestamps.append("2023-01-01T00:00:00")
+    write_fans_rows(storage, timestamps)
+
+    for limit in (1, 5, 40):
+        assert latest(storage, limit) == expected_latest(timestamps, limit)
+
+
+def test_small_blocks_split_multibyte_lines(tmp_path):
+    storage = CSVStorage({"data_dir": str(tmp_path)})
+    timestamps = [f"2024-06-{day:02d}T08:00:00" for day in range(1, 10)]
+    write_fans_rows(storage, timestamps)
+
+    lines = list(CSVStorage._iter_lines_reversed(storage.fans_file, block_size=7))
+
+    assert lines[0].decode("utf-8").startswith("2024-06-09")
+    assert lines[-1].decode("utf-8").startswith("创建时间")
+    assert len(lines) == len(timestamps) + 1
+
+
+def _counting(func, counter):
+    def wrapper(*args, **kwargs):
+        for line in func(*args, **kwargs):
+            counter.append(line)
+            yield line
+    return wrapper
+
+
+def test_quoted_multiline_field_is_one_record(tmp_path):
+    storage = CSVStorage({"data_dir": str(tmp_path)})
+    storage.append_content_analysis_data([
+        {"title": "line one\nline two, \"quoted\"", "views": 5},
+        {"title": "plain", "views": 7},
+    ])
+
+    frame = storage.read_frame("content_analysis")
+    rows = asyncio.run(storage.get_latest_data("content_analysis", limit=10))
+
+    assert len(frame) == 2
+    assert sorted(row["title"] for row in rows) == sorted(frame["title"])
+    # 块边界落在引号内的换行附近时结果不变
+    records = list(CSVStorage._iter_lines_reversed(storage.content_analysis_file, block_size=5))
+    assert len(records) == 3 and b"line one\nline two" in records[1]
+
+
+def test_unbalanced_quotes_fall_back_to_forward_read(tmp_path):
+    storage = CSVStorage({"data_dir": str(tmp_path)})
+    timestamps = [f"2024-06-{day:02d}T08:00:00" for day in range(1, 5)]
+    write_fans_rows(storage, timestamps)
+    # 写入中断留下不成对的引号
+    with open(storage.fans_file, "a", encoding="utf-8") as f:
+        f.write('2024-06-09T08:00:00,2024-06-09T08:00:00,,"7天')
+
+    assert latest(storage, 2) == expected_latest(timestamps, 2)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+测试浏览器驱动池：借出/归还复用、超龄回收、按账号复用、等待超时和为发布任务保留的浏览器
+"""
+
+import sys
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('selenium')
+
+from src.core.driver_pool import ChromeDriverPool
+from src.core.exceptions import BrowserError
+
+
+class FakeManager:
+    """不启动真实浏览器的浏览器管理器"""
+
+    created = []
+
+    def __init__(self, config, user_data_dir=None, debugging_port=None):
+        self.config = config
+        self.user_data_dir = user_data_dir
+        self.driver = None
+        self.closed = False
+        FakeManager.created.append(self)
+
+    def create_driver(self):
+        self.driver = SimpleNamespace(execute_script=lambda script: "complete")
+
+    def navigate_to_creator_center(self):
+        pass
+
+    def load_cookies(self, cookies):
+        return True
+
+    def close_driver(self):
+        self.closed = True
+        self.driver = None
+
+
+def make_pool(tmp_path, size=2, reserved=0, max_age=1800):
+    FakeManager.created = []
+    config = SimpleNamespace(
+        enable_browser_pool=True, browser_pool_size=size, browser_pool_reserved=reserved,
+        browser_pool_max_age=max_age, browser_pool_checkout_timeout=5,
+        cookies_file=str(tmp_path / "cookies.json"), cookies_dir=str(tmp_path), remote_browser_port=9222
+    )
+    return ChromeDriverPool(config, manager_factory=FakeManager)
+
+
+def test_checkin_returns_browser_for_reuse(tmp_path):
+    pool = make_pool(tmp_path)
+
+    first = pool.checkout()
+    pool.checkin(first)
+    second = pool.checkout()
+
+    assert second is first and len(FakeManager.created) == 1
+    assert pool.get_status()["drivers"][0]["use_count"] == 1
+    pool.checkin(second, discard=True)
+    assert second.closed and pool.get_status()["size"] == 0
+
+
+def test_expired_browser_is_restarted(tmp_path):
+    pool = make_pool(tmp_path, max_age=60)
+    manager = pool.checkout()
+    pool.checkin(manager)
+    pool._entries[0].created_at -= 120
+    old_driver = manager.driver
+
+    assert pool.checkout() is manager
+    assert manager.closed and manager.driver is not old_driver
+    assert time.time() - pool._entries[0].created_at < 5
+
+
+def test_idle_browser_is_reused_per_account(tmp_path):
+    pool = make_pool(tmp_path, size=2)
+    account_a = pool.checkout(str(tmp_path / "a.json"))
+    account_b = pool.checkout(str(tmp_path / "b.json"))
+    pool.checkin(account_a)
+    pool.checkin(account_b)
+
+    assert pool.checkout(str(tmp_path / "b.json")) is account_b
+    # 池已满时回收其他账号的空闲浏览器
+    account_c = pool.checkout(str(tmp_path / "c.json"))
+    assert account_a.closed and account_c is not account_a
+    assert account_c.config.cookies_file == str(tmp_path / "c.json")
+
+
+def test_checkout_times_out_when_pool_is_busy(tmp_path):
+    pool = make_pool(tmp_path, size=1)
+    pool.checkout()
+
+    with pytest.raises(BrowserError):
+        pool.checkout(timeout=0.05)
+
+
+def test_waiting_checkout_gets_returned_browser(tmp_path):
+    pool = make_pool(tmp_path, size=1)
+    manager = pool.checkout()
+    threading.Timer(0.05, pool.checkin, args=(manager,)).start()
+
+    assert pool.checkout(timeout=2) is manager
+
+
+def test_publish_reserve_is_kept_free(tmp_path):
+    pool = make_pool(tmp_path, size=2, reserved=1)
+    collector = pool.checkout()
+
+    with pytest.raises(BrowserError):
+        pool.checkout(timeout=0.05)
+    publisher = pool.checkout(timeout=0.05, priority=True)
+    assert publisher is not collector
+
+    # 发布任务占用的浏览器不计入非优先借用的上限
+    pool.checkin(collector)
+    assert pool.checkout(timeout=0.05) is collector
+
+
+def test_single_browser_pool_reserves_nothing(tmp_path):
+    pool = make_pool(tmp_path, size=1, reserved=1)
+
+    assert pool.reserved == 0
+    pool.checkin(pool.checkout(timeout=0.05))
+
+
+def test_idle_only_checkout_never_launches_or_evicts(tmp_path):
+    pool = make_pool(tmp_path, size=2)
+    other_account = pool.checkout(str(tmp_path / "other.json"))
+    pool.checkin(other_account)
+
+    with pytest.raises(BrowserError):
+        pool.checkout(timeout=0, launch=False)
+    assert len(FakeManager.created) == 1 and not other_account.closed
+
+    manager = pool.checkout()
+    pool.checkin(manager)
+    assert pool.checkout(timeout=0, launch=False) is manager
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+测试流式导出：分块读取、日期过滤、JSONL/JSON/Parquet输出和进度回调
+"""
+
+import sys
+import os
+import json
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.exporter import DataExporter
+from src.data.storage.csv_storage import CSVStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = CSVStorage({'data_dir': str(tmp_path / 'data')})
+    with open(storage.fans_file, 'w', encoding='utf-8') as f:
+        f.write(','.join(storage.fans_chinese_headers) + '\n')
+        for day in range(1, 6):
+            f.write(f"2024-06-0{day}T08:00:00,2024-06-0{day}T08:00:00,,7天,{100 + day},{day},0\n")
+    return storage
+
+
+def test_jsonl_export_streams_in_chunks(storage, tmp_path):
+    progress = []
+    exporter = DataExporter(storage, chunksize=2, progress=lambda data_type, rows: progress.append((data_type, rows)))
+
+    counts = exporter.export('jsonl', tmp_path / 'out', start_date='2024-06-02')
+
+    assert counts == {'fans': 4}
+    lines = (tmp_path / 'out' / 'fans.jsonl').read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['total_fans'] for line in lines] == [102, 103, 104, 105]
+    assert progress[-1] == ('fans', 4) and len(progress) >= 2
+    assert not (tmp_path / 'out' / 'dashboard.jsonl').exists()
+
+
+def test_json_export_is_valid_array(storage, tmp_path):
+    DataExporter(storage, chunksize=2).export('json', tmp_path / 'out', end_date='2024-06-03')
+
+    records = json.loads((tmp_path / 'out' / 'fans.json').read_text(encoding='utf-8'))
+    assert [record['date'] for record in records] == ['2024-06-01', '2024-06-02', '2024-06-03']
+
+
+def test_parquet_export_uses_typed_schema(storage, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+
+    DataExporter(storage, chunksize=2).export('parquet', tmp_path / 'out')
+
+    table = pq.read_table(tmp_path / 'out' / 'fans.parquet')
+    assert table.num_rows == 5
+    assert str(table.schema.field('total_fans').type) == 'int64'
+    assert pq.ParquetFile(tmp_path / 'out' / 'fans.parquet').num_row_groups == 3
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+测试图片并发下载：共享会话、并发上限、重试和返回顺序
+"""
+
+import sys
+import os
+import asyncio
+from pathlib import Path
+
+from aiohttp import web
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.image_processor import ImageProcessor
+
+
+async def run_downloads(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv('IMAGE_DOWNLOAD_CONCURRENCY', '2')
+    monkeypatch.setenv('MEDIA_CACHE', 'false')
+    state = {'active': 0, 'peak': 0, 'flaky_calls': 0}
+
+    async def image(request):
+        state['active'] += 1
+        state['peak'] = max(state['peak'], state['active'])
+        # 序号越小响应越慢，验证返回顺序与输入一致
+        await asyncio.sleep(0.05 * (5 - int(request.match_info['n'])))
+        state['active'] -= 1
+        return web.Response(body=request.match_info['n'].encode() * 100000, content_type='image/png')
+
+    async def flaky(request):
+        state['flaky_calls'] += 1
+        if state['flaky_calls'] == 1:
+            return web.Response(status=503)
+        return web.Response(body=b'ok', content_type='image/jpeg')
+
+    app = web.Application()
+    app.router.add_get('/img/{n}', image)
+    app.router.add_get('/flaky', flaky)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        processor = ImageProcessor(temp_dir=str(tmp_path))
+        urls = [f"http://127.0.0.1:{port}/img/{n}" for n in range(5)] + [f"http://127.0.0.1:{port}/flaky"]
+        paths, error = await processor.process_images(urls)
+    finally:
+        await runner.cleanup()
+    return paths, error, state
+
+
+def test_downloads_are_concurrent_bounded_and_ordered(tmp_path, monkeypatch):
+    paths, error, state = asyncio.run(run_downloads(tmp_path, monkeypatch))
+
+    assert error is None
+    assert [Path(path).read_bytes()[:1] for path in paths[:5]] == [b'0', b'1', b'2', b'3', b'4']
+    assert Path(paths[0]).stat().st_size == 100000 and paths[0].endswith('.png')
+    assert Path(paths[5]).read_bytes() == b'ok' and state['flaky_calls'] == 2
+    assert state['peak'] == 2
+    assert not list(tmp_path.glob('.*.part'))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+测试图片上传前预处理：方向纠正、缩小、去除EXIF、并行处理保持顺序
+"""
+
+import sys
+import os
+import asyncio
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+Image = pytest.importorskip('PIL.Image')
+
+from src.utils.image_preprocess import PreprocessSettings, preprocess_image, preprocess_images
+
+
+def make_photo(path, size=(4000, 3000), orientation=None):
+    """生成带EXIF的测试照片"""
+    image = Image.new('RGB', size, (200, 120, 40))
+    exif = Image.Exif()
+    exif[0x0110] = 'Test Phone'  # 相机型号
+    if orientation:
+        exif[0x0112] = orientation
+    image.save(path, format='JPEG', quality=95, exif=exif.tobytes())
+    return str(path)
+
+
+def test_resizes_rotates_and_strips_exif(tmp_path):
+    src = make_photo(tmp_path / 'photo.jpg', orientation=6)  # 需要顺时针旋转90度
+
+    result = preprocess_image(src, str(tmp_path / 'out'), PreprocessSettings(max_side=1000))
+
+    with Image.open(result) as image:
+        assert image.size == (750, 1000)
+        assert not image.getexif()
+    assert preprocess_image(src, str(tmp_path / 'out'), PreprocessSettings(max_side=1000)) == result
+
+
+def test_small_clean_image_is_kept(tmp_path):
+    src = tmp_path / 'small.jpg'
+    Image.effect_noise((200, 200), 64).convert('RGB').save(src, format='JPEG', quality=30)
+
+    assert preprocess_image(str(src), str(tmp_path / 'out'), PreprocessSettings()) == str(src)
+
+
+def test_parallel_preprocess_keeps_order(tmp_path):
+    sources = [make_photo(tmp_path / f"p{i}.jpg", size=(3000 + i * 100, 2000)) for i in range(3)]
+
+    results = asyncio.run(preprocess_images(sources, str(tmp_path / 'out'), PreprocessSettings(max_side=800)))
+
+    assert [os.path.basename(path).split('_')[0] for path in results] == ['p0', 'p1', 'p2']
+    for path in results:
+        with Image.open(path) as image:
+            assert max(image.size) == 800
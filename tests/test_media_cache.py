@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+测试图片下载缓存：新鲜期内不请求、条件请求304复用、内容去重和LRU淘汰、查找后被淘汰时重新下载
+"""
+
+import sys
+import os
+import asyncio
+import hashlib
+from pathlib import Path
+
+from aiohttp import web
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.image_processor import ImageProcessor
+from src.utils.media_cache import MediaCache
+
+
+async def download_twice(tmp_path: Path, fresh_seconds: float):
+    requests = []
+
+    async def image(request):
+        requests.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=b'png-bytes', content_type='image/png', headers={'ETag': '"v1"'})
+
+    app = web.Application()
+    app.router.add_get('/a.png', image)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/a.png"
+
+    try:
+        cache = MediaCache(str(tmp_path / 'cache'), fresh_seconds=fresh_seconds)
+        first, _ = await ImageProcessor(temp_dir=str(tmp_path / 'tmp'), media_cache=cache).process_images(url)
+        # 模拟重试发布：新的处理器实例、重新加载的缓存索引
+        cache = MediaCache(str(tmp_path / 'cache'), fresh_seconds=fresh_seconds)
+        second, _ = await ImageProcessor(temp_dir=str(tmp_path / 'tmp'), media_cache=cache).process_images(url)
+    finally:
+        await runner.cleanup()
+    return first, second, requests
+
+
+def test_fresh_cache_skips_network(tmp_path):
+    first, second, requests = asyncio.run(download_twice(tmp_path, fresh_seconds=3600))
+
+    assert requests == [None]
+    assert Path(second[0]).read_bytes() == b'png-bytes'
+    # 每次发布得到独立的文件，后一次发布不会删除前一次正在上传的文件
+    assert first[0] != second[0] and Path(first[0]).read_bytes() == b'png-bytes'
+
+
+def test_stale_cache_revalidates_with_etag(tmp_path):
+    _, second, requests = asyncio.run(download_twice(tmp_path, fresh_seconds=0))
+
+    assert requests == [None, '"v1"']
+    assert Path(second[0]).read_bytes() == b'png-bytes'
+
+
+def test_identical_content_is_stored_once_and_lru_evicted(tmp_path):
+    cache = MediaCache(str(tmp_path / 'cache'), max_bytes=20)
+
+    def store(url: str, body: bytes) -> str:
+        part = tmp_path / f"{url}.part"
+        part.write_bytes(body)
+        sha256 = hashlib.sha256(body).hexdigest()
+        cache.store(url, part, sha256, '.png')
+        return sha256
+
+    first = store('a', b'x' * 10)
+    store('b', b'x' * 10)
+    assert cache.stats()['objects'] == 1 and cache.stats()['urls'] == 2
+
+    cache.link(first, tmp_path / 'linked.png')
+    store('c', b'y' * 15)
+
+    assert cache.lookup('a') is None and cache.lookup('c') is not None
+    assert (tmp_path / 'linked.png').read_bytes() == b'x' * 10
+
+
+def test_link_after_eviction_returns_none(tmp_path):
+    cache = MediaCache(str(tmp_path / 'cache'), max_bytes=10)
+
+    def store(url: str, body: bytes) -> str:
+        part = tmp_path / f"{url}.part"
+        part.write_bytes(body)
+        sha256 = hashlib.sha256(body).hexdigest()
+        cache.store(url, part, sha256, '.png', link_to=tmp_path / f"{url}.png")
+        return sha256
+
+    store('a', b'x' * 10)
+    entry = cache.lookup('a')
+    # 查找之后其他发布任务写入新图片，淘汰了a
+    store('b', b'y' * 10)
+
+    assert (tmp_path / 'b.png').read_bytes() == b'y' * 10
+    assert cache.link(entry, tmp_path / 'late.png') is None
+    assert cache.lookup('a') is None and not (tmp_path / 'late.png').exists()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+测试笔记详情缓存：指标未变化时复用详情，指标变化后失效
+"""
+
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.xiaohongshu.data_collector.detail_cache import NoteDetailCache
+
+NOTE = {"title": "夏日清爽穿搭分享", "publish_time": "2024-06-20 18:30", "views": 5230, "likes": 320}
+DETAIL = {"source_recommend": "72%", "gender_female": "81%", "city_top1": "上海市"}
+
+
+def test_cache_hit_only_when_metrics_unchanged(tmp_path):
+    cache = NoteDetailCache(str(tmp_path / "cache.json"))
+    assert cache.get(NOTE) is None
+
+    cache.put(NOTE, DETAIL)
+
+    assert cache.get(dict(NOTE)) == DETAIL
+    assert cache.get({**NOTE, "views": 5300}) is None
+    assert cache.get({**NOTE, "title": "另一篇笔记"}) is None
+
+
+def test_cache_persists_across_instances(tmp_path):
+    cache_file = tmp_path / "cache" / "note_detail_cache.json"
+    cache = NoteDetailCache(str(cache_file))
+    cache.put(NOTE, DETAIL)
+    cache.save()
+
+    assert NoteDetailCache(str(cache_file)).get(NOTE) == DETAIL
+
+
+def test_corrupt_cache_file_starts_empty(tmp_path):
+    cache_file = tmp_path / "cache.json"
+    cache_file.write_text("{not json", encoding="utf-8")
+
+    assert len(NoteDetailCache(str(cache_file))) == 0
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+测试增量采集：笔记状态索引只放行新增或指标有变化的笔记，CSV只追加增量，过期笔记从索引清理
+"""
+
+import sys
+import os
+import csv
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.xiaohongshu.data_collector import content_analysis
+from src.xiaohongshu.data_collector.detail_cache import note_key
+from src.xiaohongshu.data_collector.note_state import NoteStateIndex
+from src.data.storage.csv_storage import CSVStorage
+
+NOTES = [
+    {"title": "夏日清爽穿搭分享", "publish_time": "2024-06-20 18:30", "views": 5230, "likes": 320},
+    {"title": "一周减脂餐食谱", "publish_time": "2024-06-18 12:00", "views": 12000, "likes": 860},
+]
+
+
+def test_only_new_or_changed_notes_pass(tmp_path):
+    index_file = str(tmp_path / "note_state_index.json")
+    index = NoteStateIndex(index_file)
+    assert index.changed_notes(NOTES) == NOTES
+
+    index.mark_persisted(NOTES)
+    updated = [NOTES[0], {**NOTES[1], "likes": 861}]
+
+    # 重新加载索引，模拟下一次定时采集
+    assert NoteStateIndex(index_file).changed_notes(updated) == [updated[1]]
+
+
+def test_csv_append_keeps_existing_rows(tmp_path):
+    storage = CSVStorage({"data_dir": str(tmp_path)})
+    storage.append_content_analysis_data(NOTES)
+    storage.append_content_analysis_data([{**NOTES[1], "likes": 861}])
+
+    with open(storage.content_analysis_file, encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+
+    assert len(rows) == 1 + 3
+    assert rows[-1][storage.content_analysis_fields.index("likes")] == "861"
+
+
+class FakeStorageManager:
+    """追加只入队，flush返回预设结果的存储管理器"""
+
+    def __init__(self, flushed):
+        self.flushed = flushed
+        self.appended = []
+
+    def append_content_analysis_data(self, data):
+        self.appended.append(list(data))
+
+    def flush(self, timeout=None):
+        return self.flushed
+
+
+def test_notes_marked_only_after_confirmed_write(tmp_path, monkeypatch):
+    index_file = str(tmp_path / "note_state_index.json")
+    monkeypatch.setenv("INCREMENTAL_COLLECTION", "true")
+    monkeypatch.setattr(content_analysis, "NoteStateIndex", lambda: NoteStateIndex(index_file))
+
+    failed = FakeStorageManager(flushed=False)
+    monkeypatch.setattr(content_analysis, "get_storage_manager", lambda: failed)
+    assert content_analysis._save_notes(NOTES) == 0
+    # 写入失败的笔记仍视为未保存
+    assert len(NoteStateIndex(index_file).changed_notes(content_analysis._format_notes_for_storage(NOTES))) == 2
+
+    saved = FakeStorageManager(flushed=True)
+    monkeypatch.setattr(content_analysis, "get_storage_manager", lambda: saved)
+    assert content_analysis._save_notes(NOTES) == 2
+    assert content_analysis._save_notes(NOTES) == 0
+    assert len(saved.appended) == 1
+
+
+def test_notes_missing_from_list_expire(tmp_path):
+    index_file = str(tmp_path / "note_state_index.json")
+    index = NoteStateIndex(index_file, max_age_days=30)
+    index.mark_persisted(NOTES)
+    # 模拟两篇笔记都已很久没有出现在采集列表中
+    for note in NOTES:
+        index._entries[note_key(note)]["seen_at"] = "2000-01-01T00:00:00"
+
+    # 第一篇指标未变化但出现在本次列表中，刷新出现时间后保留；第二篇被清理
+    index.mark_persisted([], seen_notes=[NOTES[0]])
+
+    reloaded = NoteStateIndex(index_file)
+    assert len(reloaded) == 1
+    assert reloaded.changed_notes(NOTES) == [NOTES[1]]
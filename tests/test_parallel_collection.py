@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+测试多页面采集：并发采集时部分页面失败不影响其他页面，所有借出的浏览器都会归还驱动池
+"""
+
+import sys
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('selenium')
+
+from src.xiaohongshu.data_collector.parallel import collect_pages
+
+
+class StubPool:
+    """记录借出和归还的驱动池"""
+
+    def __init__(self, max_size=3):
+        self.enabled = True
+        self.max_size = max_size
+        self.reserved = 0
+        self.leased = []
+        self.returned = []
+
+    @asynccontextmanager
+    async def session(self, cookies_file=None, priority=False):
+        browser_manager = SimpleNamespace(driver=f"driver-{len(self.leased)}")
+        self.leased.append(browser_manager)
+        discard = False
+        try:
+            yield browser_manager
+        except BaseException:
+            discard = True
+            raise
+        finally:
+            self.returned.append((browser_manager, discard))
+
+
+def test_parallel_partial_failure_returns_every_browser():
+    started = []
+    all_started = asyncio.Event()
+
+    def collector(name, outcome):
+        async def collect(driver):
+            started.append(driver)
+            if len(started) == 3:
+                all_started.set()
+            # 三个页面都开始后才结束，说明确实是并发采集
+            await asyncio.wait_for(all_started.wait(), timeout=2)
+            if outcome == "raise":
+                raise RuntimeError(f"{name}页面加载失败")
+            return {"success": outcome == "ok", "driver": driver}
+        return name, collect
+
+    pool = StubPool()
+    results = asyncio.run(collect_pages(pool, [
+        collector("仪表板", "ok"), collector("内容分析", "raise"), collector("粉丝", "fail")
+    ], parallel=True))
+
+    assert results["仪表板"]["success"] is True
+    assert results["内容分析"]["success"] is False and results["内容分析"]["error"] == "内容分析页面加载失败"
+    assert all("elapsed_seconds" in result for result in results.values())
+    assert results["粉丝"]["success"] is False
+    assert len({result.get("driver") for name, result in results.items() if name != "内容分析"}) == 2
+
+    assert len(pool.leased) == 3
+    assert sorted(id(manager) for manager, _ in pool.returned) == sorted(id(manager) for manager in pool.leased)
+    # 出错的浏览器被丢弃，不再放回驱动池
+    assert [discard for _, discard in pool.returned].count(True) == 1
+
+
+def test_sequential_collection_shares_one_browser_and_continues_after_failure():
+    async def ok(driver):
+        return {"success": True, "driver": driver}
+
+    async def broken(driver):
+        raise RuntimeError("页面结构变化")
+
+    pool = StubPool()
+    results = asyncio.run(collect_pages(pool, [("仪表板", ok), ("内容分析", broken), ("粉丝", ok)]))
+
+    assert list(results) == ["仪表板", "内容分析", "粉丝"]
+    assert results["内容分析"]["success"] is False and results["粉丝"]["success"] is True
+    assert results["仪表板"]["driver"] == results["粉丝"]["driver"]
+    assert len(pool.leased) == 1 and pool.returned == [(pool.leased[0], False)]
+
+
+def test_no_collectors_leases_nothing():
+    pool = StubPool()
+
+    assert asyncio.run(collect_pages(pool, [], parallel=True)) == {}
+    assert pool.leased == []
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+测试Parquet列式存储：带类型写入、当天分区覆盖、列裁剪和谓词下推（需要pyarrow）
+"""
+
+import sys
+import os
+import asyncio
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pa = pytest.importorskip("pyarrow")
+
+from src.data.storage.parquet_storage import ParquetStorage
+
+DASHBOARD = [{"dimension": "7天", "views": "100", "likes": 10}, {"dimension": "30天", "views": 400, "likes": 42}]
+
+
+def test_typed_save_and_today_overwrite(tmp_path):
+    storage = ParquetStorage({"data_dir": str(tmp_path)})
+    storage.save_dashboard_data(DASHBOARD)
+    storage.save_dashboard_data(DASHBOARD)
+
+    df = storage.read("dashboard")
+
+    assert len(df) == 2
+    assert str(df["views"].dtype) == "int64"
+    assert sorted(df["views"]) == [100, 400]
+
+
+def test_projection_and_predicate_pushdown(tmp_path):
+    storage = ParquetStorage({"data_dir": str(tmp_path)})
+    storage.save_dashboard_data(DASHBOARD)
+    old = pa.Table.from_pylist([{"dimension": "7天", "views": 1}], schema=storage.schemas["dashboard"])
+    storage._write_partition(storage._partition_file("dashboard", "2024-01-01"), old)
+
+    df = storage.read("dashboard", columns=["dimension", "views"], start_date="2024-06-01", dimension="7天")
+
+    assert list(df.columns) == ["dimension", "views"]
+    assert df["views"].tolist() == [100]
+
+
+def test_append_and_latest_data(tmp_path):
+    storage = ParquetStorage({"data_dir": str(tmp_path)})
+    storage.append_content_analysis_data([{"title": "第一篇", "views": 5}])
+    storage.append_content_analysis_data([{"title": "第二篇", "views": 7}])
+
+    latest = asyncio.run(storage.get_latest_data("content_analysis", limit=1))
+
+    assert len(latest) == 1
+    assert isinstance(latest[0]["created_at"], str)
+    assert len(storage.read("content_analysis")) == 2
+
+
+def test_float_timestamp_from_collectors(tmp_path):
+    # 采集器写入的timestamp是time.time()浮点数，schema中为字符串
+    storage = ParquetStorage({"data_dir": str(tmp_path)})
+    storage.save_dashboard_data([{"dimension": "7天", "views": 100, "timestamp": 1718000000.5}])
+
+    df = storage.read("dashboard")
+
+    assert df["timestamp"].tolist() == ["1718000000.5"]
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+测试按日期分区的CSV存储：当天分区覆盖、增量追加、读取最新数据、导入原有CSV历史
+"""
+
+import sys
+import os
+import asyncio
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.storage.csv_storage import CSVStorage
+from src.data.storage.partitioned_storage import PartitionedCSVStorage
+
+DASHBOARD = [{"dimension": "7天", "views": 100, "likes": 10}, {"dimension": "30天", "views": 400, "likes": 42}]
+
+
+def test_save_overwrites_only_today_partition(tmp_path):
+    storage = PartitionedCSVStorage({"data_dir": str(tmp_path)})
+    old_partition = storage._partition_file(storage.dashboard_file, "2024-01-01")
+    storage._write_partition(old_partition, storage.dashboard_fields,
+                             [{"created_at": "2024-01-01T08:00:00", "dimension": "7天", "views": 1}],
+                             storage.dashboard_chinese_headers)
+
+    storage.save_dashboard_data(DASHBOARD)
+    storage.save_dashboard_data(DASHBOARD[:1])
+
+    today = storage._partition_file(storage.dashboard_file, storage._get_today_date())
+    assert len(storage._read_partition(today, storage.dashboard_fields, storage.dashboard_chinese_headers)) == 1
+    assert len(storage._read_partition(old_partition, storage.dashboard_fields, storage.dashboard_chinese_headers)) == 1
+    assert not list(today.parent.glob("*.tmp"))
+
+
+def test_append_and_latest_data(tmp_path):
+    storage = PartitionedCSVStorage({"data_dir": str(tmp_path)})
+    storage.append_content_analysis_data([{"title": "标题,带逗号", "publish_time": "2024-06-20", "views": 5}])
+    storage.append_content_analysis_data([{"title": "第二篇", "publish_time": "2024-06-21", "views": 7}])
+
+    latest = asyncio.run(storage.get_latest_data("content_analysis", limit=10))
+
+    assert {row["title"] for row in latest} == {"标题,带逗号", "第二篇"}
+    assert asyncio.run(storage.get_latest_data("unknown")) == []
+
+
+def test_legacy_csv_history_is_split_into_partitions(tmp_path):
+    legacy = CSVStorage({"data_dir": str(tmp_path)})
+    rows = ["2024-06-01T08:00:00,2024-06-01T08:00:00,,7天,100,5,1",
+            "2024-06-02T08:00:00,2024-06-02T08:00:00,,7天,104,5,1"]
+    legacy.fans_file.write_text(",".join(legacy.fans_chinese_headers) + "\n" + "\n".join(rows) + "\n", encoding="utf-8")
+
+    storage = PartitionedCSVStorage({"data_dir": str(tmp_path)})
+
+    assert sorted(f.stem for f in storage._partition_files(storage.fans_file)) == ["2024-06-01", "2024-06-02"]
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+测试PostgreSQL存储：使用替身连接池验证迁移、COPY批量写入和StorageManager的同步调用
+"""
+
+import sys
+import os
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.storage.pg_storage import PostgreSQLStorage, MIGRATIONS
+from src.data.storage_manager import StorageManager
+
+# asyncpg二进制COPY对各列类型接受的Python类型
+COPY_TYPES = {"BIGINT": int, "TEXT": str, "TIMESTAMP": datetime, "DATE": date}
+
+
+def table_columns(table):
+    """从迁移SQL中解析表的列类型"""
+    sql = "\n".join(sql for _, _, sql in MIGRATIONS)
+    body = re.search(rf"CREATE TABLE IF NOT EXISTS {table} \((.*?)\);", sql).group(1)
+    return dict(re.findall(r"(\w+) (BIGINT|TEXT|TIMESTAMP|DATE)\b", body))
+
+
+class FakeConnection:
+    """记录SQL和COPY调用的替身连接"""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def execute(self, sql, *args):
+        self.pool.executed.append((sql, args))
+        if sql.startswith("INSERT INTO schema_migrations"):
+            self.pool.applied.add(args[0])
+
+    async def fetch(self, sql, *args):
+        if "schema_migrations" in sql:
+            return [{"version": version} for version in self.pool.applied]
+        return [{"created_at": datetime(2024, 6, 20, 8), "dimension": "7天", "views": 100}]
+
+    async def copy_records_to_table(self, table, records, columns):
+        # 与asyncpg一样按列类型检查值的类型
+        types = table_columns(table[len("tmp_"):])
+        for record in records:
+            for column, value in zip(columns, record):
+                expected = COPY_TYPES[types[column]]
+                if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+                    raise TypeError(f"{column}: 需要{expected.__name__}，实际为{type(value).__name__}")
+        self.pool.copied.append((table, list(records), columns))
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+class FakePool:
+    def __init__(self):
+        self.executed, self.copied, self.applied = [], [], set()
+        self.closed = False
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+    async def close(self):
+        self.closed = True
+
+
+def make_storage(pool):
+    async def pool_factory(**kwargs):
+        pool.kwargs = kwargs
+        return pool
+    return PostgreSQLStorage({"host": "db", "user": "xhs", "pool_size": 3}, pool_factory=pool_factory)
+
+
+def test_initialize_runs_migrations_once():
+    pool = FakePool()
+    storage = make_storage(pool)
+
+    assert asyncio.run(storage.initialize())
+    assert pool.kwargs["max_size"] == 3 and pool.kwargs["user"] == "xhs"
+    assert pool.applied == {version for version, _, _ in MIGRATIONS}
+
+    executed = len(pool.executed)
+    storage._initialized = False
+    asyncio.run(storage.initialize())
+    # 第二次只检查迁移表，不再执行建表
+    assert not any("CREATE TABLE IF NOT EXISTS dashboard_data" in sql for sql, _ in pool.executed[executed:])
+
+
+def test_bulk_upsert_uses_copy_and_on_conflict():
+    pool = FakePool()
+    storage = make_storage(pool)
+
+    assert asyncio.run(storage.save_dashboard_data([{"dimension": "7天", "views": "100"}]))
+
+    table, records, columns = pool.copied[-1]
+    assert table == "tmp_dashboard_data"
+    assert records[0][columns.index("views")] == 100
+    assert "ON CONFLICT (date, dimension) DO UPDATE" in pool.executed[-1][0]
+
+    latest = asyncio.run(storage.get_latest_data("dashboard", limit=1))
+    assert latest[0]["created_at"] == "2024-06-20T08:00:00"
+
+
+def test_storage_manager_awaits_pg_calls(tmp_path):
+    pool = FakePool()
+    manager = StorageManager()
+    manager.initialize(data_path=str(tmp_path))
+    manager._pg_storage = make_storage(pool)
+
+    manager.save_fans_data([{"dimension": "7天", "total_fans": 10}])
+    manager.close()
+
+    assert pool.copied[-1][0] == "tmp_fans_data"
+    assert pool.closed
+
+
+def test_copy_values_match_column_types():
+    # 采集器写入的timestamp是浮点数，TEXT列只接受str
+    pool = FakePool()
+    storage = make_storage(pool)
+
+    assert asyncio.run(storage.save_dashboard_data(
+        [{"dimension": "7天", "views": 100.0, "timestamp": 1718000000.5}]
+    ))
+
+    table, records, columns = pool.copied[-1]
+    assert records[0][columns.index("timestamp")] == "1718000000.5"
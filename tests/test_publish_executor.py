@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+测试发布任务执行器：队列已满时拒绝、按优先级出队、同一账号的任务串行执行
+"""
+
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('fastmcp')
+
+from src.core.exceptions import TaskQueueFullError
+from src.server.mcp_server import TaskManager
+
+
+def note(title):
+    return SimpleNamespace(title=title)
+
+
+async def drain(manager):
+    """等待所有任务（包括执行中调度出的后续任务）结束"""
+    while manager.running_tasks:
+        await asyncio.gather(*list(manager.running_tasks.values()))
+
+
+class Recorder:
+    """记录任务开始和结束顺序的执行函数，任务在release后结束"""
+
+    def __init__(self):
+        self.events = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, task_id):
+        self.events.append(("start", task_id))
+        await self.release.wait()
+        self.events.append(("end", task_id))
+
+
+def test_queue_full_is_rejected():
+    async def scenario():
+        manager = TaskManager(max_workers=1, max_queue_size=1)
+        runner = Recorder()
+        running = manager.create_task(note("a"), account="a.json")
+        queued = manager.create_task(note("b"), account="a.json")
+        rejected = manager.create_task(note("c"), account="a.json")
+
+        assert manager.submit(running, runner) == 0
+        assert manager.submit(queued, runner) == 1
+        with pytest.raises(TaskQueueFullError):
+            manager.submit(rejected, runner)
+
+        runner.release.set()
+        await drain(manager)
+        assert [task_id for event, task_id in runner.events if event == "end"] == [running, queued]
+
+    asyncio.run(scenario())
+
+
+def test_higher_priority_runs_first():
+    async def scenario():
+        manager = TaskManager(max_workers=1)
+        runner = Recorder()
+        first = manager.create_task(note("first"), account="a.json")
+        low = manager.create_task(note("low"), account="a.json", priority=0)
+        high = manager.create_task(note("high"), account="a.json", priority=5)
+        for task_id in (first, low, high):
+            manager.submit(task_id, runner)
+
+        assert manager.get_queue_position(high) == 1 and manager.get_queue_position(low) == 2
+        runner.release.set()
+        await drain(manager)
+
+        starts = [task_id for event, task_id in runner.events if event == "start"]
+        assert starts == [first, high, low]
+
+    asyncio.run(scenario())
+
+
+def test_same_account_runs_serially_other_accounts_in_parallel():
+    async def scenario():
+        manager = TaskManager(max_workers=2)
+        runner = Recorder()
+        a1 = manager.create_task(note("a1"), account="a.json")
+        a2 = manager.create_task(note("a2"), account="a.json")
+        b1 = manager.create_task(note("b1"), account="b.json")
+        for task_id in (a1, a2, b1):
+            manager.submit(task_id, runner)
+
+        # a2排在a1之后，b1使用空闲槽位先执行
+        assert set(manager.running_tasks) == {a1, b1}
+        assert manager.get_queue_position(a2) == 1
+
+        runner.release.set()
+        await drain(manager)
+
+        assert runner.events.index(("end", a1)) < runner.events.index(("start", a2))
+
+    asyncio.run(scenario())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+测试发布步骤耗时统计：最近秩法p50/p95、每个步骤只保留最近的max_samples条记录、失败步骤计数
+"""
+
+import sys
+import os
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.publish_metrics import PublishMetrics, PublishSpanRecorder, StepSpan, _percentile
+
+
+def recorder_with(durations, success=True):
+    recorder = PublishSpanRecorder()
+    for name, duration in durations.items():
+        recorder.spans.append(StepSpan(name=name, started_at=0.0, duration=duration, success=success))
+    return recorder
+
+
+@pytest.mark.parametrize("values, percent, expected", [
+    ([], 50, 0.0),
+    ([7.0], 95, 7.0),
+    ([1.0, 2.0], 50, 1.0),
+    ([1.0, 2.0, 3.0, 4.0], 50, 2.0),
+    ([float(n) for n in range(1, 101)], 95, 95.0),
+    ([float(n) for n in range(1, 21)], 95, 19.0),
+    ([float(n) for n in range(1, 21)], 100, 20.0),
+    ([1.0, 2.0, 3.0], 0, 1.0),
+])
+def test_nearest_rank_percentile(values, percent, expected):
+    assert _percentile(values, percent) == expected
+
+
+def test_summary_reports_sorted_distribution():
+    metrics = PublishMetrics()
+    for duration in (5.0, 1.0, 3.0, 2.0, 4.0):
+        metrics.record(recorder_with({"upload": duration, "navigate": duration / 10}))
+
+    summary = metrics.summary()
+    upload = summary["steps"]["upload"]
+
+    assert summary["publish_count"] == 5
+    assert list(summary["steps"]) == ["navigate", "upload"]
+    assert (upload["count"], upload["mean"], upload["p50"], upload["p95"], upload["max"]) == (5, 3.0, 3.0, 5.0, 5.0)
+    assert metrics.summary("navigate")["steps"].keys() == {"navigate"}
+
+
+def test_ring_buffer_keeps_only_recent_samples():
+    metrics = PublishMetrics(max_samples=3)
+    for duration in (100.0, 1.0, 2.0, 3.0):
+        metrics.record(recorder_with({"submit": duration}))
+
+    submit = metrics.summary()["steps"]["submit"]
+
+    # 最早的100秒已被挤出
+    assert submit["count"] == 3 and submit["max"] == 3.0 and submit["mean"] == 2.0
+    assert metrics.summary()["publish_count"] == 4
+
+
+def test_failures_are_counted_and_reset_clears():
+    metrics = PublishMetrics()
+    metrics.record(recorder_with({"topics": 1.0}))
+    metrics.record(recorder_with({"topics": 2.0}, success=False))
+
+    assert metrics.summary()["steps"]["topics"]["failures"] == 1
+    metrics.reset()
+    assert metrics.summary() == {"publish_count": 0, "max_samples_per_step": 500, "steps": {}}
+
+
+def test_span_marks_failed_step():
+    recorder = PublishSpanRecorder()
+    with recorder.span("navigate"):
+        pass
+    with pytest.raises(RuntimeError):
+        with recorder.span("upload"):
+            raise RuntimeError("upload failed")
+    recorder.start("submit")
+    recorder.fail_open()
+
+    assert [(span.name, span.success) for span in recorder.spans] == [
+        ("navigate", True), ("upload", False), ("submit", False)
+    ]
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+测试SQLite存储：WAL模式、同一天按唯一键更新插入、按created_at倒序读取最新数据
+"""
+
+import sys
+import os
+import asyncio
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.storage.sqlite_storage import SQLiteStorage
+
+NOTES = [
+    {"title": "夏日清爽穿搭分享", "publish_time": "2024-06-20 18:30", "views": "5230", "likes": 320},
+    {"title": "一周减脂餐食谱", "publish_time": "2024-06-18 12:00", "views": 12000, "likes": 860},
+]
+
+
+def test_wal_mode_and_indexes(tmp_path):
+    storage = SQLiteStorage({"data_dir": str(tmp_path)})
+
+    assert storage._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {row[1] for row in storage._conn.execute("PRAGMA index_list(content_analysis_data)")}
+    assert "idx_content_analysis_data_created_at" in indexes
+
+
+def test_upsert_same_day_and_latest_data(tmp_path):
+    storage = SQLiteStorage({"data_dir": str(tmp_path)})
+    storage.save_content_analysis_data(NOTES)
+    storage.append_content_analysis_data([{**NOTES[1], "likes": 861}])
+    storage.save_dashboard_data([{"dimension": "7天", "views": 100}])
+    storage.save_dashboard_data([{"dimension": "7天", "views": 120}])
+
+    notes = asyncio.run(storage.get_latest_data("content_analysis", limit=10))
+    dashboard = asyncio.run(storage.get_latest_data("dashboard"))
+
+    assert len(notes) == 2
+    assert {note["title"]: note["likes"] for note in notes}["一周减脂餐食谱"] == 861
+    assert {note["title"]: note["views"] for note in notes}["夏日清爽穿搭分享"] == 5230
+    assert [row["views"] for row in dashboard] == [120]
+    assert storage.get_storage_info()["tables"]["content_analysis_data"]["records"] == 2
+    asyncio.run(storage.close())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+测试趋势分析：每日取最后一次采集、日变化和滚动平均、笔记增长与异常检测
+"""
+
+import sys
+import os
+
+import pandas as pd
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.trend_analytics import analyze_trends
+
+
+def dashboard_history(days: int = 40, spike_day: int = 35) -> pd.DataFrame:
+    """每天浏览量增长10，spike_day当天突增500（存储读出的值为字符串）"""
+    rows = []
+    for i, date in enumerate(pd.date_range('2024-05-01', periods=days)):
+        views = 100 + i * 10 + (500 if i == spike_day else 0)
+        rows.append({'created_at': date.strftime('%Y-%m-%dT08:00:00'), 'dimension': '7天',
+                     'views': str(views), 'likes': '5'})
+    # 同一天的早先采集应被当天最后一次采集覆盖
+    rows.append({'created_at': '2024-05-01T07:00:00', 'dimension': '7天', 'views': '1', 'likes': '0'})
+    return pd.DataFrame(rows)
+
+
+def test_dashboard_deltas_rolling_and_anomalies():
+    trends = analyze_trends({'dashboard': dashboard_history()})['dashboard']
+
+    assert trends['days'] == 40
+    latest = trends['dimensions']['7天']
+    assert latest['date'] == '2024-06-09'
+    assert latest['metrics']['views']['value'] == 490
+    assert latest['metrics']['views']['delta'] == 10
+    assert latest['metrics']['views']['avg_7d'] == round((430 + 440 + 950 + 460 + 470 + 480 + 490) / 7, 4)
+    assert latest['engagement_rate'] == round(5 / 490, 4)
+
+    anomaly_dates = {anomaly['date'] for anomaly in trends['anomalies']}
+    assert anomaly_dates == {'2024-06-05', '2024-06-06'}
+
+
+def test_content_growth_per_note():
+    rows = []
+    for i, date in enumerate(['2024-06-01', '2024-06-02']):
+        rows.append({'created_at': f'{date}T09:00:00', 'title': 'a', 'publish_time': 'x',
+                     'views': 100 + i * 50, 'likes': 10})
+        rows.append({'created_at': f'{date}T09:00:00', 'title': 'b', 'publish_time': 'y',
+                     'views': 10 + i, 'likes': 5})
+
+    trends = analyze_trends({'content_analysis': pd.DataFrame(rows)}, top_n=1)['content_analysis']
+
+    assert trends['notes'] == 2
+    assert trends['top_growth'][0]['title'] == 'a'
+    assert trends['top_growth'][0]['views_growth'] == 0.5
+    assert trends['top_engagement'][0]['title'] == 'b'
+
+
+def test_empty_history():
+    trends = analyze_trends({'fans': pd.DataFrame(columns=['created_at', 'dimension', 'total_fans'])})
+    assert trends['fans'] == {'days': 0, 'first_date': None, 'last_date': None}
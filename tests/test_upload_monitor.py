@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+测试事件驱动的上传完成检测：状态读取、进度回调、页面刷新后重新安装监视器
+"""
+
+import sys
+import os
+import json
+import shutil
+import asyncio
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('selenium')
+
+from src.xiaohongshu.components import page_waiter
+from src.xiaohongshu.components.page_waiter import XHSPageWaiter
+
+
+class FakeDriver:
+    """按顺序返回预设上传状态的驱动"""
+
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.installs = 0
+        self.waits = []
+
+    def execute_script(self, script, *args):
+        self.installs += 1
+        return True
+
+    def execute_async_script(self, script, version, wait_ms):
+        self.waits.append(version)
+        return self.snapshots.pop(0)
+
+
+def snapshot(state, progress, version):
+    return {"state": state, "progress": progress, "text": f"{progress}%", "version": version}
+
+
+def test_wait_for_upload_streams_progress():
+    driver = FakeDriver([
+        snapshot("pending", None, 0),
+        snapshot("pending", 30, 1),
+        None,  # 页面刷新，监视器丢失
+        snapshot("pending", 30, 0),
+        snapshot("success", 100, 1),
+    ])
+    waiter = XHSPageWaiter(SimpleNamespace(driver=driver))
+    progress = []
+
+    state = asyncio.run(waiter.wait_for_upload(
+        10, "文件上传", success=[".upload-success"], on_progress=lambda percent, text: progress.append(percent)
+    ))
+
+    assert state == "success"
+    assert progress == [30, 100]
+    assert driver.installs == 2
+    assert driver.waits == [-1, 0, 1, -1, 0]
+    assert "文件上传" in waiter.timings
+
+
+def test_wait_for_upload_times_out():
+    driver = FakeDriver([snapshot("pending", None, 0)] * 100)
+    waiter = XHSPageWaiter(SimpleNamespace(driver=driver))
+
+    assert asyncio.run(waiter.wait_for_upload(0.05, "文件上传", success=[".upload-success"])) is None
+
+
+def test_wait_for_any_present_accepts_hidden_file_input():
+    hidden_input = SimpleNamespace(is_displayed=lambda: False)
+    driver = SimpleNamespace(find_elements=lambda by, selector: [hidden_input] if 'image' in selector else [])
+    waiter = XHSPageWaiter(SimpleNamespace(driver=driver), poll_interval=0.01)
+
+    assert asyncio.run(waiter.wait_for_any_visible(["[accept*='image']"], 0.05, "可见")) is None
+    assert asyncio.run(waiter.wait_for_any_present(["[accept*='image']"], 0.05, "存在")) is hidden_input
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="需要node检查脚本语法")
+@pytest.mark.parametrize('name', ['_UPLOAD_MONITOR_SCRIPT', '_UPLOAD_WAIT_SCRIPT'])
+def test_injected_scripts_are_valid_javascript(name):
+    # execute_script / execute_async_script 把脚本作为函数体执行
+    script = getattr(page_waiter, name)
+    result = subprocess.run(['node', '-e', f"new Function({json.dumps(script)})"],
+                            capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
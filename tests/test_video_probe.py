@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+测试视频上传前预检：MP4文件头解析、大小/时长限制、按文件哈希缓存
+"""
+
+import sys
+import os
+import struct
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import video_probe
+from src.utils.video_probe import VideoLimits, VideoPreflight, _probe_mp4
+from src.utils.video_processor import VideoProcessor
+
+
+def box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack('>I', 8 + len(payload)) + box_type + payload
+
+
+def track(handler: bytes, codec: bytes, width: int = 0, height: int = 0) -> bytes:
+    tkhd = box(b'tkhd', bytes(76) + struct.pack('>II', width << 16, height << 16))
+    hdlr = box(b'hdlr', bytes(8) + handler + bytes(12))
+    stsd = box(b'stsd', bytes(8) + box(codec, bytes(8)))
+    minf = box(b'minf', box(b'stbl', stsd))
+    return box(b'trak', tkhd + box(b'mdia', hdlr + minf))
+
+
+def make_mp4(path, video_codec=b'avc1', audio_codec=b'mp4a', duration=12, padding=1024):
+    """生成只有文件头的MP4（mdat为填充数据）"""
+    mvhd = box(b'mvhd', bytes(12) + struct.pack('>II', 1000, duration * 1000) + bytes(80))
+    moov = box(b'moov', mvhd + track(b'vide', video_codec, 1080, 1920) + track(b'soun', audio_codec))
+    with open(path, 'wb') as f:
+        f.write(box(b'ftyp', b'isom' + bytes(4)) + box(b'mdat', bytes(padding)) + moov)
+    return str(path)
+
+
+def test_parse_mp4_header(tmp_path):
+    path = make_mp4(tmp_path / 'clip.mp4')
+
+    with open(path, 'rb') as f:
+        info = _probe_mp4(f, os.path.getsize(path))
+
+    assert (info.container, info.video_codec, info.audio_codec) == ('mp4', 'h264', 'aac')
+    assert (info.width, info.height, info.duration) == (1080, 1920, 12)
+    assert info.bitrate == os.path.getsize(path) * 8 // 12
+
+
+def test_rejects_oversized_video(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_probe.shutil, 'which', lambda name: None)
+    path = make_mp4(tmp_path / 'big.mp4', padding=4096)
+    preflight = VideoPreflight(str(tmp_path / 'cache'), VideoLimits(max_bytes=2048))
+    processor = VideoProcessor(base_dir=str(tmp_path), preflight=preflight)
+
+    paths, error = processor.process_videos(path)
+
+    assert paths == []
+    assert '超过上限' in error
+
+
+def test_probe_cached_by_file_hash(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_probe.shutil, 'which', lambda name: None)
+    calls = []
+    original = video_probe.probe_video
+    monkeypatch.setattr(video_probe, 'probe_video', lambda path: calls.append(path) or original(path))
+    first = make_mp4(tmp_path / 'a.mp4', video_codec=b'vp09')
+    copy = tmp_path / 'b.mp4'
+    copy.write_bytes(open(first, 'rb').read())
+
+    # 编码不兼容、未开启转码时上传原文件
+    assert VideoPreflight(str(tmp_path / 'cache')).prepare(first) == first
+    # 新实例从缓存文件读取，内容相同的副本不再重新检查
+    assert VideoPreflight(str(tmp_path / 'cache')).prepare(str(copy)) == str(copy)
+    assert calls == [first]
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+测试写回队列：同日保存合并、增量追加合并、flush等待、失败重试和落盘统计
+"""
+
+import sys
+import os
+import threading
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.write_behind import MAX_WRITE_ATTEMPTS, WriteBehindQueue
+
+
+class RecordingWriter:
+    """记录写入调用的写入函数"""
+
+    def __init__(self, release: threading.Event = None):
+        self.calls = []
+        self.release = release
+
+    def __call__(self, data_type, data, append):
+        if self.release is not None:
+            self.release.wait(5)
+        self.calls.append((data_type, list(data), append))
+
+
+def test_same_day_saves_are_coalesced():
+    writer = RecordingWriter()
+    queue = WriteBehindQueue(writer, flush_interval=60)
+
+    queue.submit('dashboard', [{'views': 1}])
+    queue.submit('dashboard', [{'views': 2}])
+    queue.submit('content_analysis', [{'title': 'a'}], append=True)
+    queue.submit('content_analysis', [{'title': 'b'}], append=True)
+
+    assert queue.flush(timeout=5)
+    assert writer.calls == [
+        ('dashboard', [{'views': 2}], False),
+        ('content_analysis', [{'title': 'a'}, {'title': 'b'}], True),
+    ]
+    stats = queue.stats()
+    assert stats['coalesced'] == 2 and stats['flushes'] == 1 and stats['pending_records'] == 0
+    queue.close()
+
+
+def test_append_after_full_save_stays_full_save():
+    writer = RecordingWriter()
+    queue = WriteBehindQueue(writer, flush_interval=60)
+
+    queue.submit('content_analysis', [{'title': 'a'}])
+    queue.submit('content_analysis', [{'title': 'b'}], append=True)
+    queue.close()
+
+    assert writer.calls == [('content_analysis', [{'title': 'a'}, {'title': 'b'}], False)]
+
+
+def test_submit_does_not_wait_for_writer():
+    release = threading.Event()
+    writer = RecordingWriter(release)
+    queue = WriteBehindQueue(writer, flush_interval=0, max_pending_records=1)
+
+    queue.submit('fans', [{'total_fans': 1}])
+    queue.submit('fans', [{'total_fans': 2}])
+    assert not queue.flush(timeout=0.1)
+
+    release.set()
+    assert queue.flush(timeout=5)
+    assert writer.calls[-1] == ('fans', [{'total_fans': 2}], False)
+    assert queue.stats()['last_flush_ms'] > 0
+    queue.close()
+
+
+def test_writer_failure_is_reported():
+    calls = []
+
+    def failing_writer(data_type, data, append):
+        calls.append(data_type)
+        raise IOError("disk full")
+
+    queue = WriteBehindQueue(failing_writer, flush_interval=60, retry_delay=0)
+    queue.submit('fans', [{'total_fans': 1}])
+
+    assert not queue.flush(timeout=5)
+    assert len(calls) == MAX_WRITE_ATTEMPTS
+    stats = queue.stats()
+    assert stats['failed_batches'] == MAX_WRITE_ATTEMPTS and stats['dropped_batches'] == 1
+    queue.close()
+
+
+def test_failed_batch_is_retried_before_newer_appends():
+    failures = [IOError("locked")]
+    calls = []
+
+    def flaky_writer(data_type, data, append):
+        if failures:
+            raise failures.pop()
+        calls.append((data_type, list(data), append))
+
+    queue = WriteBehindQueue(flaky_writer, flush_interval=60, retry_delay=0)
+    queue.submit('content_analysis', [{'title': 'a'}], append=True)
+
+    assert queue.flush(timeout=5)
+    queue.submit('content_analysis', [{'title': 'b'}], append=True)
+    assert queue.flush(timeout=5)
+    assert calls == [
+        ('content_analysis', [{'title': 'a'}], True),
+        ('content_analysis', [{'title': 'b'}], True),
+    ]
+    queue.close()
+
+
+def test_failed_batch_merges_with_appends_submitted_during_write():
+    calls = []
+    queue = None
+
+    def writer(data_type, data, append):
+        if not calls:
+            calls.append('failed')
+            # 写入期间提交的追加数据排在失败的数据之后
+            queue.submit('content_analysis', [{'title': 'b'}], append=True)
+            raise IOError("locked")
+        calls.append((data_type, list(data), append))
+
+    queue = WriteBehindQueue(writer, flush_interval=60, retry_delay=0)
+    queue.submit('content_analysis', [{'title': 'a'}], append=True)
+
+    assert queue.flush(timeout=5)
+    assert calls[1:] == [('content_analysis', [{'title': 'a'}, {'title': 'b'}], True)]
+    assert queue.stats()['pending_records'] == 0
+    queue.close()
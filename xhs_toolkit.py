@@ -477,6 +477,12 @@ def main():
             elif args.manual_action == "export":
                 kwargs['format'] = args.format
                 kwargs['output_dir'] = args.output_dir
+                kwargs['start_date'] = args.start_date
+                kwargs['end_date'] = args.end_date
+            elif args.manual_action == "analyze":
+                kwargs['start_date'] = args.start_date
+                kwargs['end_date'] = args.end_date
+                kwargs['output_json'] = args.output_json
             elif args.manual_action == "backup":
                 kwargs['include_cookies'] = args.include_cookies
             elif args.manual_action == "restore":